@@ -3,6 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+from ..listing.amazon_fields import BACKEND_SEARCH_TERMS_FIELD_BYTE_LIMIT, BACKEND_SEARCH_TERMS_FIELDS
+from ..listing.packing import chunk_to_fields
+
 
 def _clean(s: Any) -> str:
     if not isinstance(s, str):
@@ -10,26 +13,6 @@ def _clean(s: Any) -> str:
     return " ".join(s.strip().split())
 
 
-def _chunk_by_utf8_bytes(terms: str, *, max_chunks: int = 5, max_bytes_each: int = 50) -> list[str]:
-    tokens = [t for t in terms.split() if t]
-    chunks: list[str] = []
-    i = 0
-    for _ in range(max_chunks):
-        cur: list[str] = []
-        while i < len(tokens):
-            candidate = " ".join(cur + [tokens[i]])
-            if len(candidate.encode("utf-8")) <= max_bytes_each:
-                cur.append(tokens[i])
-                i += 1
-            else:
-                break
-        chunks.append(" ".join(cur))
-    # Trim empty tail
-    while chunks and not chunks[-1]:
-        chunks.pop()
-    return chunks
-
-
 @dataclass(frozen=True)
 class PatchBuildOptions:
     marketplace_id: str = "ATVPDKIKX0DER"
@@ -50,7 +33,13 @@ def build_listings_item_patch(
     bullets = [_clean(b) for b in bullets if _clean(b)]
     description = _clean(listing.get("description"))
     backend = _clean(listing.get("backend_search_terms"))
-    keywords = _chunk_by_utf8_bytes(backend, max_chunks=5, max_bytes_each=50) if backend else []
+    keywords = [
+        chunk
+        for chunk in chunk_to_fields(
+            backend, n=BACKEND_SEARCH_TERMS_FIELDS, max_bytes_each=BACKEND_SEARCH_TERMS_FIELD_BYTE_LIMIT
+        )
+        if chunk
+    ]
 
     mkt = options.marketplace_id
     lang = options.language_tag
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Iterable
+
+from .keywords import suggest_keywords
+from .utils import write_text_atomic
+
+
+INDEX_FORMAT = 1
+
+# Sibling SKUs sharing the CAS number are closer relatives than ones sharing an application.
+_CAS_WEIGHT = 2.0
+_APPLICATION_WEIGHT = 1.0
+# Per SKU-level co-occurrence with one of the card's own terms.
+_COOCCURRENCE_WEIGHT = 0.25
+
+
+def _norm(s: Any) -> str:
+    return " ".join(str(s).lower().split()) if isinstance(s, str) else ""
+
+
+def sku_key(value: Any) -> str:
+    """The key a facts card is indexed under: its sku (a string or number), whitespace-collapsed and upper-cased."""
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        return ""
+    return " ".join(str(value).split()).upper()
+
+
+@dataclass(frozen=True)
+class CardEntry:
+    """What the index keeps of one facts card."""
+
+    digest: str
+    cas: str
+    applications: tuple[str, ...]
+    terms: tuple[str, ...]
+
+    @classmethod
+    def from_facts(cls, facts: dict[str, Any]) -> CardEntry:
+        chemical = facts.get("chemical_identity") if isinstance(facts.get("chemical_identity"), dict) else {}
+        applications = facts.get("applications") if isinstance(facts.get("applications"), list) else []
+        tags = facts.get("tags") if isinstance(facts.get("tags"), list) else []
+        suggested = suggest_keywords(facts)
+        terms = dict.fromkeys(
+            t for t in (_norm(x) for group in (*suggested.values(), tags) for x in group) if t
+        )
+        cas = _norm(chemical.get("cas_number"))
+        apps = tuple(dict.fromkeys(a for a in (_norm(x) for x in applications) if a))
+        blob = json.dumps([cas, apps, list(terms)], ensure_ascii=False)
+        return cls(
+            digest=hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest(),
+            cas=cas,
+            applications=apps,
+            terms=tuple(terms),
+        )
+
+
+class CatalogKeywordIndex:
+    """
+    Inverted index of keywords, applications and tags across every facts card.
+
+    Postings map a term (and a CAS number or application) to the SKUs using it;
+    co-occurrence counts how many SKUs use two terms together. update() only
+    touches the postings and pairs of a card whose indexed content changed,
+    so keeping the index current costs per edited card, not per catalog.
+    """
+
+    def __init__(self) -> None:
+        self.cards: dict[str, CardEntry] = {}
+        self.postings: dict[str, set[str]] = {}
+        self.by_cas: dict[str, set[str]] = {}
+        self.by_application: dict[str, set[str]] = {}
+        self.cooccurrence: dict[str, Counter[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def update(self, facts: dict[str, Any]) -> bool:
+        """Index (or re-index) one facts card by its SKU; False if it was already current."""
+        sku = sku_key(facts.get("sku"))
+        if not sku:
+            raise ValueError("Facts card has no sku to index it by")
+        entry = CardEntry.from_facts(facts)
+        old = self.cards.get(sku)
+        if old is not None and old.digest == entry.digest:
+            return False
+        if old is not None:
+            self._apply(sku, old, -1)
+        self.cards[sku] = entry
+        self._apply(sku, entry, +1)
+        return True
+
+    def remove(self, sku: str) -> bool:
+        key = sku_key(sku)
+        entry = self.cards.pop(key, None)
+        if entry is None:
+            return False
+        self._apply(key, entry, -1)
+        return True
+
+    def _apply(self, sku: str, entry: CardEntry, sign: int) -> None:
+        def post(table: dict[str, set[str]], key: str) -> None:
+            if sign > 0:
+                table.setdefault(key, set()).add(sku)
+            elif key in table:
+                table[key].discard(sku)
+                if not table[key]:
+                    del table[key]
+
+        for term in entry.terms:
+            post(self.postings, term)
+        if entry.cas:
+            post(self.by_cas, entry.cas)
+        for app in entry.applications:
+            post(self.by_application, app)
+        for a, b in combinations(sorted(entry.terms), 2):
+            for x, y in ((a, b), (b, a)):
+                counts = self.cooccurrence.setdefault(x, Counter())
+                counts[y] += sign
+                if counts[y] <= 0:
+                    del counts[y]
+                    if not counts:
+                        del self.cooccurrence[x]
+
+    def siblings(self, facts: dict[str, Any]) -> dict[str, float]:
+        """SKUs sharing the card's CAS number or an application, with their relatedness weight."""
+        entry = CardEntry.from_facts(facts)
+        own = sku_key(facts.get("sku"))
+        weights: Counter[str] = Counter()
+        if entry.cas:
+            for sku in self.by_cas.get(entry.cas, ()):
+                weights[sku] += _CAS_WEIGHT
+        for app in entry.applications:
+            for sku in self.by_application.get(app, ()):
+                weights[sku] += _APPLICATION_WEIGHT
+        weights.pop(own, None)
+        return dict(weights)
+
+    def suggest(self, facts: dict[str, Any], *, limit: int = 20) -> list[dict[str, Any]]:
+        """
+        Terms sibling SKUs use that this card doesn't, best first.
+
+        A term scores the weights of the siblings using it, plus a little for
+        every SKU pairing it with one of the card's own terms.
+        """
+        entry = CardEntry.from_facts(facts)
+        own = set(entry.terms)
+        siblings = self.siblings(facts)
+        scores: Counter[str] = Counter()
+        used_by: dict[str, list[str]] = {}
+        for sku, weight in siblings.items():
+            for term in self.cards[sku].terms:
+                if term not in own:
+                    scores[term] += weight
+                    used_by.setdefault(term, []).append(sku)
+        for term in own:
+            for other, n in self.cooccurrence.get(term, {}).items():
+                if other in scores:
+                    scores[other] += _COOCCURRENCE_WEIGHT * n
+        return [
+            {"term": term, "score": round(score, 3), "skus": sorted(used_by[term])[:5]}
+            for term, score in sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+        ]
+
+    def to_json(self) -> dict[str, Any]:
+        # Cards are the source of truth; postings and pairs are stored so loading doesn't recount them.
+        return {
+            "format": INDEX_FORMAT,
+            "cards": {
+                sku: {"digest": e.digest, "cas": e.cas, "applications": list(e.applications), "terms": list(e.terms)}
+                for sku, e in sorted(self.cards.items())
+            },
+            "postings": {k: sorted(v) for k, v in sorted(self.postings.items())},
+            "by_cas": {k: sorted(v) for k, v in sorted(self.by_cas.items())},
+            "by_application": {k: sorted(v) for k, v in sorted(self.by_application.items())},
+            "cooccurrence": {k: dict(v) for k, v in sorted(self.cooccurrence.items())},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> CatalogKeywordIndex:
+        if data.get("format") != INDEX_FORMAT:
+            raise ValueError(f"Unsupported keyword index format: {data.get('format')!r}")
+        index = cls()
+        index.cards = {
+            sku: CardEntry(e["digest"], e["cas"], tuple(e["applications"]), tuple(e["terms"]))
+            for sku, e in data["cards"].items()
+        }
+        index.postings = {k: set(v) for k, v in data["postings"].items()}
+        index.by_cas = {k: set(v) for k, v in data["by_cas"].items()}
+        index.by_application = {k: set(v) for k, v in data["by_application"].items()}
+        index.cooccurrence = {k: Counter(v) for k, v in data["cooccurrence"].items()}
+        return index
+
+    @classmethod
+    def load(cls, path: Path) -> CatalogKeywordIndex:
+        """The index stored at path, or an empty one if there is none yet."""
+        if not path.exists():
+            return cls()
+        return cls.from_json(json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> None:
+        write_text_atomic(path, json.dumps(self.to_json(), ensure_ascii=False, separators=(",", ":")))
+
+
+def iter_facts_files(inputs: Iterable[Path]) -> Iterable[Path]:
+    """Facts card files under inputs (directories are walked for *.json, sorted)."""
+    for path in inputs:
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*.json") if p.is_file())
+        else:
+            yield path
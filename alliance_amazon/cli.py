@@ -1,13 +1,34 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import io
 import json
+import os
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from .env import load_env_files
-from .compliance.scanner import ScanConfig, scan_listing_fields, scan_text
+from .compliance.audit import AuditSummary, rule_categories, run_audit
+from .compliance.blocklist import RulePackError
+from .compliance.findings_table import FindingsTable
+from .compliance.locales import LOCALE_RULE_PACKS, canonical_locale, locale_for
+from .compliance.redact import REDACTION_STRATEGIES
+from .compliance.rulestats import RuleStats
+from .compliance.scanner import (
+    ScanConfig,
+    disable_rule_stats,
+    enable_rule_stats,
+    listing_has_hard_finding,
+    reset_scan_stats,
+    scan_cache_info,
+    scan_listing_spans,
+    scan_spans,
+    scan_stats,
+    use_rule_pack,
+)
+from .compliance.stream import DEFAULT_CHUNK_CHARS, iter_stream_findings
 from .facts import (
     FactsValidationError,
     facts_from_shopify_product_dump,
@@ -16,10 +37,13 @@ from .facts import (
 )
 from .llm.providers import make_llm_client
 from .llm.runner import generate_listing_with_llm
+from .catalog_index import CatalogKeywordIndex, iter_facts_files, sku_key
+from .demand import DEFAULT_FLUSH_TERMS, DemandTable, normalize_term
+from .relevance import TermDocumentMatrix, rankings_to_json, relevance_for_sku
 from .keywords import filter_keywords, suggest_keywords
 from .flatfile.generate import FlatFileOptions, generate_flat_file_rows, write_flat_file
 from .flatfile.template import AmazonTemplateSheet
-from .listing.generator import GenerationOptions, generate_listing
+from .listing.generator import GenerationOptions, generate_listing, listing_scan_state
 from .shopify.client import ShopifyClient
 from .shopify.fetch import fetch_by_sku
 from .shopify.extract import build_facts_from_shopify
@@ -61,6 +85,35 @@ def _write_output(out_path: Path | None, force: bool, text: str) -> None:
     write_text_atomic(out_path, text)
 
 
+def _write_output_lines(out_path: Path | None, force: bool, lines: Iterable[str]) -> None:
+    """Like _write_output, but writes each line as it is produced."""
+    if out_path is None:
+        try:
+            for line in lines:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+        except BrokenPipeError:
+            try:
+                sys.stdout.close()
+            finally:
+                return
+        return
+    if out_path.exists() and not force:
+        raise SystemExit(
+            f"Refusing to overwrite existing file: {out_path} (use --force)"
+        )
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line)
+        os.replace(tmp, out_path)
+    finally:
+        # Left over only when writing failed or was interrupted (Ctrl-C).
+        tmp.unlink(missing_ok=True)
+
+
 def _cmd_facts_init(args: argparse.Namespace) -> int:
     template: dict[str, Any] = {
         "sku": "AC-12345",
@@ -147,6 +200,13 @@ def _cmd_facts_from_shopify(args: argparse.Namespace) -> int:
     return 0
 
 
+def _locale_arg(value: str) -> str:
+    try:
+        return canonical_locale(value)
+    except RulePackError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
 def _cmd_compliance_scan(args: argparse.Namespace) -> int:
     allow_name = args.allow_grade_terms_from_product_name
     if not allow_name and args.facts:
@@ -154,26 +214,120 @@ def _cmd_compliance_scan(args: argparse.Namespace) -> int:
             allow_name = str(load_json(args.facts).get("product_name") or "").strip() or None
         except Exception:
             allow_name = None
+    html = args.html or args.input.suffix.lower() in (".html", ".htm")
+    if html and args.stream:
+        raise SystemExit("--stream scans plain text; HTML input is not supported with it")
     config = ScanConfig(
         allow_grade_terms_from_product_name=allow_name,
+        fuzzy=args.fuzzy,
+        html=html,
+        locale=args.locale,
     )
+    if args.rule_pack:
+        try:
+            use_rule_pack(args.rule_pack)
+        except (OSError, RulePackError) as e:
+            raise SystemExit(f"Failed to load rule pack: {e}") from e
     path = args.input
+    reset_scan_stats()
+    if args.rule_stats:
+        enable_rule_stats()
+    if args.stream:
+        return _compliance_scan_stream(args, config)
     if path.suffix.lower() == ".json":
         payload = load_json(path)
-        findings = scan_listing_fields(payload, config=config)
+        results = scan_listing_spans(payload, config=config)
     else:
-        findings = scan_text(path.read_text(encoding="utf-8", errors="replace"), config=config)
+        results = [scan_spans(path.read_text(encoding="utf-8", errors="replace"), config=config)]
+    findings = [f for r in results for f in r]
     errors = [f for f in findings if f.severity == "hard"]
     if args.format == "json":
         _write_output(args.out, args.force, json_dumps([f.to_dict() for f in findings]))
     else:
         for f in findings:
             sys.stdout.write(
-                f"{f.severity.upper()} [{f.rule_id}] {f.field}: {f.message} (match: {f.match!r})\n"
+                f"{f.severity.upper()} [{f.rule_id}] {f.field}@{f.start}-{f.end}: {f.message} (match: {f.match!r})\n"
             )
+    if args.stats:
+        sys.stderr.write(json_dumps({"scan_throughput": scan_stats().to_dict(), "scan_cache": scan_cache_info()}) + "\n")
+    _write_rule_stats(disable_rule_stats())
     return 2 if errors else 0
 
 
+def _compliance_scan_stream(args: argparse.Namespace, config: ScanConfig) -> int:
+    hard = 0
+
+    def lines(fp: Any) -> Iterable[str]:
+        nonlocal hard
+        for f in iter_stream_findings(fp, config=config, chunk_chars=args.chunk_size):
+            if f.severity == "hard":
+                hard += 1
+            if args.format == "json":
+                yield json.dumps(f.to_dict(), sort_keys=True, ensure_ascii=False) + "\n"
+            else:
+                yield (
+                    f"{f.severity.upper()} [{f.rule_id}] {f.line}:{f.column}: {f.message} (match: {f.match!r})\n"
+                )
+
+    if str(args.input) == "-":
+        _write_output_lines(args.out, args.force, lines(sys.stdin))
+    else:
+        with args.input.open("r", encoding="utf-8", errors="replace") as fp:
+            _write_output_lines(args.out, args.force, lines(fp))
+    if args.stats:
+        sys.stderr.write(json_dumps({"scan_throughput": scan_stats().to_dict(), "scan_cache": scan_cache_info()}) + "\n")
+    _write_rule_stats(disable_rule_stats())
+    return 2 if hard else 0
+
+
+def _write_rule_stats(stats: RuleStats | None) -> None:
+    # --rule-stats report: per-rule time/evaluations/matches, dead rules and slowest inputs.
+    if stats is not None:
+        sys.stderr.write(json_dumps({"rule_stats": stats.report()}) + "\n")
+
+
+def _cmd_compliance_audit(args: argparse.Namespace) -> int:
+    summary = AuditSummary(rule_stats=RuleStats() if args.rule_stats else None)
+    # run_audit() is a generator; load the pack here so a bad one fails before any output.
+    # It stays active for run_audit(), whose workers load it from the same file.
+    try:
+        if args.rule_pack:
+            use_rule_pack(args.rule_pack)
+        summary.categories.update(rule_categories(args.locale))
+    except (OSError, RulePackError) as e:
+        raise SystemExit(f"Failed to load rule pack: {e}") from e
+    records = run_audit(
+        args.inputs,
+        jobs=args.jobs,
+        fuzzy=args.fuzzy,
+        locale=args.locale,
+        summary=summary,
+    )
+
+    def lines() -> Iterable[str]:
+        for record in records:
+            if args.only_failing and record.get("status") == "pass":
+                continue
+            yield json.dumps({"type": "listing", **record}, sort_keys=True, ensure_ascii=False) + "\n"
+        yield json.dumps({"type": "summary", **summary.to_dict()}, sort_keys=True, ensure_ascii=False) + "\n"
+
+    _write_output_lines(args.out, args.force, lines())
+    _write_rule_stats(summary.rule_stats)
+    if args.findings_table is not None:
+        _write_findings_table(args.findings_table, args.force, summary.table)
+    return 2 if summary.failed else 0
+
+
+def _write_findings_table(path: Path, force: bool, table: FindingsTable) -> None:
+    # .csv: one row per finding; anything else: the columnar JSON form.
+    if path.suffix.lower() == ".csv":
+        buf = io.StringIO()
+        table.write_csv(buf)
+        _write_output(path, force, buf.getvalue())
+    else:
+        _write_output(path, force, json.dumps(table.to_json(), ensure_ascii=False, separators=(",", ":")))
+
+
 def _cmd_listing_generate(args: argparse.Namespace) -> int:
     try:
         facts = load_facts_card(args.facts)
@@ -186,8 +340,16 @@ def _cmd_listing_generate(args: argparse.Namespace) -> int:
         size=args.size,
         html_description=args.html_description,
         include_debug=args.include_debug,
+        demand=_open_demand(args.demand) if args.demand is not None else None,
+        relevance=_load_relevance(args.relevance, facts) if args.relevance is not None else None,
+        optimize_title=args.optimize_title,
     )
-    listing = generate_listing(facts, options=options)
+    scan_state = listing_scan_state(facts)
+    try:
+        listing = generate_listing(facts, options=options, scan_state=scan_state)
+    finally:
+        if options.demand is not None:
+            options.demand.close()
     if args.llm_provider:
         client = make_llm_client(args.llm_provider)
         llm_result = generate_listing_with_llm(
@@ -203,6 +365,7 @@ def _cmd_listing_generate(args: argparse.Namespace) -> int:
             client=client,
             model=args.llm_model,
             max_attempts=args.llm_max_attempts,
+            scan_state=scan_state,
         )
         # Replace core fields with LLM output; keep metadata/debug shape consistent.
         listing["title"] = llm_result.listing.get("title", listing.get("title", ""))
@@ -221,10 +384,18 @@ def _cmd_listing_generate(args: argparse.Namespace) -> int:
         listing["metadata"]["llm_provider"] = args.llm_provider
         listing["metadata"]["llm_model"] = args.llm_model
         listing["metadata"]["llm_used_fallback"] = llm_result.used_fallback
+        listing["metadata"]["llm_scan_stats"] = llm_result.scan_stats
     _write_output(args.out, args.force, json_dumps(listing))
     return 0
 
 
+def _load_relevance(path: Path, facts: dict[str, Any]) -> dict[str, float]:
+    try:
+        return relevance_for_sku(load_json(path), sku_key(facts.get("sku")))
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Failed to load keyword relevance: {e}") from e
+
+
 def _cmd_listing_render(args: argparse.Namespace) -> int:
     listing = load_json(args.listing)
     title = str(listing.get("title") or "").strip()
@@ -264,11 +435,95 @@ def _cmd_keywords_suggest(args: argparse.Namespace) -> int:
     # Filter hard-blocked keywords by default for safety.
     flat = [*suggested.get("primary", []), *suggested.get("secondary", []), *suggested.get("application", []), *suggested.get("long_tail", [])]
     safe, blocked = filter_keywords(flat, allow_grade_terms_from_product_name=product_name)
-    out = {"suggested": suggested, "safe_flat": safe, "blocked_flat": blocked}
+    out: dict[str, Any] = {"suggested": suggested, "safe_flat": safe, "blocked_flat": blocked}
+    if args.index is not None:
+        if not args.index.exists():
+            raise SystemExit(f"Keyword index not found: {args.index} (build it with 'keywords index')")
+        sibling = CatalogKeywordIndex.load(args.index).suggest(facts, limit=args.limit)
+        allowed, _ = filter_keywords([s["term"] for s in sibling], allow_grade_terms_from_product_name=product_name)
+        allowed_set = set(allowed)
+        out["sibling_terms"] = [s for s in sibling if s["term"] in allowed_set]
+    if args.demand is not None:
+        with _open_demand(args.demand) as demand:
+            scores = demand.scores(safe)
+            out["safe_by_demand"] = [
+                {"term": t, "demand": round(scores.get(normalize_term(t), 0.0), 3)} for t in demand.rank(safe)
+            ]
     _write_output(args.out, args.force, json_dumps(out))
     return 0
 
 
+def _open_demand(path: Path) -> DemandTable:
+    if not path.exists():
+        raise SystemExit(f"Demand table not found: {path} (build it with 'keywords ingest')")
+    return DemandTable(path)
+
+
+def _cmd_keywords_ingest(args: argparse.Namespace) -> int:
+    args.demand.parent.mkdir(parents=True, exist_ok=True)
+    results: list[dict[str, Any]] = []
+    failed = False
+    with DemandTable(args.demand) as demand:
+        for report in args.reports:
+            try:
+                results.append(demand.ingest(report, flush_terms=args.flush_terms).to_dict())
+            except (OSError, ValueError, csv.Error) as e:
+                sys.stderr.write(f"Skipping {report}: {e}\n")
+                failed = True
+        summary = {"reports": results, "terms": len(demand)}
+    _write_output(args.out, args.force, json_dumps(summary))
+    return 1 if failed else 0
+
+
+def _cmd_keywords_index(args: argparse.Namespace) -> int:
+    index = CatalogKeywordIndex.load(args.index)
+    seen: set[str] = set()
+    updated = unchanged = 0
+    for path in iter_facts_files(args.inputs):
+        try:
+            facts = load_json(path)
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"Skipping {path}: {e}\n")
+            continue
+        sku = sku_key(facts.get("sku")) if isinstance(facts, dict) else ""
+        if not sku:
+            sys.stderr.write(f"Skipping {path}: no sku\n")
+            continue
+        seen.add(sku)
+        if index.update(facts):
+            updated += 1
+        else:
+            unchanged += 1
+    removed = [sku for sku in list(index.cards) if sku not in seen] if args.prune else []
+    for sku in removed:
+        index.remove(sku)
+    if updated or removed or not args.index.exists():
+        index.save(args.index)
+    summary = {"cards": len(index), "updated": updated, "unchanged": unchanged, "removed": len(removed)}
+    _write_output(args.out, args.force, json_dumps(summary))
+    return 0
+
+
+def _cmd_keywords_rank(args: argparse.Namespace) -> int:
+    def cards() -> Iterable[dict[str, Any]]:
+        for path in iter_facts_files(args.inputs):
+            try:
+                facts = load_json(path)
+            except (OSError, ValueError) as e:
+                sys.stderr.write(f"Skipping {path}: {e}\n")
+                continue
+            if not isinstance(facts, dict) or not sku_key(facts.get("sku")):
+                sys.stderr.write(f"Skipping {path}: no sku\n")
+                continue
+            yield facts
+
+    matrix = TermDocumentMatrix.from_facts(cards())
+    for sku in matrix.duplicates:
+        sys.stderr.write(f"Skipping duplicate sku {sku}: ranked from its first facts card\n")
+    _write_output(args.out, args.force, json_dumps(rankings_to_json(matrix.rankings(limit=args.limit))))
+    return 0
+
+
 def _cmd_keywords_filter(args: argparse.Namespace) -> int:
     allow_name = args.allow_grade_terms_from_product_name
     if not allow_name and args.facts:
@@ -286,7 +541,13 @@ def _cmd_keywords_filter(args: argparse.Namespace) -> int:
             if line.strip()
         ]
 
+    if args.rule_stats:
+        enable_rule_stats()
     safe, blocked = filter_keywords(raw, allow_grade_terms_from_product_name=allow_name)
+    _write_rule_stats(disable_rule_stats())
+    if args.demand is not None:
+        with _open_demand(args.demand) as demand:
+            safe = demand.rank(safe)
     out = {"safe": safe, "blocked": blocked}
     _write_output(args.out, args.force, json_dumps(out) if args.format == "json" else "\n".join(safe) + "\n")
     return 0 if not blocked else 2
@@ -317,6 +578,7 @@ def _cmd_flatfile_generate(args: argparse.Namespace) -> int:
     flat_opts = FlatFileOptions(
         product_type=args.product_type,
         marketplace_id=args.marketplace_id,
+        language_tag=args.language_tag,
         record_action=args.record_action,
         sheet_name=args.sheet,
         output_format=args.format,
@@ -357,14 +619,15 @@ def _cmd_shopify_fetch(args: argparse.Namespace) -> int:
 def _cmd_listing_from_shopify(args: argparse.Namespace) -> int:
     client = ShopifyClient.from_env()
     fetched = fetch_by_sku(client=client, sku=args.sku)
-    built = build_facts_from_shopify(fetched)
+    built = build_facts_from_shopify(fetched, redaction=args.redaction)
     # Generate base listing from structured Shopify facts.
     options = GenerationOptions(
         size=built.report.get("size_from_option2") or args.size,
         html_description=False,
         include_debug=args.include_debug,
     )
-    listing = generate_listing(built.facts, options=options)
+    scan_state = listing_scan_state(built.facts)
+    listing = generate_listing(built.facts, options=options, scan_state=scan_state)
     listing.setdefault("metadata", {})
     listing["metadata"]["source"] = "shopify"
     listing["metadata"]["shopify_shop_domain"] = client.shop_domain
@@ -388,6 +651,7 @@ def _cmd_listing_from_shopify(args: argparse.Namespace) -> int:
             client=llm_client,
             model=args.llm_model,
             max_attempts=args.llm_max_attempts,
+            scan_state=scan_state,
         )
         listing["title"] = llm_result.listing.get("title", listing.get("title", ""))
         listing["bullets"] = llm_result.listing.get("bullets", listing.get("bullets", []))
@@ -404,6 +668,7 @@ def _cmd_listing_from_shopify(args: argparse.Namespace) -> int:
         listing["metadata"]["llm_provider"] = args.llm_provider
         listing["metadata"]["llm_model"] = args.llm_model
         listing["metadata"]["llm_used_fallback"] = llm_result.used_fallback
+        listing["metadata"]["llm_scan_stats"] = llm_result.scan_stats
 
     _write_output(args.out, args.force, json_dumps(listing))
     return 0
@@ -415,7 +680,7 @@ def _cmd_amazon_build_patch(args: argparse.Namespace) -> int:
         listing=listing,
         options=PatchBuildOptions(
             marketplace_id=args.marketplace_id,
-            language_tag="en_US",
+            language_tag=args.language_tag,
             product_type=args.product_type,
         ),
     )
@@ -430,12 +695,24 @@ def _cmd_amazon_update(args: argparse.Namespace) -> int:
         raise SystemExit(
             "Refusing to publish: listing compliance_status != 'pass' (use --allow-noncompliant to override)"
         )
+    locale = locale_for(args.marketplace_id, args.language_tag)
+    if locale and LOCALE_RULE_PACKS[locale] and not args.allow_noncompliant:
+        # compliance_status was computed with the default rules; this marketplace has its own.
+        metadata = listing.get("metadata") if isinstance(listing.get("metadata"), dict) else {}
+        config = ScanConfig(
+            allow_grade_terms_from_product_name=str(metadata.get("product_name") or "").strip() or None,
+            locale=locale,
+        )
+        if listing_has_hard_finding(listing, config=config):
+            raise SystemExit(
+                f"Refusing to publish: listing fails the {locale} compliance rules (use --allow-noncompliant to override)"
+            )
 
     body = build_listings_item_patch(
         listing=listing,
         options=PatchBuildOptions(
             marketplace_id=args.marketplace_id,
-            language_tag="en_US",
+            language_tag=args.language_tag,
             product_type=args.product_type,
         ),
     )
@@ -501,7 +778,7 @@ def build_parser() -> argparse.ArgumentParser:
     comp_sub = compliance.add_subparsers(dest="comp_cmd", required=True)
 
     comp_scan = comp_sub.add_parser("scan", help="Scan text or listing JSON for compliance risks")
-    comp_scan.add_argument("input", type=Path, help="Text file or listing JSON to scan")
+    comp_scan.add_argument("input", type=Path, help="Text file or listing JSON to scan ('-' for stdin with --stream)")
     comp_scan.add_argument("--format", choices=["text", "json"], default="text")
     comp_scan.add_argument(
         "--facts",
@@ -515,9 +792,98 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional product name used to allow grade terms found in that name.",
     )
+    comp_scan.add_argument(
+        "--rule-pack",
+        type=Path,
+        default=None,
+        help="Compliance rule pack JSON (default: $ALLIANCE_AMAZON_RULE_PACK or the bundled pack).",
+    )
+    comp_scan.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print scan throughput (texts/s, chars/s, avg us/text) and cache counters to stderr.",
+    )
+    comp_scan.add_argument(
+        "--locale",
+        type=_locale_arg,
+        default=None,
+        help=f"Marketplace rule set ({', '.join(LOCALE_RULE_PACKS)}; default: the active rule pack).",
+    )
+    comp_scan.add_argument(
+        "--rule-stats",
+        action="store_true",
+        help="Print per-rule evaluation counts, time, matches, never-matching rules and the slowest inputs to stderr.",
+    )
+    comp_scan.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Also flag near-misses of blocked terms (typos, split words, invisible characters, homoglyphs).",
+    )
+    comp_scan.add_argument(
+        "--html",
+        action="store_true",
+        help="Scan a text input as HTML: tags stripped, entities decoded, offsets into the markup (implied for .html/.htm).",
+    )
+    comp_scan.add_argument(
+        "--stream",
+        action="store_true",
+        help="Scan the input as plain text in bounded chunks, emitting findings (JSONL with --format json) as they are found.",
+    )
+    comp_scan.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_CHARS,
+        help=f"Characters read per chunk with --stream (default: {DEFAULT_CHUNK_CHARS}).",
+    )
     _add_common_io_args(comp_scan)
     comp_scan.set_defaults(func=_cmd_compliance_scan)
 
+    comp_audit = comp_sub.add_parser(
+        "audit", help="Scan every listing JSON under directories/JSONL files in parallel (JSONL output)"
+    )
+    comp_audit.add_argument(
+        "inputs",
+        type=Path,
+        nargs="+",
+        help="Directories (walked for *.json/*.jsonl), listing JSON files, JSONL files, or '-' for JSONL on stdin",
+    )
+    comp_audit.add_argument(
+        "--jobs", type=int, default=None, help="Worker processes (default: CPU count; 1 scans in-process)"
+    )
+    comp_audit.add_argument(
+        "--rule-pack",
+        type=Path,
+        default=None,
+        help="Compliance rule pack JSON (default: $ALLIANCE_AMAZON_RULE_PACK or the bundled pack).",
+    )
+    comp_audit.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Also flag near-misses of blocked terms (typos, split words, invisible characters, homoglyphs).",
+    )
+    comp_audit.add_argument(
+        "--locale",
+        type=_locale_arg,
+        default=None,
+        help=f"Marketplace rule set ({', '.join(LOCALE_RULE_PACKS)}; default: the active rule pack).",
+    )
+    comp_audit.add_argument(
+        "--rule-stats",
+        action="store_true",
+        help="Print per-rule evaluation counts, time, matches, never-matching rules and the slowest inputs to stderr.",
+    )
+    comp_audit.add_argument(
+        "--findings-table",
+        type=Path,
+        default=None,
+        help="Also write every finding as a columnar table: CSV for a .csv path, columnar JSON otherwise.",
+    )
+    comp_audit.add_argument(
+        "--only-failing", action="store_true", help="Only emit records for listings with hard findings or errors"
+    )
+    _add_common_io_args(comp_audit)
+    comp_audit.set_defaults(func=_cmd_compliance_audit)
+
     listing = sub.add_parser("listing", help="Generate and render listing drafts")
     list_sub = listing.add_subparsers(dest="listing_cmd", required=True)
 
@@ -534,6 +900,24 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Include debug payload (facts + validation issues) in listing JSON.",
     )
+    list_gen.add_argument(
+        "--demand",
+        type=Path,
+        default=None,
+        help="Demand table (from 'keywords ingest'): pack backend search terms by search demand.",
+    )
+    list_gen.add_argument(
+        "--relevance",
+        type=Path,
+        default=None,
+        help="Keyword relevance (from 'keywords rank'): pack backend search terms by catalog TF-IDF.",
+    )
+    list_gen.add_argument(
+        "--optimize-title",
+        action="store_true",
+        help="Append the suggested keyword phrases that cover the most keyword weight within the title limit "
+        "(weighted by --relevance/--demand when given); search stats go to metadata.title_optimizer.",
+    )
     list_gen.add_argument(
         "--llm-provider",
         type=str,
@@ -565,9 +949,56 @@ def build_parser() -> argparse.ArgumentParser:
 
     kw_suggest = kw_sub.add_parser("suggest", help="Suggest keywords from a facts card")
     kw_suggest.add_argument("--facts", type=Path, required=True, help="Facts card JSON path")
+    kw_suggest.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help="Catalog keyword index (from 'keywords index'): also propose terms of sibling SKUs "
+        "with the same CAS number or applications.",
+    )
+    kw_suggest.add_argument("--limit", type=int, default=20, help="Sibling terms to propose (default: 20)")
+    kw_suggest.add_argument(
+        "--demand",
+        type=Path,
+        default=None,
+        help="Demand table (from 'keywords ingest'): also list the safe keywords by search demand.",
+    )
     _add_common_io_args(kw_suggest)
     kw_suggest.set_defaults(func=_cmd_keywords_suggest)
 
+    kw_index = kw_sub.add_parser(
+        "index", help="Build or incrementally update the catalog-wide keyword index from facts cards"
+    )
+    kw_index.add_argument("inputs", type=Path, nargs="+", help="Facts card JSON files or directories of them")
+    kw_index.add_argument("--index", type=Path, required=True, help="Index file (created if missing)")
+    kw_index.add_argument(
+        "--prune", action="store_true", help="Drop indexed SKUs whose facts card is not among the inputs"
+    )
+    _add_common_io_args(kw_index)
+    kw_index.set_defaults(func=_cmd_keywords_index)
+
+    kw_ingest = kw_sub.add_parser(
+        "ingest", help="Stream Amazon search-term reports (CSV/TSV, optionally .gz) into a demand table"
+    )
+    kw_ingest.add_argument("reports", type=Path, nargs="+", help="Search-term report files")
+    kw_ingest.add_argument("--demand", type=Path, required=True, help="Demand table (SQLite, created if missing)")
+    kw_ingest.add_argument(
+        "--flush-terms",
+        type=int,
+        default=DEFAULT_FLUSH_TERMS,
+        help=f"Distinct terms held in memory before writing them out (default: {DEFAULT_FLUSH_TERMS}).",
+    )
+    _add_common_io_args(kw_ingest)
+    kw_ingest.set_defaults(func=_cmd_keywords_ingest)
+
+    kw_rank = kw_sub.add_parser(
+        "rank", help="Rank every facts card's keyword words by TF-IDF across the catalog"
+    )
+    kw_rank.add_argument("inputs", type=Path, nargs="+", help="Facts card JSON files or directories of them")
+    kw_rank.add_argument("--limit", type=int, default=None, help="Top words to keep per SKU (default: all)")
+    _add_common_io_args(kw_rank)
+    kw_rank.set_defaults(func=_cmd_keywords_rank)
+
     kw_filter = kw_sub.add_parser("filter", help="Filter keywords through the compliance scanner")
     kw_filter.add_argument("keywords", type=Path, help="Text file (1 keyword/line) or JSON array")
     kw_filter.add_argument("--format", choices=["text", "json"], default="text")
@@ -583,6 +1014,17 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional product name used to allow grade terms found in that name.",
     )
+    kw_filter.add_argument(
+        "--rule-stats",
+        action="store_true",
+        help="Print per-rule evaluation counts, time, matches, never-matching rules and the slowest inputs to stderr.",
+    )
+    kw_filter.add_argument(
+        "--demand",
+        type=Path,
+        default=None,
+        help="Demand table (from 'keywords ingest'): order safe keywords by search demand.",
+    )
     _add_common_io_args(kw_filter)
     kw_filter.set_defaults(func=_cmd_keywords_filter)
 
@@ -603,6 +1045,12 @@ def build_parser() -> argparse.ArgumentParser:
     ff_gen.add_argument("--size", type=str, default=None, help="Preferred size to use in listing/title fields")
     ff_gen.add_argument("--product-type", type=str, default="LAB_CHEMICAL")
     ff_gen.add_argument("--marketplace-id", type=str, default="ATVPDKIKX0DER")
+    ff_gen.add_argument(
+        "--language-tag",
+        type=str,
+        default=None,
+        help="Listing language (e.g. fr_CA); picks the marketplace's compliance rule set for that language.",
+    )
     ff_gen.add_argument("--record-action", type=str, default="full_update")
     ff_gen.add_argument("--format", choices=["tsv", "csv"], default="tsv")
     ff_gen.add_argument("--allow-noncompliant", action="store_true", help="Export even if compliance scan fails")
@@ -625,6 +1073,12 @@ def build_parser() -> argparse.ArgumentParser:
     list_from_shopify.add_argument(
         "--size", type=str, default=None, help="Override size (otherwise uses Shopify option2 value)"
     )
+    list_from_shopify.add_argument(
+        "--redaction",
+        choices=list(REDACTION_STRATEGIES),
+        default="drop",
+        help="How blocked terms in Shopify title/descriptions are redacted (default: drop).",
+    )
     list_from_shopify.add_argument(
         "--include-debug",
         action="store_true",
@@ -657,6 +1111,7 @@ def build_parser() -> argparse.ArgumentParser:
     am_build = am_sub.add_parser("build-patch", help="Build a Listings Items PATCH body from a listing JSON")
     am_build.add_argument("--listing", type=Path, required=True, help="Listing JSON (from listing generate)")
     am_build.add_argument("--marketplace-id", type=str, default="ATVPDKIKX0DER")
+    am_build.add_argument("--language-tag", type=str, default="en_US")
     am_build.add_argument("--product-type", type=str, default=None)
     _add_common_io_args(am_build)
     am_build.set_defaults(func=_cmd_amazon_build_patch)
@@ -665,6 +1120,12 @@ def build_parser() -> argparse.ArgumentParser:
     am_update.add_argument("--sku", type=str, required=True, help="Seller SKU (must match Shopify variant SKU)")
     am_update.add_argument("--listing", type=Path, required=True, help="Listing JSON to publish")
     am_update.add_argument("--marketplace-id", type=str, default="ATVPDKIKX0DER")
+    am_update.add_argument(
+        "--language-tag",
+        type=str,
+        default="en_US",
+        help="Listing language; marketplaces with their own rule set (CA-fr, MX-es, DE) rescan the listing with it.",
+    )
     am_update.add_argument("--product-type", type=str, default=None)
     am_update.add_argument("--dry-run", action="store_true", help="Build patch only (no network)")
     am_update.add_argument("--publish", action="store_true", help="Actually call SP-API PATCH")
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .findings_table import FindingsTable
+from .rulestats import RuleStats
+from .scanner import (
+    ScanConfig,
+    active_rule_pack,
+    disable_rule_stats,
+    enable_rule_stats,
+    rule_pack_for,
+    scan_listing_fields,
+    use_rule_pack,
+)
+
+
+# A work item: (source label, listing JSON file path or None, raw JSON text or None).
+_Item = tuple[str, str | None, str | None]
+
+
+def iter_audit_items(inputs: Iterable[Path]) -> Iterator[_Item]:
+    """
+    Expand audit inputs into work items without parsing them.
+
+    Directories are walked for *.json and *.jsonl files (sorted, so runs are
+    reproducible); a .jsonl file or "-" (stdin) yields one listing per line.
+    """
+    for path in inputs:
+        if str(path) == "-":
+            yield from _iter_jsonl_items(sys.stdin, "<stdin>")
+        elif path.is_dir():
+            for p in sorted(path.rglob("*")):
+                if p.is_file() and p.suffix.lower() in (".json", ".jsonl"):
+                    yield from _iter_file_items(p)
+        else:
+            yield from _iter_file_items(path)
+
+
+def _iter_file_items(path: Path) -> Iterator[_Item]:
+    if path.suffix.lower() == ".jsonl":
+        with path.open("r", encoding="utf-8", errors="replace") as fp:
+            yield from _iter_jsonl_items(fp, str(path))
+    else:
+        # Workers read single-listing files themselves; only the path crosses processes.
+        yield str(path), str(path), None
+
+
+def _iter_jsonl_items(lines: Iterable[str], label: str) -> Iterator[_Item]:
+    for lineno, line in enumerate(lines, start=1):
+        if line.strip():
+            yield f"{label}:{lineno}", None, line
+
+
+def audit_listing(
+    item: _Item, *, fuzzy: bool = False, rule_stats: bool = False, locale: str | None = None
+) -> dict[str, Any]:
+    """
+    Scan one listing into a JSON-ready record (runs inside pool workers).
+
+    With rule_stats, the record carries this listing's per-rule counters under
+    "rule_stats" for AuditSummary to merge.
+    """
+    source, path, raw = item
+    try:
+        if path is not None:
+            raw = Path(path).read_text(encoding="utf-8")
+        payload = json.loads(raw or "")
+    except (OSError, ValueError) as e:
+        return {"source": source, "error": f"{type(e).__name__}: {e}"}
+
+    metadata = payload.get("metadata") if isinstance(payload, dict) else None
+    product_name = metadata.get("product_name") if isinstance(metadata, dict) else None
+    config = ScanConfig(
+        allow_grade_terms_from_product_name=product_name if isinstance(product_name, str) else None,
+        fuzzy=fuzzy,
+        locale=locale,
+    )
+    if rule_stats:
+        enable_rule_stats()
+    try:
+        findings = scan_listing_fields(payload, config=config)
+    finally:
+        stats = disable_rule_stats() if rule_stats else None
+    record = {
+        "source": source,
+        "sku": metadata.get("sku") if isinstance(metadata, dict) else None,
+        "status": "fail" if any(f.severity == "hard" for f in findings) else "pass",
+        "findings": [f.to_dict() for f in findings],
+    }
+    if stats is not None:
+        record["rule_stats"] = stats.to_state()
+    return record
+
+
+def _init_worker(rule_pack: str | None, locale: str | None) -> None:
+    # Compile (or load the on-disk compiled form) once per worker, not per listing.
+    if rule_pack:
+        use_rule_pack(Path(rule_pack))
+    rule_pack_for(ScanConfig(locale=locale))
+
+
+def rule_categories(locale: str | None = None) -> dict[str, str]:
+    """Map finding rule ids of the locale's (default: the active) rule pack to a reporting category."""
+    rules = rule_pack_for(ScanConfig(locale=locale))
+    categories = {f"BLOCKLIST-{t.rule_id}": t.category for t in rules.blocked}
+    for _, rule_id, _ in rules.proximity_rules:
+        categories.setdefault(rule_id, "claim_pattern")
+    categories.setdefault("RULE-GRADE-UNVERIFIED", "grade")
+    categories.setdefault("RULE-GRADE-MISMATCH", "grade")
+    return categories
+
+
+@dataclass
+class AuditSummary:
+    """
+    Aggregate counts of an audit, built from a FindingsTable of every finding.
+
+    The table keeps findings as interned integer columns, so a catalog-wide
+    run holds no per-finding Python objects; write it out with
+    FindingsTable.write_csv() / to_json() for dashboards.
+    """
+
+    categories: dict[str, str] = field(default_factory=dict)
+    listings: int = 0
+    failed: int = 0
+    errors: int = 0
+    table: FindingsTable = field(default_factory=FindingsTable)
+    rule_stats: RuleStats | None = None
+    started: float = field(default_factory=time.perf_counter)
+
+    def __post_init__(self) -> None:
+        # Shared, so categories filled in later (run_audit) reach the table too.
+        self.table.categories = self.categories
+
+    def add(self, record: dict[str, Any]) -> None:
+        self.listings += 1
+        state = record.pop("rule_stats", None)
+        if state is not None and self.rule_stats is not None:
+            self.rule_stats.merge(state)
+        if "error" in record:
+            self.errors += 1
+            return
+        if record["status"] == "fail":
+            self.failed += 1
+        self.table.add_record(record)
+
+    def to_dict(self) -> dict[str, Any]:
+        seconds = time.perf_counter() - self.started
+        return {
+            "listings": self.listings,
+            "failed": self.failed,
+            "errors": self.errors,
+            "findings": len(self.table),
+            "by_rule": dict(self.table.counts("rule").most_common()),
+            "by_category": dict(self.table.counts("category").most_common()),
+            "by_field": dict(self.table.counts("field_group").most_common()),
+            "by_severity": dict(self.table.counts("severity").most_common()),
+            "by_sku_prefix": dict(self.table.counts("sku_prefix").most_common()),
+            "seconds": round(seconds, 3),
+            "listings_per_second": round(self.listings / seconds, 1) if seconds > 0 else 0.0,
+        }
+
+
+def run_audit(
+    inputs: Iterable[Path],
+    *,
+    jobs: int | None = None,
+    rule_pack: Path | None = None,
+    chunksize: int = 64,
+    fuzzy: bool = False,
+    locale: str | None = None,
+    summary: AuditSummary | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Scan every listing under inputs, yielding one record per listing in input order.
+
+    jobs=1 scans in-process; otherwise listings fan out over a process pool
+    whose workers each compile the rule pack (or the locale's rule set) once.
+    rule_pack is activated first; None scans with the already active pack,
+    which workers load from the same file.
+    Pass an AuditSummary to collect aggregate counts as records stream past;
+    give it a RuleStats to also collect per-rule counters from every worker.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if rule_pack is not None:
+        use_rule_pack(rule_pack)
+    if summary is not None and not summary.categories:
+        summary.categories.update(rule_categories(locale))
+    items = iter_audit_items(inputs)
+    rule_stats = summary is not None and summary.rule_stats is not None
+    scan = partial(audit_listing, fuzzy=fuzzy, rule_stats=rule_stats, locale=locale)
+
+    if jobs <= 1:
+        for record in map(scan, items):
+            if summary is not None:
+                summary.add(record)
+            yield record
+        return
+
+    path = active_rule_pack().pack.path
+    initargs = (str(path) if path else None, locale)
+    with Pool(processes=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        for record in pool.imap(scan, items, chunksize=max(1, chunksize)):
+            if summary is not None:
+                summary.add(record)
+            yield record
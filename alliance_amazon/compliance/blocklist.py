@@ -1,7 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Iterable
+
+from .proximity import ProximityRule, ProximityRuleError, parse_proximity_rule
+
+
+# Terms are derived from alliance-amazon-seo-master-plan (3).md (Jan 2024) and
+# ship as a versioned rule pack so compliance can update them without a release.
+DEFAULT_RULE_PACK_PATH = Path(__file__).with_name("rulepacks") / "default.json"
+
+# Point this at an alternative rule pack JSON to override the bundled one.
+RULE_PACK_ENV = "ALLIANCE_AMAZON_RULE_PACK"
+
+_SEVERITIES = ("hard", "soft")
 
 
 @dataclass(frozen=True)
@@ -12,152 +29,160 @@ class BlockedTerm:
     term: str
 
 
+@dataclass(frozen=True)
+class RulePack:
+    version: str
+    content_hash: str  # sha256 of the rule pack file bytes
+    terms: tuple[BlockedTerm, ...]
+    grade_terms: tuple[str, ...]
+    token_classes: tuple[tuple[str, str], ...] = ()
+    proximity_rules: tuple[ProximityRule, ...] = ()
+    # Known-benign phrases ("natural gas"); blocklist hits inside one are suppressed.
+    allow_phrases: tuple[str, ...] = ()
+    path: Path | None = None  # the file it was loaded from
+
+    @property
+    def cache_version(self) -> str:
+        return f"{self.version}+{self.content_hash[:12]}"
+
+
+class RulePackError(ValueError):
+    pass
+
+
+def parse_rule_pack(data: Any, *, content_hash: str) -> RulePack:
+    if not isinstance(data, dict):
+        raise RulePackError("Rule pack must be a JSON object")
+    version = data.get("version")
+    if not isinstance(version, str) or not version.strip():
+        raise RulePackError("Rule pack 'version' is required")
+    grade_terms = data.get("grade_terms", [])
+    if not isinstance(grade_terms, list) or not all(isinstance(g, str) for g in grade_terms):
+        raise RulePackError("Rule pack 'grade_terms' must be a list of strings")
+    rules = data.get("rules")
+    if not isinstance(rules, list):
+        raise RulePackError("Rule pack 'rules' must be a list")
+
+    terms: list[BlockedTerm] = []
+    for i, rule in enumerate(rules):
+        if not isinstance(rule, dict):
+            raise RulePackError(f"rules[{i}] must be an object")
+        rule_id = rule.get("rule_id")
+        severity = rule.get("severity")
+        category = rule.get("category")
+        if not isinstance(rule_id, str) or not rule_id:
+            raise RulePackError(f"rules[{i}].rule_id is required")
+        if severity not in _SEVERITIES:
+            raise RulePackError(f"rules[{i}].severity must be one of {list(_SEVERITIES)}")
+        if not isinstance(category, str) or not category:
+            raise RulePackError(f"rules[{i}].category is required")
+        rule_terms = rule.get("terms")
+        if not isinstance(rule_terms, list) or not all(isinstance(t, str) for t in rule_terms):
+            raise RulePackError(f"rules[{i}].terms must be a list of strings")
+        for term in rule_terms:
+            terms.append(BlockedTerm(rule_id, severity, category, term))
+
+    allow_phrases = data.get("allow_phrases", [])
+    if not isinstance(allow_phrases, list) or not all(isinstance(p, str) for p in allow_phrases):
+        raise RulePackError("Rule pack 'allow_phrases' must be a list of strings")
+
+    token_classes = data.get("token_classes", {})
+    if not isinstance(token_classes, dict) or not all(isinstance(v, str) for v in token_classes.values()):
+        raise RulePackError("Rule pack 'token_classes' must map names to regex strings")
+    for name, pattern in token_classes.items():
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise RulePackError(f"token_classes.{name} is not a valid regex: {e}") from e
+    classes = {str(k).lower(): v for k, v in token_classes.items()}
+
+    raw_proximity = data.get("proximity_rules", [])
+    if not isinstance(raw_proximity, list):
+        raise RulePackError("Rule pack 'proximity_rules' must be a list")
+    proximity: list[ProximityRule] = []
+    for i, rule in enumerate(raw_proximity):
+        if not isinstance(rule, dict):
+            raise RulePackError(f"proximity_rules[{i}] must be an object")
+        rule_id = rule.get("rule_id")
+        severity = rule.get("severity")
+        message = rule.get("message")
+        expr = rule.get("rule")
+        if not isinstance(rule_id, str) or not rule_id:
+            raise RulePackError(f"proximity_rules[{i}].rule_id is required")
+        if severity not in _SEVERITIES:
+            raise RulePackError(f"proximity_rules[{i}].severity must be one of {list(_SEVERITIES)}")
+        if not isinstance(message, str) or not isinstance(expr, str):
+            raise RulePackError(f"proximity_rules[{i}] needs string 'message' and 'rule'")
+        try:
+            parsed = parse_proximity_rule(expr, rule_id=rule_id, severity=severity, message=message)
+        except ProximityRuleError as e:
+            raise RulePackError(str(e)) from e
+        for ts in (parsed.anchor, parsed.target):
+            if ts.token_class is not None and ts.token_class not in classes:
+                raise RulePackError(f"proximity_rules[{i}] uses unknown token class <{ts.token_class}>")
+        proximity.append(parsed)
+
+    return RulePack(
+        version=version.strip(),
+        content_hash=content_hash,
+        terms=tuple(terms),
+        grade_terms=tuple(g.strip().lower() for g in grade_terms if g.strip()),
+        token_classes=tuple(sorted(classes.items())),
+        proximity_rules=tuple(proximity),
+        allow_phrases=tuple(p.strip() for p in allow_phrases if p.strip()),
+    )
+
+
+def rule_pack_path() -> Path:
+    override = os.environ.get(RULE_PACK_ENV, "").strip()
+    return Path(override) if override else DEFAULT_RULE_PACK_PATH
+
+
+# Sections a pack with "extends" appends to its base pack's; token_classes are merged.
+_EXTENDED_SECTIONS = ("grade_terms", "rules", "allow_phrases", "proximity_rules")
+
+
+def _read_rule_pack_data(path: Path, seen: tuple[Path, ...] = (), base: Path | None = None) -> tuple[Any, bytes]:
+    """
+    Rule pack JSON with its "extends" chain resolved, and the bytes of every file in the chain.
+
+    base, if given, is read in place of the file this pack extends.
+    """
+    resolved = path.resolve()
+    if resolved in seen:
+        raise RulePackError(f"Rule pack {path} extends itself")
+    raw = path.read_bytes()
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise RulePackError(f"Invalid rule pack JSON in {path}: {e}") from e
+    if not isinstance(data, dict) or "extends" not in data:
+        return data, raw
+    base_name = data.pop("extends")
+    if not isinstance(base_name, str) or not base_name:
+        raise RulePackError(f"Rule pack {path}: 'extends' must name a rule pack file")
+    base, base_raw = _read_rule_pack_data(base or path.parent / base_name, (*seen, resolved))
+    if not isinstance(base, dict):
+        raise RulePackError(f"Rule pack {path}: base pack {base_name} must be a JSON object")
+    merged = {**base, **data}
+    for key in _EXTENDED_SECTIONS:
+        if isinstance(base.get(key), list) and isinstance(data.get(key), list):
+            merged[key] = base[key] + data[key]
+    if isinstance(base.get("token_classes"), dict) and isinstance(data.get("token_classes"), dict):
+        merged["token_classes"] = {**base["token_classes"], **data["token_classes"]}
+    return merged, base_raw + raw
+
+
+def load_rule_pack(path: Path | None = None, *, base: Path | None = None) -> RulePack:
+    """
+    Load a rule pack file. A pack may set "extends" to another pack file (relative
+    to its own directory) to add terms and rules on top of it; base replaces that
+    file, so the same additions can go on top of another pack.
+    """
+    path = path or rule_pack_path()
+    data, raw = _read_rule_pack_data(path, base=base)
+    return replace(parse_rule_pack(data, content_hash=hashlib.sha256(raw).hexdigest()), path=path)
+
+
 def iter_blocked_terms() -> Iterable[BlockedTerm]:
-    # Derived from alliance-amazon-seo-master-plan (3).md (Jan 2024).
-    hard_antimicrobial = [
-        "disinfect",
-        "disinfectant",
-        "disinfecting",
-        "sanitize",
-        "sanitizer",
-        "sanitizing",
-        "antimicrobial",
-        "antibacterial",
-        "antifungal",
-        "antiviral",
-        "anti-mold",
-        "anti-mildew",
-        "germicidal",
-        "germicide",
-        "bactericidal",
-        "bactericide",
-        "fungicidal",
-        "fungicide",
-        "virucidal",
-        "virucide",
-        "sterilize",
-        "sterilizing",
-        "sterilant",
-        "kills germs",
-        "kills bacteria",
-        "kills viruses",
-        "kills mold",
-        "kills fungus",
-        "destroys germs",
-        "destroys bacteria",
-        "eliminates germs",
-        "eliminates bacteria",
-        "removes germs",
-        "removes bacteria",
-        "prevents bacterial growth",
-        "prevents mold growth",
-        "prevents mildew",
-        "stops bacteria",
-        "germ-free",
-        "bacteria-free",
-        "virus-free",
-        "99.9% of germs",
-        "hospital-grade",
-        "medical-grade disinfection",
-    ]
-    hard_pesticide = [
-        "repels insects",
-        "insect repellent",
-        "repels bugs",
-        "bug repellent",
-        "repels mosquitoes",
-        "mosquito repellent",
-        "repels rodents",
-        "rodent repellent",
-        "kills insects",
-        "insecticide",
-        "kills ants",
-        "kills roaches",
-        "kills spiders",
-        "pest control",
-        "pest killer",
-        "keeps bugs away",
-        "deters pests",
-    ]
-    hard_medical = [
-        "relieves pain",
-        "reduces inflammation",
-        "treats infection",
-        "medical grade",
-        "pharmaceutical grade",
-        "fda approved",
-    ]
-    hard_health = [
-        "removes allergens",
-        "eliminates allergens",
-        "hypoallergenic",
-        "allergy-free",
-        "asthma-safe",
-        "improves air quality",
-        "purifies air",
-        "detoxifies",
-        "detoxifying",
-        "cleanses toxins",
-    ]
-    hard_safety = [
-        "non-toxic",
-        "nontoxic",
-        "chemical-free",
-        "toxin-free",
-        "completely safe",
-        "100% safe",
-        "totally safe",
-        "absolutely safe",
-        "perfectly safe",
-        "harmless",
-        "no harmful chemicals",
-        "safe for everyone",
-        "safe for all uses",
-        "child-safe",
-        "pet-safe",
-    ]
-    soft_environment = [
-        "eco-friendly",
-        "environmentally friendly",
-        "sustainable",
-        "biodegradable",
-        "compostable",
-        "recyclable",
-        "carbon neutral",
-        "zero waste",
-        "planet-friendly",
-        "earth-friendly",
-        "natural",
-        "all-natural",
-        "organic",
-    ]
-    soft_superiority = [
-        "best",
-        "#1",
-        "number one",
-        "leading",
-        "top-rated",
-        "most effective",
-        "strongest",
-        "most powerful",
-        "better than",
-        "superior to",
-        "outperforms",
-        "unmatched",
-        "unbeatable",
-    ]
-
-    for term in hard_antimicrobial:
-        yield BlockedTerm("A", "hard", "antimicrobial", term)
-    for term in hard_pesticide:
-        yield BlockedTerm("B", "hard", "pesticide", term)
-    for term in hard_medical:
-        yield BlockedTerm("C", "hard", "medical", term)
-    for term in hard_health:
-        yield BlockedTerm("D", "hard", "health", term)
-    for term in hard_safety:
-        yield BlockedTerm("E", "hard", "safety", term)
-    for term in soft_environment:
-        yield BlockedTerm("F", "soft", "environment", term)
-    for term in soft_superiority:
-        yield BlockedTerm("G", "soft", "superiority", term)
+    yield from load_rule_pack().terms
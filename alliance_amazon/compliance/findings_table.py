@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import csv
+import re
+from array import array
+from collections import Counter
+from typing import IO, Any, Iterable, Iterator, Mapping
+
+from .scanner import Finding
+
+
+_NONE = -1
+_SEVERITIES = ("hard", "soft")
+
+
+def field_group(field_name: str) -> str:
+    # bullet_3 -> bullet, a_plus.modules[2].body -> a_plus
+    return re.sub(r"_\d+$", "", re.split(r"[.\[]", field_name, maxsplit=1)[0])
+
+
+def sku_prefix(sku: str, parts: int = 2) -> str:
+    """The first dash-separated parts of a SKU ("AC-IPA-99-1G" -> "AC-IPA"), the product family."""
+    return "-".join(sku.split("-")[:parts])
+
+
+class _Strings:
+    """Interned strings: each distinct value is stored once and referenced by id."""
+
+    __slots__ = ("ids", "values")
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: list[str] = []
+        self.ids: dict[str, int] = {}
+        for value in values:
+            self.id(value)
+
+    def id(self, value: str) -> int:
+        i = self.ids.get(value)
+        if i is None:
+            i = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+class FindingsTable:
+    """
+    Audit findings as columns of small integers instead of Finding objects.
+
+    Rule ids, messages, fields, matches, sources and SKUs are interned; each
+    finding is one entry per array column (listing row, rule, message, field,
+    match, severity, start, end), and each listing one entry in the listing
+    columns. Group-by counts run over the id columns and only turn ids back
+    into strings for the distinct values.
+    """
+
+    def __init__(self, categories: Mapping[str, str] | None = None) -> None:
+        # rule_id -> reporting category, as from audit.rule_categories().
+        self.categories = dict(categories or {})
+        self.strings = {name: _Strings() for name in ("rule", "message", "field", "match", "source", "sku")}
+        # Per listing.
+        self.listing_source = array("l")
+        self.listing_sku = array("l")
+        self.listing_failed = array("b")
+        # Per finding.
+        self.listing = array("l")
+        self.rule = array("l")
+        self.message = array("l")
+        self.field = array("l")
+        self.match = array("l")
+        self.severity = array("b")
+        self.start = array("l")
+        self.end = array("l")
+
+    def __len__(self) -> int:
+        return len(self.rule)
+
+    @property
+    def listings(self) -> int:
+        return len(self.listing_source)
+
+    def add_listing(self, source: str, sku: str | None, findings: Iterable[Finding | Mapping[str, Any]]) -> int:
+        """Append one listing and its findings (Finding objects or their to_dict() form); returns its row."""
+        row = len(self.listing_source)
+        strings = self.strings
+        failed = False
+        for f in findings:
+            d = f.to_dict() if isinstance(f, Finding) else f
+            severity = _SEVERITIES.index(d["severity"])
+            failed = failed or severity == 0
+            self.listing.append(row)
+            self.rule.append(strings["rule"].id(d["rule_id"]))
+            self.message.append(strings["message"].id(d["message"]))
+            self.field.append(strings["field"].id(d["field"]))
+            self.match.append(strings["match"].id(d["match"]))
+            self.severity.append(severity)
+            self.start.append(d.get("start", _NONE))
+            self.end.append(d.get("end", _NONE))
+        self.listing_source.append(strings["source"].id(source))
+        self.listing_sku.append(strings["sku"].id(sku) if sku else _NONE)
+        self.listing_failed.append(failed)
+        return row
+
+    def add_record(self, record: Mapping[str, Any]) -> int | None:
+        """Append an audit_listing() record; records with an error are skipped (None)."""
+        if "error" in record:
+            return None
+        return self.add_listing(record["source"], record.get("sku"), record["findings"])
+
+    def counts(self, by: str, *, sku_parts: int = 2) -> Counter[str]:
+        """
+        Findings per "rule", "category", "field", "field_group", "severity" or "sku_prefix".
+
+        SKU prefixes are the first sku_parts dash-separated parts; listings
+        without a SKU count under "".
+        """
+        out: Counter[str] = Counter()
+        if by == "severity":
+            for k, n in Counter(self.severity).items():
+                out[_SEVERITIES[k]] += n
+        elif by == "sku_prefix":
+            skus = self.strings["sku"].values
+            for row, n in Counter(self.listing).items():
+                sku = self.listing_sku[row]
+                out[sku_prefix(skus[sku], sku_parts) if sku != _NONE else ""] += n
+        else:
+            column, pool, key = {
+                "rule": (self.rule, "rule", None),
+                "category": (self.rule, "rule", lambda rule_id: self.categories.get(rule_id, "other")),
+                "field": (self.field, "field", None),
+                "field_group": (self.field, "field", field_group),
+            }[by]
+            values = self.strings[pool].values
+            for i, n in Counter(column).items():
+                out[key(values[i]) if key else values[i]] += n
+        return out
+
+    def iter_findings(self) -> Iterator[tuple[str, str | None, Finding]]:
+        """(source, sku, Finding) per finding, built on the fly."""
+        s = {name: pool.values for name, pool in self.strings.items()}
+        for i in range(len(self.rule)):
+            row = self.listing[i]
+            sku = self.listing_sku[row]
+            yield (
+                s["source"][self.listing_source[row]],
+                s["sku"][sku] if sku != _NONE else None,
+                Finding(
+                    severity=_SEVERITIES[self.severity[i]],
+                    rule_id=s["rule"][self.rule[i]],
+                    field=s["field"][self.field[i]],
+                    message=s["message"][self.message[i]],
+                    match=s["match"][self.match[i]],
+                    start=self.start[i] if self.start[i] != _NONE else None,
+                    end=self.end[i] if self.end[i] != _NONE else None,
+                ),
+            )
+
+    def write_csv(self, fp: IO[str]) -> None:
+        """One row per finding: source, sku, category, severity, rule_id, field, match, start, end."""
+        writer = csv.writer(fp)
+        writer.writerow(["source", "sku", "category", "severity", "rule_id", "field", "match", "start", "end"])
+        for source, sku, f in self.iter_findings():
+            writer.writerow(
+                [
+                    source,
+                    sku or "",
+                    self.categories.get(f.rule_id, "other"),
+                    f.severity,
+                    f.rule_id,
+                    f.field,
+                    f.match,
+                    "" if f.start is None else f.start,
+                    "" if f.end is None else f.end,
+                ]
+            )
+
+    def to_json(self) -> dict[str, Any]:
+        """Columnar JSON: string pools plus integer columns, loadable with from_json()."""
+        return {
+            "format": "findings-table/1",
+            "categories": self.categories,
+            "strings": {name: pool.values for name, pool in self.strings.items()},
+            "listings": {
+                "source": self.listing_source.tolist(),
+                "sku": self.listing_sku.tolist(),
+                "failed": self.listing_failed.tolist(),
+            },
+            "findings": {
+                name: getattr(self, name).tolist()
+                for name in ("listing", "rule", "message", "field", "match", "severity", "start", "end")
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> FindingsTable:
+        if data.get("format") != "findings-table/1":
+            raise ValueError(f"Not a findings table: format {data.get('format')!r}")
+        table = cls(data.get("categories"))
+        for name, values in data["strings"].items():
+            table.strings[name] = _Strings(values)
+        for name, values in data["listings"].items():
+            getattr(table, f"listing_{name}").extend(values)
+        for name, values in data["findings"].items():
+            getattr(table, name).extend(values)
+        return table
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Iterator, Sequence
+
+from .cache import LruCache
+
+
+# Characters that render as nothing and are used to split a word past exact matching.
+_INVISIBLE = frozenset(
+    "\u00ad\u034f\u061c\u115f\u1160\u17b4\u17b5\u180e\u200b\u200c"
+    "\u200d\u200e\u200f\u2060\u2061\u2062\u2063\u2064\ufeff"
+)
+
+# Cyrillic and Greek letters that look like Latin ones (compared after case folding).
+_HOMOGLYPHS = {
+    "\u0430": "a", "\u0432": "b", "\u0435": "e", "\u043a": "k", "\u043c": "m",
+    "\u043d": "h", "\u043e": "o", "\u0440": "p", "\u0441": "c", "\u0442": "t",
+    "\u0443": "y", "\u0445": "x", "\u0455": "s", "\u0456": "i", "\u0458": "j",
+    "\u0501": "d", "\u051b": "q", "\u051d": "w", "\u0261": "g", "\u0131": "i",
+    "\u03b1": "a", "\u03b2": "b", "\u03b5": "e", "\u03b7": "n", "\u03b9": "i",
+    "\u03ba": "k", "\u03bd": "v", "\u03bf": "o", "\u03c1": "p", "\u03c4": "t",
+    "\u03c5": "u", "\u03c7": "x", "\u03c9": "w",
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+# Tokens joined into one candidate may be separated by at most this many characters
+# ("anti bacterial", "99.9% of germs"), never by a line break.
+_MAX_GAP = 3
+
+
+def normalize_text(text: str) -> tuple[str, list[int] | None]:
+    """
+    Fold text for fuzzy matching: drop invisible characters and accents, case-fold,
+    and map homoglyphs to Latin letters.
+
+    Returns the folded text and, for each of its characters, the offset of the
+    source character it came from (None when the mapping is the identity).
+    """
+    if text.isascii():
+        return text.lower(), None
+    out: list[str] = []
+    offsets: list[int] = []
+    pos = 0
+    for m in _NON_ASCII.finditer(text):
+        # ASCII runs are copied in bulk; only the odd non-ASCII character is folded one by one.
+        i = m.start()
+        if i > pos:
+            out.append(text[pos:i].lower())
+            offsets.extend(range(pos, i))
+        pos = i + 1
+        ch = text[i]
+        if ch in _INVISIBLE:
+            continue
+        for c in unicodedata.normalize("NFKD", ch):
+            if unicodedata.combining(c):
+                continue
+            for folded in c.casefold():
+                out.append(_HOMOGLYPHS.get(folded, folded))
+                offsets.append(i)
+    if pos < len(text):
+        out.append(text[pos:].lower())
+        offsets.extend(range(pos, len(text)))
+    return "".join(out), offsets
+
+
+def term_key(term: str) -> str:
+    """Fuzzy key of a term: its folded letters and digits without separators."""
+    return "".join(_TOKEN.findall(normalize_text(term)[0]))
+
+
+_ANY = "[a-z0-9]"
+
+
+def _neighborhood(key: str, edits: int) -> set[tuple[str, ...]]:
+    """Every edit of key (as atoms, _ANY for an unknown character) within budget, first character fixed."""
+    found = {tuple(key)}
+    frontier = set(found)
+    for _ in range(edits):
+        nxt: set[tuple[str, ...]] = set()
+        for atoms in frontier:
+            for i in range(1, len(atoms) + 1):
+                nxt.add(atoms[:i] + (_ANY,) + atoms[i:])  # insertion
+                if i < len(atoms):
+                    nxt.add(atoms[:i] + atoms[i + 1 :])  # deletion
+                    nxt.add(atoms[:i] + (_ANY,) + atoms[i + 1 :])  # substitution
+        frontier = nxt - found
+        found |= nxt
+    return found
+
+
+def _automaton(keys: Sequence[str], edits: Sequence[int]) -> re.Pattern[str]:
+    """
+    One regex accepting exactly the strings within each key's edit budget.
+
+    The neighborhoods are merged into a trie so the regex engine walks every
+    key's Levenshtein automaton at once, at C speed.
+    """
+    end = ""
+    trie: dict[str, dict] = {}
+    for key, budget in zip(keys, edits):
+        if not key or budget < 0:
+            continue
+        for atoms in _neighborhood(key, budget):
+            node = trie
+            for atom in atoms:
+                node = node.setdefault(atom, {})
+            node[end] = {}
+
+    def emit(node: dict[str, dict]) -> str:
+        alts = [(atom if atom == _ANY else re.escape(atom)) + emit(child) for atom, child in node.items() if atom != end]
+        if end in node:
+            alts.append("")
+        if len(alts) == 1:
+            return alts[0]
+        return "(?:" + "|".join(alts) + ")"
+
+    return re.compile(emit(trie) if trie else r"(?!)")
+
+
+def levenshtein(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i]
+        for j, cb in enumerate(b, start=1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+class _BkTree:
+    """Burkhard-Keller tree over term keys under Levenshtein distance."""
+
+    __slots__ = ("root",)
+
+    def __init__(self) -> None:
+        # node: [key, term indexes, {distance: child}]
+        self.root: list | None = None
+
+    def add(self, key: str, idx: int) -> None:
+        if self.root is None:
+            self.root = [key, [idx], {}]
+            return
+        node = self.root
+        while True:
+            d = levenshtein(key, node[0])
+            if d == 0:
+                node[1].append(idx)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [key, [idx], {}]
+                return
+            node = child
+
+    def search(self, word: str, max_dist: int) -> Iterator[tuple[list[int], int]]:
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            key, idxs, children = stack.pop()
+            d = levenshtein(word, key)
+            if d <= max_dist:
+                yield idxs, d
+            for cd, child in children.items():
+                if d - max_dist <= cd <= d + max_dist:
+                    stack.append(child)
+
+
+class FuzzyMatcher:
+    """
+    Near-miss matcher for blocklist terms.
+
+    Text is folded once (normalize_text), split into letter/digit tokens, and
+    each run of up to a few adjacent tokens is joined into a candidate. A
+    regex Levenshtein automaton over all keys rejects almost every candidate
+    in C; the few it accepts are resolved to terms and distances with a
+    BK-tree of the keys sharing their first character. Lookups are memoized,
+    so repeated copy costs a dict hit per candidate.
+    """
+
+    def __init__(self, terms: Sequence[str], max_edits: Sequence[int]) -> None:
+        """max_edits[i] is the edit budget of terms[i]; a negative budget leaves it exact-only."""
+        self.keys = [term_key(t) for t in terms]
+        self.max_edits = list(max_edits)
+        self._trees: dict[str, _BkTree] = {}
+        # First character -> candidate lengths that can be within reach of some key.
+        self._lengths: dict[str, set[int]] = {}
+        self._max_tokens = 1
+        self._max_len = 0
+        for idx, key in enumerate(self.keys):
+            edits = self.max_edits[idx]
+            if not key or edits < 0:
+                continue
+            self._trees.setdefault(key[0], _BkTree()).add(key, idx)
+            self._lengths.setdefault(key[0], set()).update(range(len(key) - edits, len(key) + edits + 1))
+            words = len(_TOKEN.findall(normalize_text(terms[idx])[0]))
+            # One extra token so a term split by a stray space still joins up.
+            self._max_tokens = max(self._max_tokens, words + 1)
+            self._max_len = max(self._max_len, len(key) + edits)
+        self._accept = _automaton(self.keys, self.max_edits)
+        self._memo: LruCache[str, tuple[tuple[int, int], ...]] = LruCache(maxsize=1 << 16)
+
+    def _lookup(self, candidate: str) -> tuple[tuple[int, int], ...]:
+        hits = self._memo.get(candidate)
+        if hits is None:
+            found: list[tuple[int, int]] = []
+            tree = self._trees.get(candidate[0])
+            if tree is not None and self._accept.fullmatch(candidate):
+                for idxs, d in tree.search(candidate, 2):
+                    found.extend((idx, d) for idx in idxs if d <= self.max_edits[idx])
+            hits = tuple(sorted(found))
+            self._memo.put(candidate, hits)
+        return hits
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, int, int]]:
+        """
+        Yield (term index, start, end, edits) for near-matches in source offsets.
+
+        Per term, matches do not overlap; at each start the closest and then
+        shortest candidate wins.
+        """
+        norm, offsets = normalize_text(text)
+        tokens = [m.span() for m in _TOKEN.finditer(norm)]
+        lengths = self._lengths
+        resume: dict[int, int] = {}
+        for i, (t_start, t_end) in enumerate(tokens):
+            allowed = lengths.get(norm[t_start])
+            if allowed is None:
+                continue
+            best: dict[int, tuple[int, int]] = {}
+            candidate = ""
+            end = t_start
+            for j in range(i, min(i + self._max_tokens, len(tokens))):
+                s, e = tokens[j]
+                if j > i and (s - end > _MAX_GAP or "\n" in norm[end:s]):
+                    break
+                candidate += norm[s:e]
+                end = e
+                if len(candidate) > self._max_len:
+                    break
+                if len(candidate) not in allowed:
+                    continue
+                for idx, d in self._lookup(candidate):
+                    if idx not in best or d < best[idx][0]:
+                        best[idx] = (d, end)
+            for idx, (d, n_end) in best.items():
+                if t_start < resume.get(idx, 0):
+                    continue
+                resume[idx] = n_end
+                if offsets is None:
+                    yield idx, t_start, n_end, d
+                else:
+                    yield idx, offsets[t_start], offsets[n_end - 1] + 1, d
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+from .markup import strip_html
+from .scanner import Finding, ScanConfig, iter_listing_texts, listing_field_config, rule_pack_for, scan_many
+
+
+@dataclass
+class ListingScanStats:
+    fields_rescanned: int = 0
+    fields_skipped: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {"fields_rescanned": self.fields_rescanned, "fields_skipped": self.fields_skipped}
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class ListingScanState:
+    """
+    Per-field content hashes and findings from the last scan of one listing.
+
+    scan() returns the same findings as scan_listing_fields(), but only fields
+    whose text changed since the previous call are scanned again; the rest
+    reuse their cached findings. Keep one state per listing across edits or
+    LLM retries.
+    """
+
+    def __init__(self, config: ScanConfig) -> None:
+        self.config = config
+        self.stats = ListingScanStats()
+        self._fields: dict[str, tuple[bytes, list[Finding]]] = {}
+        self._version: str | None = None
+
+    def scan(self, payload: Any) -> list[Finding]:
+        version = rule_pack_for(self.config).version
+        if version != self._version:
+            # A different rule pack invalidates every cached field.
+            self._fields.clear()
+            self._version = version
+
+        fresh: dict[str, tuple[bytes, list[Finding]]] = {}
+        changed: list[tuple[str, str]] = []
+        for field, text in iter_listing_texts(payload):
+            digest = _digest(text)
+            cached = self._fields.get(field)
+            if cached is not None and cached[0] == digest:
+                fresh[field] = cached
+                self.stats.fields_skipped += 1
+                continue
+            if listing_field_config(self.config, field, text) is not self.config:
+                text = strip_html(text).text
+            fresh[field] = (digest, [])
+            changed.append((field, text))
+            self.stats.fields_rescanned += 1
+        # Changed fields are rescanned together in one batch.
+        for finding in scan_many(changed, config=self.config):
+            fresh[finding.field][1].append(finding)
+        # Fields that disappeared from the payload are forgotten.
+        self._fields = fresh
+        return [f for _, field_findings in fresh.values() for f in field_findings]
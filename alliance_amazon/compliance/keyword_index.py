@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import re
+from typing import Sequence
+
+from .blocklist import BlockedTerm
+from .proximity import ProximityRule
+
+
+# Term patterns let spaces and hyphens stretch or vanish ("non-toxic", "nontoxic",
+# "non  toxic"), so both sides are compared with them squeezed out. Case is left
+# to re.IGNORECASE, as in the matcher: str.casefold() disagrees with it on
+# characters like "İ" (two code points folded, one matched), which would let
+# "dİsinfectant" through.
+_SQUEEZE = re.compile(r"[-\s]+")
+
+
+def _squeeze(text: str) -> str:
+    return _SQUEEZE.sub("", text)
+
+
+def _trie_regex(needles: set[str]) -> str:
+    # Shared prefixes share one branch, so each position is tried against a few characters, not every needle.
+    trie: dict[str, dict] = {}
+    for needle in needles:
+        node = trie
+        for ch in needle:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict[str, dict]) -> str:
+        if "" in node:
+            return ""  # a shorter needle already matched
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items())]
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return emit(trie)
+
+
+class KeywordIndex:
+    """
+    Prefilter for keyword-sized texts: can this keyword produce a hard finding at all?
+
+    A hard blocklist or grade term can only match a keyword whose
+    space/hyphen-squeezed form contains the term squeezed the same way; those
+    are tried as one case-insensitive phrase-trie regex. A proximity rule needs
+    a word from each of its word sets, so one set per rule goes into one word
+    regex built like the proximity engine's vocabulary.
+    Keywords that pass both are safe without scanning; the rest (and every
+    keyword, if a hard proximity rule is made of token classes only) go to the
+    full scanner, which has the final say.
+    """
+
+    def __init__(
+        self, blocked: Sequence[BlockedTerm], grade_terms: Sequence[str], proximity_rules: Sequence[ProximityRule]
+    ) -> None:
+        needles = {_squeeze(t.term) for t in blocked if t.severity == "hard"}
+        # Grade terms are hard unless the product name allows them; the scanner decides.
+        needles.update(_squeeze(g) for g in grade_terms)
+        needles.discard("")
+        self._needles = re.compile(_trie_regex(needles), re.IGNORECASE) if needles else None
+        # False when some hard rule cannot be prefiltered; every keyword is then scanned.
+        self.exhaustive = True
+        words: set[str] = set()
+        for rule in proximity_rules:
+            if rule.severity != "hard":
+                continue
+            sets = [ts.words for ts in (rule.anchor, rule.target) if ts.token_class is None]
+            if not sets:
+                self.exhaustive = False
+                continue
+            # The smaller set keeps false alarms down; either one is required.
+            words.update(min(sets, key=len))
+        self.words: frozenset[str] = frozenset(words)
+        vocab = sorted(words, key=lambda w: (-len(w), w))
+        self._words = (
+            re.compile(r"\b(?:" + "|".join(re.escape(w) for w in vocab) + r")\b", re.IGNORECASE) if vocab else None
+        )
+
+    def may_block(self, keyword: str) -> bool:
+        """False when keyword cannot have a hard finding; True means "ask the scanner"."""
+        if not self.exhaustive:
+            return True
+        if self._needles is not None and self._needles.search(_squeeze(keyword)):
+            return True
+        return self._words is not None and self._words.search(keyword) is not None
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from .blocklist import DEFAULT_RULE_PACK_PATH, RulePack, RulePackError, load_rule_pack
+from .rules import CompiledRulePack, compile_rule_pack
+
+
+# Rule set per marketplace locale ("<country>" or "<country>-<language>"). None means
+# the active rule pack (the bundled default, $ALLIANCE_AMAZON_RULE_PACK or --rule-pack);
+# the others are bundled packs of local-language terms layered on top of the active pack.
+LOCALE_RULE_PACKS: dict[str, str | None] = {
+    "US": None,
+    "CA": None,
+    "CA-fr": "ca-fr.json",
+    "MX-es": "mx-es.json",
+    "DE": "de.json",
+}
+
+# Amazon marketplace ids of the locales above.
+MARKETPLACE_COUNTRIES = {
+    "ATVPDKIKX0DER": "US",
+    "A2EUQ1WTGCTBG2": "CA",
+    "A1AM78C64UM0Y8": "MX",
+    "A1PA6795UKMFR9": "DE",
+}
+
+# Locale of a marketplace whose country has no rule set of its own (listings there
+# are in its main language unless the language tag names another set).
+_COUNTRY_DEFAULTS = {"MX": "MX-es"}
+
+_CANONICAL = {k.lower(): k for k in LOCALE_RULE_PACKS}
+
+# (pack file, base pack version) -> rule set, compiled on first use and kept for the
+# life of the process.
+_COMPILED: dict[tuple[str, str], CompiledRulePack] = {}
+
+
+def canonical_locale(locale: str) -> str:
+    """'ca_FR', 'ca-fr' -> 'CA-fr'; raises RulePackError for locales without a rule set."""
+    key = locale.strip().replace("_", "-").lower()
+    if key not in _CANONICAL:
+        raise RulePackError(f"No compliance rule set for locale {locale!r} (known: {', '.join(LOCALE_RULE_PACKS)})")
+    return _CANONICAL[key]
+
+
+def locale_for(marketplace_id: str | None, language_tag: str | None = None) -> str | None:
+    """
+    Rule set locale for an Amazon marketplace id and listing language tag
+    ("A2EUQ1WTGCTBG2", "fr_CA" -> "CA-fr"); None for marketplaces without one.
+    Always a LOCALE_RULE_PACKS key: a language without a set of its own falls back
+    to the marketplace's default ("A1AM78C64UM0Y8", "en_US" -> "MX-es").
+    """
+    country = MARKETPLACE_COUNTRIES.get((marketplace_id or "").strip())
+    if country is None:
+        return None
+    language = (language_tag or "").replace("-", "_").split("_")[0].lower()
+    if language and f"{country}-{language}".lower() in _CANONICAL:
+        return _CANONICAL[f"{country}-{language}".lower()]
+    return _COUNTRY_DEFAULTS.get(country, country)
+
+
+def locale_rule_pack(locale: str, base: RulePack | None = None) -> CompiledRulePack | None:
+    """
+    The compiled rule set of a locale, or None when it uses the active rule pack.
+
+    The locale's additions go on top of base (the active pack; default: the
+    bundled default pack), so custom terms apply in every locale.
+    """
+    locale = canonical_locale(locale)
+    name = LOCALE_RULE_PACKS[locale]
+    if name is None:
+        return None
+    if base is not None and base.path is None:
+        raise RulePackError(f"Rule pack {base.version!r} was not loaded from a file; locale {locale} can't extend it")
+    key = (name, base.cache_version if base is not None else "")
+    rules = _COMPILED.get(key)
+    if rules is None:
+        path = DEFAULT_RULE_PACK_PATH.with_name(name)
+        rules = _COMPILED[key] = compile_rule_pack(load_rule_pack(path, base=base.path if base else None))
+    return rules
+
+
+def compiled_locales() -> list[str]:
+    """Locales whose own rule set has been compiled in this process."""
+    names = {name for name, _ in _COMPILED}
+    return [locale for locale, name in LOCALE_RULE_PACKS.items() if name in names]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import html
+import re
+from bisect import bisect_right
+
+
+# One alternation for everything that isn't plain text. Unterminated comments and
+# script/style blocks run to the end of input, and tags stop at the next "<", so a
+# malformed document is still walked in linear time.
+_MARKUP = re.compile(
+    r"<!--.*?(?:-->|\Z)"
+    r"|<(script|style)\b[^<>]*>.*?(?:</\1\s*>|\Z)"
+    r"|</?([A-Za-z][A-Za-z0-9]*)[^<>]*>"
+    r"|<![^<>]*>"
+    r"|&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);?",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Tags that end a line of text; everything else (b, span, a, ...) joins its neighbours,
+# so "dis<b>infect</b>ant" reads as one word.
+_BLOCK_TAGS = frozenset(
+    "address article aside blockquote br dd div dl dt figcaption figure footer form h1 h2 h3 h4 h5 h6 "
+    "header hr li main nav ol p pre section table tbody td tfoot th thead tr ul".split()
+)
+
+_LOOKS_LIKE_HTML = re.compile(r"</?[A-Za-z][A-Za-z0-9]*(?:\s[^<>]*)?/?>|&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z]+);")
+
+
+def looks_like_html(text: str) -> bool:
+    return _LOOKS_LIKE_HTML.search(text) is not None
+
+
+class HtmlText:
+    """
+    The visible text of an HTML fragment plus a map from its offsets back to the markup.
+
+    The map is a list of segments: runs copied verbatim from the source map
+    character for character; decoded entities and tag separators map every
+    character they produced to the whole source token.
+    """
+
+    __slots__ = ("source", "text", "_text_starts", "_src_starts", "_src_ends", "_verbatim")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        out: list[str] = []
+        self._text_starts: list[int] = []
+        self._src_starts: list[int] = []
+        self._src_ends: list[int] = []
+        self._verbatim: list[bool] = []
+        size = 0
+
+        def emit(piece: str, src_start: int, src_end: int, verbatim: bool) -> None:
+            nonlocal size
+            if not piece:
+                return
+            out.append(piece)
+            self._text_starts.append(size)
+            self._src_starts.append(src_start)
+            self._src_ends.append(src_end)
+            self._verbatim.append(verbatim)
+            size += len(piece)
+
+        pos = 0
+        for m in _MARKUP.finditer(source):
+            start, end = m.span()
+            emit(source[pos:start], pos, start, True)
+            token = m.group(0)
+            if token[0] == "&":
+                decoded = html.unescape(token)
+                emit(decoded, start, end, decoded == token)
+            elif m.group(2) and m.group(2).lower() in _BLOCK_TAGS:
+                emit("\n", start, end, False)
+            pos = end
+        emit(source[pos:], pos, len(source), True)
+        self.text = "".join(out)
+
+    def _segment(self, offset: int) -> int:
+        return bisect_right(self._text_starts, offset) - 1
+
+    def source_offset(self, offset: int) -> int:
+        """Markup offset where the text character at offset starts."""
+        if offset >= len(self.text):
+            return len(self.source)
+        i = self._segment(offset)
+        if self._verbatim[i]:
+            return self._src_starts[i] + offset - self._text_starts[i]
+        return self._src_starts[i]
+
+    def source_span(self, start: int, end: int) -> tuple[int, int]:
+        """Markup span covering the text span [start, end)."""
+        src_start = self.source_offset(start)
+        if end <= start:
+            return src_start, src_start
+        i = self._segment(end - 1)
+        if self._verbatim[i]:
+            return src_start, self._src_starts[i] + end - self._text_starts[i]
+        return src_start, self._src_ends[i]
+
+
+def strip_html(markup: str) -> HtmlText:
+    """Drop tags, comments and script/style blocks and decode entities in one pass over markup."""
+    return HtmlText(markup)
+
+
+def markup_tags(fragment: str) -> str:
+    """The tags inside a markup fragment, so a redaction can keep the document well-formed."""
+    return "".join(m.group(0) for m in _MARKUP.finditer(fragment) if m.group(0)[0] == "<")
+
+
+def mask_markup(fragment: str, mask_char: str) -> str:
+    """Mask the visible characters of a markup fragment, leaving its tags in place."""
+    out: list[str] = []
+    pos = 0
+    for m in _MARKUP.finditer(fragment):
+        out.append("".join(c if c.isspace() else mask_char for c in fragment[pos : m.start()]))
+        out.append(m.group(0) if m.group(0)[0] == "<" else mask_char)
+        pos = m.end()
+    out.append("".join(c if c.isspace() else mask_char for c in fragment[pos:]))
+    return "".join(out)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Iterator, Sequence
+
+from .rulestats import PassProfile
+
+
+def term_pattern(term: str) -> str:
+    t = term.strip()
+    if not t:
+        return r"$^"
+
+    escaped = re.escape(t)
+    # Treat spaces as space-or-hyphen runs to catch variants like "technical-grade".
+    escaped = escaped.replace(r"\ ", r"[-\s]+")
+    escaped = escaped.replace(r"\-", r"[-\s]*")
+
+    if t[:1].isalnum():
+        escaped = r"\b" + escaped
+    if t[-1:].isalnum():
+        escaped = escaped + r"\b"
+    return escaped
+
+
+def _term_atoms(term: str) -> list[str]:
+    # Same expansion as term_pattern(), one regex atom per character so that
+    # terms sharing a prefix can share a trie path.
+    t = term.strip()
+    atoms: list[str] = []
+    if t[:1].isalnum():
+        atoms.append(r"\b")
+    for ch in t:
+        if ch == " ":
+            atoms.append(r"[-\s]+")
+        elif ch == "-":
+            atoms.append(r"[-\s]*")
+        else:
+            atoms.append(re.escape(ch))
+    if t[-1:].isalnum():
+        atoms.append(r"\b")
+    return atoms
+
+
+_END = ""
+
+
+def _trie_source(terms: Sequence[str]) -> str:
+    trie: dict[str, dict] = {}
+    for term in terms:
+        if not term.strip():
+            continue
+        node = trie
+        for atom in _term_atoms(term):
+            node = node.setdefault(atom, {})
+        node[_END] = {}
+
+    def emit(node: dict[str, dict]) -> str:
+        alts = [atom + emit(child) for atom, child in node.items() if atom != _END]
+        if _END in node:
+            alts.append("")
+        if len(alts) == 1:
+            return alts[0]
+        return "(?:" + "|".join(alts) + ")"
+
+    if not trie:
+        return r"$^"
+    return emit(trie)
+
+
+class TermMatcher:
+    """
+    Finds blocklist-style terms in a single pass over the text.
+
+    A prefix-trie alternation of every term is wrapped in a lookahead, so one
+    finditer() walk yields each position where at least one term starts. Only
+    there are the individual term patterns tried, which keeps results identical
+    to running every term's own regex with search().
+    """
+
+    def __init__(self, terms: Sequence[str]) -> None:
+        sources = [term_pattern(t) for t in terms]
+
+        # Candidate positions are dispatched on their first (ASCII) character;
+        # anything else falls back to trying every term.
+        always: list[int] = []
+        buckets: dict[str, list[int]] = {}
+        for idx, term in enumerate(terms):
+            first = term.strip()[:1]
+            if first and first.isascii() and first not in " -":
+                buckets.setdefault(first.lower(), []).append(idx)
+            else:
+                always.append(idx)
+
+        self._init_state(
+            {
+                "terms": list(terms),
+                "sources": sources,
+                "candidates": "(?=" + _trie_source(terms) + ")",
+                "buckets": {k: sorted(v + always) for k, v in buckets.items()},
+                "always": always,
+            }
+        )
+
+    def _init_state(self, state: dict[str, Any]) -> None:
+        self.terms = tuple(state["terms"])
+        self._sources = tuple(state["sources"])
+        self._compiled: list[re.Pattern[str] | None] = [None] * len(self._sources)
+        self._candidates = re.compile(state["candidates"], re.IGNORECASE)
+        self._all = tuple(range(len(self.terms)))
+        self._always = tuple(state["always"])
+        self._buckets = {k: tuple(v) for k, v in state["buckets"].items()}
+
+    def to_state(self) -> dict[str, Any]:
+        """JSON-serializable compiled form; from_state() rebuilds without re-deriving it."""
+        return {
+            "terms": list(self.terms),
+            "sources": list(self._sources),
+            "candidates": self._candidates.pattern,
+            "buckets": {k: list(v) for k, v in self._buckets.items()},
+            "always": list(self._always),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> "TermMatcher":
+        matcher = cls.__new__(cls)
+        matcher._init_state(state)
+        return matcher
+
+    def pattern(self, idx: int) -> re.Pattern[str]:
+        # Per-term patterns are compiled on first use; most never are for clean text.
+        rx = self._compiled[idx]
+        if rx is None:
+            rx = re.compile(self._sources[idx], re.IGNORECASE)
+            self._compiled[idx] = rx
+        return rx
+
+    def _indexes_at(self, text: str, pos: int) -> tuple[int, ...]:
+        if pos >= len(text):
+            return self._all
+        ch = text[pos]
+        if not ch.isascii():
+            return self._all
+        return self._buckets.get(ch.lower(), self._always)
+
+    def first_matches(self, text: str, profile: PassProfile | None = None) -> dict[int, re.Match[str]]:
+        """Return {term index: leftmost match} for every term found in text."""
+        found: dict[int, re.Match[str]] = {}
+        total = len(self.terms)
+        for cand in self._candidates.finditer(text):
+            pos = cand.start()
+            for idx in self._indexes_at(text, pos):
+                if idx in found:
+                    continue
+                if profile is None:
+                    m = self.pattern(idx).match(text, pos)
+                else:
+                    m = profile.timed(idx, self.pattern(idx).match, text, pos)
+                if m:
+                    found[idx] = m
+            if len(found) == total:
+                break
+        return found
+
+    def iter_matches(self, text: str, profile: PassProfile | None = None) -> Iterator[tuple[int, re.Match[str]]]:
+        """
+        Yield (term index, match) for every occurrence, in start-offset order.
+
+        Per term, occurrences are non-overlapping exactly like finditer().
+        """
+        resume: dict[int, int] = {}
+        for cand in self._candidates.finditer(text):
+            pos = cand.start()
+            for idx in self._indexes_at(text, pos):
+                if resume.get(idx, 0) > pos:
+                    continue
+                if profile is None:
+                    m = self.pattern(idx).match(text, pos)
+                else:
+                    m = profile.timed(idx, self.pattern(idx).match, text, pos)
+                if m:
+                    resume[idx] = m.end() if m.end() > pos else pos + 1
+                    yield idx, m
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import re
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping, Sequence
+
+from .rulestats import PassProfile
+
+
+# Proximity rules describe claims as "anchor, then target nearby":
+#
+#   {cures, treats, heals} followed by {disease, pain} within 3 words
+#   <percent> followed by {germs, bacteria} on the same line
+#
+# A set is either {word, ...} (whole words, case-insensitive) or <class>, a
+# regex token class named in the rule pack. "within N words" allows up to N
+# words between anchor and target; "on the same line" allows anything up to the
+# next newline. Like a greedy regex, the farthest qualifying target ends the span.
+
+_WORD = re.compile(r"\w+")
+_SET = r"\{[^{}]*\}|<\w+>"
+_RULE = re.compile(
+    rf"^\s*(?P<anchor>{_SET})\s+followed\s+by\s+(?P<target>{_SET})\s+"
+    r"(?:within\s+(?P<gap>\d+)\s+words?|(?P<line>on\s+the\s+same\s+line))\s*$",
+    re.IGNORECASE,
+)
+
+
+class ProximityRuleError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class TokenSet:
+    words: frozenset[str] = frozenset()
+    token_class: str | None = None
+
+
+@dataclass(frozen=True)
+class ProximityRule:
+    rule_id: str
+    severity: str
+    message: str
+    anchor: TokenSet
+    target: TokenSet
+    max_gap_words: int | None  # None: anywhere later on the same line
+    source: str
+
+
+def _parse_set(raw: str) -> TokenSet:
+    if raw.startswith("<"):
+        return TokenSet(token_class=raw[1:-1].lower())
+    words = [w.strip() for w in raw[1:-1].split(",") if w.strip()]
+    if not words:
+        raise ProximityRuleError(f"Empty word set: {raw}")
+    for w in words:
+        if not _WORD.fullmatch(w):
+            raise ProximityRuleError(f"Set members must be single words: {w!r}")
+    return TokenSet(words=frozenset(w.lower() for w in words))
+
+
+def parse_proximity_rule(expr: str, *, rule_id: str, severity: str, message: str) -> ProximityRule:
+    m = _RULE.match(expr)
+    if not m:
+        raise ProximityRuleError(
+            f"Cannot parse proximity rule {rule_id!r}: expected "
+            "'<set> followed by <set> within N words' or '... on the same line'"
+        )
+    return ProximityRule(
+        rule_id=rule_id,
+        severity=severity,
+        message=message,
+        anchor=_parse_set(m.group("anchor")),
+        target=_parse_set(m.group("target")),
+        max_gap_words=None if m.group("line") else int(m.group("gap")),
+        source=expr.strip(),
+    )
+
+
+class _TokenStream:
+    """Anchor/target occurrences of one text, shared by every rule."""
+
+    __slots__ = ("text", "bounds", "by_set", "by_class")
+
+    def __init__(self, text: str, bounds: Sequence[int] = ()) -> None:
+        self.text = text
+        # Sorted end offsets of the fields text joins; no span reaches past its anchor's.
+        self.bounds = bounds
+        self.by_set: dict[int, list[tuple[int, int]]] = {}
+        self.by_class: dict[str, list[tuple[int, int]]] = {}
+
+
+class ProximityEngine:
+    def __init__(self, rules: Sequence[ProximityRule], token_classes: Mapping[str, str]) -> None:
+        self.rules = tuple(rules)
+
+        # Each distinct word set gets a bit; a vocabulary word maps to the sets holding it.
+        self._sets: list[frozenset[str]] = []
+        for rule in self.rules:
+            for ts in (rule.anchor, rule.target):
+                if ts.token_class is None and ts.words not in self._sets:
+                    self._sets.append(ts.words)
+        self._set_bits = {words: bit for bit, words in enumerate(self._sets)}
+        self._masks: dict[str, int] = {}
+        for bit, words in enumerate(self._sets):
+            for w in words:
+                self._masks[w] = self._masks.get(w, 0) | (1 << bit)
+        self._set_rx = [
+            re.compile("|".join(re.escape(w) for w in sorted(words)), re.IGNORECASE) for words in self._sets
+        ]
+        vocab = sorted(self._masks, key=lambda w: (-len(w), w))
+        self._vocab = (
+            re.compile(r"\b(?:" + "|".join(re.escape(w) for w in vocab) + r")\b", re.IGNORECASE) if vocab else None
+        )
+
+        self._classes: dict[str, re.Pattern[str]] = {}
+        for rule in self.rules:
+            for ts in (rule.anchor, rule.target):
+                name = ts.token_class
+                if name is None or name in self._classes:
+                    continue
+                if name not in token_classes:
+                    raise ProximityRuleError(f"Unknown token class <{name}> in rule {rule.rule_id!r}")
+                self._classes[name] = re.compile(token_classes[name], re.IGNORECASE)
+
+    def _mask(self, word: str) -> int:
+        if word.isascii():
+            return self._masks.get(word.lower(), 0)
+        # Non-ASCII case folding: defer to the regex engine, as the vocabulary pass did.
+        return sum(1 << bit for bit, rx in enumerate(self._set_rx) if rx.fullmatch(word))
+
+    def tokenize(self, text: str, bounds: Sequence[int] = ()) -> _TokenStream:
+        stream = _TokenStream(text, bounds)
+        if self._vocab is not None:
+            by_set = stream.by_set
+            for m in self._vocab.finditer(text):
+                mask = self._mask(m.group(0))
+                bit = 0
+                while mask:
+                    if mask & 1:
+                        by_set.setdefault(bit, []).append(m.span())
+                    mask >>= 1
+                    bit += 1
+        for name, rx in self._classes.items():
+            stream.by_class[name] = [m.span() for m in rx.finditer(text)]
+        return stream
+
+    def _occurrences(self, stream: _TokenStream, ts: TokenSet) -> list[tuple[int, int]]:
+        if ts.token_class is not None:
+            return stream.by_class.get(ts.token_class, [])
+        return stream.by_set.get(self._set_bits[ts.words], [])
+
+    def _window_end(self, stream: _TokenStream, rule: ProximityRule, anchor_end: int) -> int:
+        text = stream.text
+        limit = len(text)
+        if stream.bounds:
+            i = bisect_left(stream.bounds, anchor_end)
+            if i < len(stream.bounds):
+                limit = stream.bounds[i]
+        if rule.max_gap_words is None:
+            line_end = text.find("\n", anchor_end, limit)
+            return limit if line_end < 0 else line_end
+        end = anchor_end
+        for n, word in enumerate(_WORD.finditer(text, anchor_end, limit)):
+            if n > rule.max_gap_words:
+                break
+            end = word.end()
+        return end
+
+    def iter_rule_spans(self, stream: _TokenStream, rule: ProximityRule) -> Iterator[tuple[int, int]]:
+        """Non-overlapping (start, end) spans of one rule, like re.finditer()."""
+        targets = self._occurrences(stream, rule.target)
+        if not targets:
+            return
+        starts = [s for s, _ in targets]
+        resume = 0
+        for a_start, a_end in self._occurrences(stream, rule.anchor):
+            if a_start < resume:
+                continue
+            last = bisect_left(starts, self._window_end(stream, rule, a_end)) - 1
+            if last >= 0 and starts[last] >= a_end:
+                resume = targets[last][1]
+                yield a_start, resume
+
+    def iter_spans(
+        self, text: str, profile: PassProfile | None = None, *, bounds: Sequence[int] = ()
+    ) -> Iterator[tuple[int, int, int]]:
+        """
+        Yield (rule index, start, end) for every rule, rule by rule.
+
+        bounds are the end offsets of the fields a joined text is made of;
+        windows stop at them, so spans never cross from one field into the next.
+        """
+        stream = self.tokenize(text, bounds)
+        for idx, rule in enumerate(self.rules):
+            if profile is None:
+                spans: Iterable[tuple[int, int]] = self.iter_rule_spans(stream, rule)
+            else:
+                started = time.perf_counter()
+                spans = list(self.iter_rule_spans(stream, rule))
+                profile.record(idx, time.perf_counter() - started, len(spans))
+            for start, end in spans:
+                yield idx, start, end
+
+    def first_spans(self, text: str, profile: PassProfile | None = None) -> dict[int, tuple[int, int]]:
+        stream = self.tokenize(text)
+        found: dict[int, tuple[int, int]] = {}
+        for idx, rule in enumerate(self.rules):
+            if profile is None:
+                span = next(self.iter_rule_spans(stream, rule), None)
+            else:
+                span = profile.timed(idx, next, self.iter_rule_spans(stream, rule), None)
+            if span is not None:
+                found[idx] = span
+        return found
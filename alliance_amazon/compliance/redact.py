@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .markup import markup_tags, mask_markup
+from .scanner import ScanConfig, scan_spans
+
+
+# drop: cut the span (and the whitespace it leaves behind)
+# mask: replace each non-space character with mask_char, keeping offsets stable
+# placeholder: replace the whole span with a fixed marker
+REDACTION_STRATEGIES = ("drop", "mask", "placeholder")
+
+DEFAULT_PLACEHOLDER = "[removed]"
+
+
+@dataclass(frozen=True)
+class Redaction:
+    field: str
+    start: int  # offsets into the source text
+    end: int
+    original: str
+    replacement: str
+    rule_ids: tuple[str, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "field": self.field,
+            "start": self.start,
+            "end": self.end,
+            "original": self.original,
+            "replacement": self.replacement,
+            "rule_ids": list(self.rule_ids),
+        }
+
+
+@dataclass(frozen=True)
+class RedactionResult:
+    text: str
+    redactions: tuple[Redaction, ...]
+
+    @property
+    def removed(self) -> list[str]:
+        return [r.original for r in self.redactions]
+
+    def log(self) -> list[dict[str, Any]]:
+        return [r.to_dict() for r in self.redactions]
+
+
+def redact_text(
+    text: str,
+    *,
+    config: ScanConfig = ScanConfig(),
+    strategy: str = "drop",
+    field: str = "text",
+    severities: Iterable[str] = ("hard", "soft"),
+    placeholder: str = DEFAULT_PLACEHOLDER,
+    mask_char: str = "*",
+) -> RedactionResult:
+    """
+    Redact every scanner finding from text in a single left-to-right pass.
+
+    Overlapping or touching findings are merged into one redaction, so each
+    source character is copied or replaced exactly once whatever its case.
+    With config.html, offsets are markup offsets and tags inside a redacted
+    span are kept, so the document stays well-formed.
+    """
+    if strategy not in REDACTION_STRATEGIES:
+        raise ValueError(f"Unknown redaction strategy {strategy!r} (expected one of {list(REDACTION_STRATEGIES)})")
+    wanted = set(severities)
+
+    # Findings come sorted by (start, end); merge them into disjoint groups.
+    groups: list[tuple[int, int, list[str]]] = []
+    for f in scan_spans(text, config=config, field=field):
+        if f.severity not in wanted or f.start is None or f.end is None or f.end <= f.start:
+            continue
+        if groups and f.start <= groups[-1][1]:
+            start, end, rule_ids = groups[-1]
+            if f.rule_id not in rule_ids:
+                rule_ids.append(f.rule_id)
+            groups[-1] = (start, max(end, f.end), rule_ids)
+        else:
+            groups.append((f.start, f.end, [f.rule_id]))
+
+    out: list[str] = []
+    redactions: list[Redaction] = []
+    cursor = 0
+    n = len(text)
+    for start, end, rule_ids in groups:
+        if start > cursor:
+            out.append(text[cursor:start])
+        original = text[start:end]
+        kept = markup_tags(original) if config.html else ""
+        if strategy == "drop":
+            replacement = kept
+            # Don't leave a double space (or a leading one) where the span was.
+            if not out or out[-1][-1:].isspace():
+                while end < n and text[end].isspace():
+                    end += 1
+        elif strategy == "mask":
+            if config.html:
+                replacement = mask_markup(original, mask_char)
+            else:
+                replacement = "".join(c if c.isspace() else mask_char for c in original)
+        else:
+            replacement = placeholder + kept
+        if replacement:
+            out.append(replacement)
+        redactions.append(Redaction(field, start, start + len(original), original, replacement, tuple(rule_ids)))
+        cursor = end
+    out.append(text[cursor:])
+    redacted = "".join(out)
+    if strategy == "drop" and groups and groups[-1][1] >= len(text.rstrip()):
+        redacted = redacted.rstrip()
+    return RedactionResult(text=redacted, redactions=tuple(redactions))
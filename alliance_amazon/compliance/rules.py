@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from .blocklist import BlockedTerm, RulePack
+from .fuzzy import FuzzyMatcher, term_key
+from .keyword_index import KeywordIndex
+from .matcher import TermMatcher
+from .proximity import ProximityEngine
+
+
+# Bump when TermMatcher state or term expansion changes so stale caches are ignored.
+COMPILED_FORMAT = 1
+
+CACHE_DIR_ENV = "ALLIANCE_AMAZON_CACHE_DIR"
+
+
+class CompiledRulePack:
+    """A rule pack with its matcher built: blocklist terms, then grade terms, then allow phrases."""
+
+    def __init__(self, pack: RulePack, matcher: TermMatcher) -> None:
+        self.pack = pack
+        self.version = pack.cache_version
+        self.blocked: tuple[BlockedTerm, ...] = pack.terms
+        self.grade_terms = pack.grade_terms
+        self.grade_offset = len(pack.terms)
+        self.allow_phrases = pack.allow_phrases
+        self.allow_offset = self.grade_offset + len(pack.grade_terms)
+        self.matcher = matcher
+        # (severity, rule_id, message) rows shared by every finding of the same term.
+        self.blocklist_rules = [
+            (t.severity, f"BLOCKLIST-{t.rule_id}", f"Blocked term in category '{t.category}'")
+            for t in pack.terms
+        ]
+        # Claim patterns share one token pass per text.
+        self.proximity = ProximityEngine(pack.proximity_rules, dict(pack.token_classes))
+        self.proximity_rules = [(r.severity, r.rule_id, r.message) for r in pack.proximity_rules]
+        # Names per matcher term and per proximity rule in rule-stats reports.
+        self.term_labels = (
+            [f"BLOCKLIST-{t.rule_id}:{t.term}" for t in pack.terms]
+            + [f"GRADE:{g}" for g in pack.grade_terms]
+            + [f"ALLOW:{p}" for p in pack.allow_phrases]
+        )
+        self.proximity_labels = [r.rule_id for r in pack.proximity_rules]
+        self.fuzzy_rules = [
+            (t.severity, f"BLOCKLIST-{t.rule_id}", f"Near-match of blocked term '{t.term}' in category '{t.category}'")
+            for t in pack.terms
+        ]
+        self._fuzzy: FuzzyMatcher | None = None
+        self._keyword_index: KeywordIndex | None = None
+
+    @property
+    def fuzzy(self) -> FuzzyMatcher:
+        """Near-miss matcher over the blocklist terms, built on first fuzzy scan."""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyMatcher([t.term for t in self.blocked], [fuzzy_edit_budget(t) for t in self.blocked])
+        return self._fuzzy
+
+    @property
+    def keyword_index(self) -> KeywordIndex:
+        """Hard-finding prefilter for short keywords, built on first use."""
+        if self._keyword_index is None:
+            self._keyword_index = KeywordIndex(self.blocked, self.grade_terms, self.pack.proximity_rules)
+        return self._keyword_index
+
+
+def fuzzy_edit_budget(term: BlockedTerm) -> int:
+    """
+    Edits a fuzzy match of term may differ by (-1: exact matching only).
+
+    Soft terms and short keys only match through Unicode folding, since one edit
+    turns words like "leading" into "loading"; multi-word terms allow a single
+    edit so "chemical-free" doesn't match "chemical feed".
+    """
+    key = term_key(term.term)
+    if len(key) < 4:
+        return -1
+    if term.severity != "hard" or len(key) < 6:
+        return 0
+    if len(key) < 12 or len(term.term.replace("-", " ").split()) > 1:
+        return 1
+    return 2
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get(CACHE_DIR_ENV, "").strip()
+    if override:
+        return Path(override) / "rulepacks"
+    base = os.environ.get("XDG_CACHE_HOME", "").strip()
+    return (Path(base) if base else Path.home() / ".cache") / "alliance_amazon" / "rulepacks"
+
+
+def _cache_path(pack: RulePack, cache_dir: Path) -> Path:
+    return cache_dir / f"{pack.content_hash}.v{COMPILED_FORMAT}.json"
+
+
+def _read_cached_state(path: Path, pack: RulePack) -> dict | None:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("content_hash") != pack.content_hash:
+        return None
+    if state.get("format") != COMPILED_FORMAT or not isinstance(state.get("matcher"), dict):
+        return None
+    return state
+
+
+def _write_cached_state(path: Path, state: dict) -> None:
+    # Unique temp file + os.replace so concurrent workers never see a partial file.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    except OSError:
+        # Read-only or missing cache dir: compiling again next time is fine.
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        # Full disk or unserializable state: the cache is optional.
+        pass
+    finally:
+        Path(tmp).unlink(missing_ok=True)  # gone already once replaced
+
+
+def compile_rule_pack(pack: RulePack, *, cache_dir: Path | None = None, use_cache: bool = True) -> CompiledRulePack:
+    """
+    Build the matcher for a rule pack, reusing the on-disk compiled form when present.
+
+    The cache is keyed by the pack's content hash, so editing the rule file
+    invalidates it automatically.
+    """
+    terms = [t.term for t in pack.terms] + list(pack.grade_terms) + list(pack.allow_phrases)
+    if not use_cache:
+        return CompiledRulePack(pack, TermMatcher(terms))
+
+    path = _cache_path(pack, cache_dir or default_cache_dir())
+    state = _read_cached_state(path, pack)
+    if state is not None and state["matcher"].get("terms") == terms:
+        try:
+            return CompiledRulePack(pack, TermMatcher.from_state(state["matcher"]))
+        except (KeyError, TypeError, ValueError, re.error):
+            pass
+
+    matcher = TermMatcher(terms)
+    _write_cached_state(
+        path,
+        {"format": COMPILED_FORMAT, "content_hash": pack.content_hash, "matcher": matcher.to_state()},
+    )
+    return CompiledRulePack(pack, matcher)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+
+_PREVIEW_CHARS = 80
+
+# Fuzzy near-matching is one pass over the text for all terms, so it is reported as a single entry.
+FUZZY_LABEL = "FUZZY"
+
+
+def _preview(text: str) -> str:
+    flat = " ".join(text[: _PREVIEW_CHARS * 2].split())
+    return flat if len(flat) <= _PREVIEW_CHARS else flat[: _PREVIEW_CHARS - 3] + "..."
+
+
+class PassProfile:
+    """Per-rule evaluation counters for one pass over one text, indexed like the pass's rules."""
+
+    __slots__ = ("evaluations", "matches", "seconds")
+
+    def __init__(self, size: int) -> None:
+        self.evaluations = [0] * size
+        self.matches = [0] * size
+        self.seconds = [0.0] * size
+
+    def record(self, idx: int, seconds: float, matches: int) -> None:
+        self.evaluations[idx] += 1
+        self.matches[idx] += matches
+        self.seconds[idx] += seconds
+
+    def timed(self, idx: int, fn: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        result = fn(*args)
+        self.record(idx, time.perf_counter() - started, 1 if result else 0)
+        return result
+
+
+class ScanProfile:
+    """The passes of one scan: matcher terms, proximity rules and the fuzzy pass."""
+
+    __slots__ = ("terms", "proximity", "fuzzy")
+
+    def __init__(self, n_terms: int, n_proximity: int) -> None:
+        self.terms = PassProfile(n_terms)
+        self.proximity = PassProfile(n_proximity)
+        self.fuzzy = PassProfile(1)
+
+
+@dataclass
+class RuleCounter:
+    evaluations: int = 0
+    matches: int = 0
+    seconds: float = 0.0
+    # Time this rule spent on its single slowest text, and that text.
+    max_seconds: float = 0.0
+    slowest: str = ""
+
+    def add(self, evaluations: int, matches: int, seconds: float, slowest: str) -> None:
+        self.evaluations += evaluations
+        self.matches += matches
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+            self.slowest = slowest
+
+
+class RuleStats:
+    """
+    Per-rule counters across every text scanned while instrumentation is on.
+
+    Matcher terms are evaluated only at candidate positions of the shared trie
+    pass, so "evaluations" counts match attempts; the shared passes themselves
+    (candidate walk, proximity tokenizing) show up as unattributed time.
+    """
+
+    def __init__(self, top: int = 10) -> None:
+        self.top = top
+        self.texts = 0
+        self.chars = 0
+        self.seconds = 0.0
+        self.rules: dict[str, RuleCounter] = {}
+        # Min-heap of (seconds, seq, field, chars, preview) for the slowest whole texts.
+        self._slowest: list[tuple[float, int, str, int, str]] = []
+        self._seq = 0
+
+    def add_scan(
+        self,
+        field: str,
+        text: str,
+        seconds: float,
+        profile: ScanProfile,
+        term_labels: Sequence[str],
+        proximity_labels: Sequence[str],
+    ) -> None:
+        self.texts += 1
+        self.chars += len(text)
+        self.seconds += seconds
+        slowest = f"{field}: {_preview(text)}"
+        for labels, counts in (
+            (term_labels, profile.terms),
+            (proximity_labels, profile.proximity),
+            ((FUZZY_LABEL,), profile.fuzzy),
+        ):
+            for idx, label in enumerate(labels):
+                counter = self.rules.get(label)
+                if counter is None:
+                    if label == FUZZY_LABEL and not counts.evaluations[idx]:
+                        continue  # not a fuzzy scan
+                    counter = self.rules[label] = RuleCounter()
+                if counts.evaluations[idx]:
+                    counter.add(counts.evaluations[idx], counts.matches[idx], counts.seconds[idx], slowest)
+        self._push_slowest(seconds, field, len(text), _preview(text))
+
+    def _push_slowest(self, seconds: float, field: str, chars: int, preview: str) -> None:
+        self._seq += 1
+        entry = (seconds, self._seq, field, chars, preview)
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def to_state(self) -> dict[str, Any]:
+        """JSON-serializable counters, so worker processes can hand theirs to merge()."""
+        return {
+            "texts": self.texts,
+            "chars": self.chars,
+            "seconds": self.seconds,
+            "rules": {
+                label: [c.evaluations, c.matches, c.seconds, c.max_seconds, c.slowest] for label, c in self.rules.items()
+            },
+            "slowest": [[s, f, n, p] for s, _, f, n, p in self._slowest],
+        }
+
+    def merge(self, state: dict[str, Any]) -> None:
+        self.texts += state["texts"]
+        self.chars += state["chars"]
+        self.seconds += state["seconds"]
+        for label, (evaluations, matches, seconds, max_seconds, slowest) in state["rules"].items():
+            counter = self.rules.setdefault(label, RuleCounter())
+            counter.evaluations += evaluations
+            counter.matches += matches
+            counter.seconds += seconds
+            if max_seconds > counter.max_seconds:
+                counter.max_seconds = max_seconds
+                counter.slowest = slowest
+        for seconds, field, chars, preview in state["slowest"]:
+            self._push_slowest(seconds, field, chars, preview)
+
+    def report(self) -> dict[str, Any]:
+        """Rules by cumulative time (slowest first), rules that never matched, and the slowest inputs."""
+        attributed = sum(c.seconds for c in self.rules.values())
+        total = self.seconds or 1e-12
+        rules = [
+            {
+                "rule": label,
+                "evaluations": c.evaluations,
+                "matches": c.matches,
+                "seconds": round(c.seconds, 6),
+                "share": round(c.seconds / total, 4),
+                "avg_us_per_evaluation": round(c.seconds / c.evaluations * 1e6, 2) if c.evaluations else 0.0,
+                "max_seconds_per_text": round(c.max_seconds, 6),
+                "slowest_input": c.slowest,
+            }
+            for label, c in sorted(self.rules.items(), key=lambda r: (-r[1].seconds, r[0]))
+        ]
+        return {
+            "texts": self.texts,
+            "chars": self.chars,
+            "seconds": round(self.seconds, 6),
+            "unattributed_seconds": round(max(0.0, self.seconds - attributed), 6),
+            "rules": rules,
+            "dead_rules": sorted(label for label, c in self.rules.items() if not c.matches),
+            "slowest_inputs": [
+                {"field": f, "chars": n, "seconds": round(s, 6), "preview": p}
+                for s, _, f, n, p in sorted(self._slowest, reverse=True)
+            ],
+        }
@@ -1,49 +1,32 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import Any, Iterable
-
-from .blocklist import BlockedTerm, iter_blocked_terms
-
-
-_GRADE_TERMS = [
-    "laboratory grade",
-    "lab grade",
-    "technical grade",
-    "food grade",
-    "acs grade",
-    "reagent grade",
-    "pharmaceutical grade",
-    "industrial grade",
-    "usp grade",
-    "fcc grade",
-    "nf grade",
-]
-
-
-def _term_to_regex(term: str) -> re.Pattern[str]:
-    t = term.strip()
-    if not t:
-        return re.compile(r"$^")
-
-    escaped = re.escape(t)
-    # Treat spaces as space-or-hyphen runs to catch variants like "technical-grade".
-    escaped = escaped.replace(r"\ ", r"[-\s]+")
-    escaped = escaped.replace(r"\-", r"[-\s]*")
-
-    starts_alnum = t[:1].isalnum()
-    ends_alnum = t[-1:].isalnum()
-    if starts_alnum:
-        escaped = r"\b" + escaped
-    if ends_alnum:
-        escaped = escaped + r"\b"
-    return re.compile(escaped, re.IGNORECASE)
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from .blocklist import load_rule_pack
+from .cache import LruCache
+from .locales import locale_rule_pack
+from .markup import looks_like_html, strip_html
+from .rules import CompiledRulePack, compile_rule_pack
+from .rulestats import RuleStats, ScanProfile
 
 
 @dataclass(frozen=True)
 class ScanConfig:
     allow_grade_terms_from_product_name: str | None = None
+    # Also report near-misses of blocklist terms (typos, split words, invisible
+    # characters, homoglyphs); see compliance/fuzzy.py.
+    fuzzy: bool = False
+    # Treat the text as HTML: scan only its visible text (tags stripped, entities
+    # decoded) and report spans as offsets into the markup.
+    html: bool = False
+    # Marketplace locale rule set ("US", "CA-fr", "MX-es", "DE"; see compliance/locales.py).
+    # None scans with the active rule pack.
+    locale: str | None = None
 
 
 @dataclass(frozen=True)
@@ -53,145 +36,658 @@ class Finding:
     field: str
     message: str
     match: str
+    start: int | None = None
+    end: int | None = None
+    line: int | None = None  # 1-based, set by streaming scans
+    column: int | None = None
 
-    def to_dict(self) -> dict[str, str]:
-        return {
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
             "severity": self.severity,
             "rule_id": self.rule_id,
             "field": self.field,
             "message": self.message,
             "match": self.match,
         }
+        if self.start is not None:
+            out["start"] = self.start
+            out["end"] = self.end
+        if self.line is not None:
+            out["line"] = self.line
+            out["column"] = self.column
+        return out
 
 
-_BLOCKLIST: list[tuple[BlockedTerm, re.Pattern[str]]] = [
-    (t, _term_to_regex(t.term)) for t in iter_blocked_terms()
-]
+_ACTIVE: CompiledRulePack | None = None
 
-_PERCENT_ORGANISM = re.compile(
-    r"(?i)\b\d{1,3}(?:\.\d+)?\s*%.*\b(germs?|bacteria|viruses?|mold|mildew|fungus|pathogens?)\b"
-)
 
-_MEDICAL_CLAIM = re.compile(
-    r"(?i)\b(cures|treats|prevents|heals|healing|therapeutic|medicinal)\b"
-    r"(?:\W+\w+){0,3}\W+"
-    r"\b(disease|illness|infection|asthma|allerg(?:y|ies)|flu|cold|covid|pain|inflammation)\b"
+def active_rule_pack() -> CompiledRulePack:
+    """The rule pack scans run against; loaded and compiled on first use."""
+    global _ACTIVE
+    if _ACTIVE is None:
+        _ACTIVE = compile_rule_pack(load_rule_pack())
+    return _ACTIVE
+
+
+def use_rule_pack(path: Path | None = None) -> CompiledRulePack:
+    """Load and activate a rule pack file (default: $ALLIANCE_AMAZON_RULE_PACK or the bundled pack)."""
+    global _ACTIVE
+    _ACTIVE = compile_rule_pack(load_rule_pack(path))
+    return _ACTIVE
+
+
+def rule_pack_for(config: ScanConfig) -> CompiledRulePack:
+    """The rule set a scan with this config runs against (a locale's is compiled on first use)."""
+    if config.locale:
+        rules = locale_rule_pack(config.locale, active_rule_pack().pack)
+        if rules is not None:
+            return rules
+    return active_rule_pack()
+
+
+# (severity, rule_id, message) rows shared by every span that hits the same rule.
+_Rule = tuple[str, str, str]
+
+_GRADE_UNVERIFIED_RULE = (
+    "hard",
+    "RULE-GRADE-UNVERIFIED",
+    "Grade term used but not allowed (no product_name provided or grade not present there)",
 )
 
 
-def _allowed_grade_terms(product_name: str | None) -> set[str]:
+@dataclass
+class ScanStats:
+    texts: int = 0
+    chars: int = 0
+    seconds: float = 0.0
+
+    def record(self, chars: int, seconds: float, texts: int = 1) -> None:
+        self.texts += texts
+        self.chars += chars
+        self.seconds += seconds
+
+    def to_dict(self) -> dict[str, float]:
+        secs = self.seconds or 1e-12
+        return {
+            "texts": self.texts,
+            "chars": self.chars,
+            "seconds": round(self.seconds, 6),
+            "texts_per_second": round(self.texts / secs, 1) if self.texts else 0.0,
+            "chars_per_second": round(self.chars / secs, 1) if self.texts else 0.0,
+            "avg_us_per_text": round(self.seconds / self.texts * 1e6, 2) if self.texts else 0.0,
+        }
+
+
+_STATS = ScanStats()
+
+
+def scan_stats() -> ScanStats:
+    """Cumulative throughput of scan_text() in this process (per-catalog totals)."""
+    return _STATS
+
+
+def reset_scan_stats() -> None:
+    global _STATS
+    _STATS = ScanStats()
+
+
+# Opt-in per-rule instrumentation; None keeps the hot path unprofiled.
+_RULE_STATS: RuleStats | None = None
+
+
+def enable_rule_stats(top: int = 10) -> RuleStats:
+    """
+    Start recording per-rule counters for every scan_text()/scan_spans() call.
+
+    The scan_text() result cache is bypassed meanwhile, so every text is evaluated.
+    """
+    global _RULE_STATS
+    _RULE_STATS = RuleStats(top=top)
+    return _RULE_STATS
+
+
+def disable_rule_stats() -> RuleStats | None:
+    """Stop instrumenting scans and return what was recorded."""
+    global _RULE_STATS
+    stats, _RULE_STATS = _RULE_STATS, None
+    return stats
+
+
+def rule_stats() -> RuleStats | None:
+    return _RULE_STATS
+
+
+def _record_rule_stats(rules: CompiledRulePack, field: str, text: str, seconds: float, profile: ScanProfile) -> None:
+    if _RULE_STATS is not None:
+        _RULE_STATS.add_scan(field, text, seconds, profile, rules.term_labels, rules.proximity_labels)
+
+
+def _scan_profile(rules: CompiledRulePack) -> ScanProfile | None:
+    if _RULE_STATS is None:
+        return None
+    return ScanProfile(len(rules.term_labels), len(rules.proximity_labels))
+
+
+# Texts longer than this are rarely repeated verbatim and would dominate memory.
+_CACHE_MAX_TEXT_CHARS = 4096
+
+# (text, allowed grade set, rule-pack version, fuzzy) -> field-independent (rule, match) rows.
+_CACHE: LruCache[tuple[str, frozenset[str], str, bool], tuple[tuple[_Rule, str], ...]] = LruCache(maxsize=8192)
+
+
+def scan_cache_info() -> dict[str, int]:
+    return _CACHE.info()
+
+
+def configure_scan_cache(maxsize: int) -> None:
+    """Resize the scan_text() result cache; 0 disables caching."""
+    _CACHE.resize(maxsize)
+
+
+def clear_scan_cache() -> None:
+    _CACHE.clear()
+
+
+def _allowed_grade_terms(rules: CompiledRulePack, product_name: str | None) -> set[str]:
     if not product_name:
         return set()
     lower = product_name.lower()
-    return {g for g in _GRADE_TERMS if g in lower}
+    return {g for g in rules.grade_terms if g in lower}
+
+
+def _finding(rule: _Rule, field: str, match: str) -> Finding:
+    severity, rule_id, message = rule
+    return Finding(severity=severity, rule_id=rule_id, field=field, message=message, match=match)
+
+
+def _grade_mismatch_rule(allowed_grades: set[str]) -> _Rule:
+    return (
+        "hard",
+        "RULE-GRADE-MISMATCH",
+        f"Grade term not present in product_name (allowed: {sorted(allowed_grades)})",
+    )
+
+
+class _RuleSpans:
+    """Spans already reported per rule id, so a fuzzy hit never repeats one."""
+
+    def __init__(self, spans: Iterable[tuple[str, tuple[int, int]]]) -> None:
+        # Per rule: disjoint intervals as parallel sorted start/end lists.
+        self._spans: dict[str, tuple[list[int], list[int]]] = {}
+        for rule_id, (start, end) in sorted(spans, key=lambda r: (r[0], r[1])):
+            starts, ends = self._spans.setdefault(rule_id, ([], []))
+            if ends and start < ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+
+    def claim(self, rule_id: str, start: int, end: int) -> bool:
+        starts, ends = self._spans.setdefault(rule_id, ([], []))
+        i = bisect_right(ends, start)
+        if i < len(starts) and starts[i] < end:
+            return False
+        starts.insert(i, start)
+        ends.insert(i, end)
+        return True
+
+
+class _AllowSpans:
+    """Merged spans of allow-listed phrases; a blocklist hit inside one is suppressed."""
+
+    def __init__(self, spans: Iterable[tuple[int, int]]) -> None:
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        for start, end in sorted(spans):
+            self.extend(start, end)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def extend(self, start: int, end: int) -> None:
+        """Merge in one more span; spans must come in start order."""
+        if self._ends and start <= self._ends[-1]:
+            self._ends[-1] = max(self._ends[-1], end)
+        else:
+            self._starts.append(start)
+            self._ends.append(end)
+
+    def covers(self, start: int, end: int) -> bool:
+        i = bisect_right(self._starts, start) - 1
+        return i >= 0 and end <= self._ends[i]
+
+
+def listing_field_config(config: ScanConfig, field: str, text: str) -> ScanConfig:
+    """Config for one listing field: HTML descriptions are scanned HTML-aware."""
+    if field == "description" and not config.html and looks_like_html(text):
+        return replace(config, html=True)
+    return config
 
 
 def scan_text(text: str, *, config: ScanConfig, field: str = "text") -> list[Finding]:
-    findings: list[Finding] = []
     if not text:
-        return findings
+        return []
+    if config.html:
+        return scan_text(strip_html(text).text, config=replace(config, html=False), field=field)
+
+    rules = rule_pack_for(config)
+    allowed_grades = _allowed_grade_terms(rules, config.allow_grade_terms_from_product_name)
+    profile = _scan_profile(rules)
+    cacheable = profile is None and _CACHE.maxsize > 0 and len(text) <= _CACHE_MAX_TEXT_CHARS
+    if cacheable:
+        key = (text, frozenset(allowed_grades), rules.version, config.fuzzy)
+        rows = _CACHE.get(key)
+        if rows is not None:
+            return [_finding(rule, field, match) for rule, match in rows]
+
+    started = time.perf_counter()
+    rows = _scan_rows(rules, text, allowed_grades, fuzzy=config.fuzzy, profile=profile)
+    seconds = time.perf_counter() - started
+    _STATS.record(len(text), seconds)
+    if profile is not None:
+        _record_rule_stats(rules, field, text, seconds, profile)
+    if cacheable:
+        _CACHE.put(key, rows)
+    return [_finding(rule, field, match) for rule, match in rows]
 
-    for blocked, rx in _BLOCKLIST:
-        m = rx.search(text)
-        if not m:
+
+# Span of one term occurrence, in offsets of the text being scanned.
+_Span = tuple[int, int]
+
+
+def _scan_rows(
+    rules: CompiledRulePack,
+    text: str,
+    allowed_grades: set[str],
+    *,
+    fuzzy: bool = False,
+    profile: ScanProfile | None = None,
+) -> tuple[tuple[_Rule, str], ...]:
+    # Every occurrence from one matcher pass, so allow phrases never send _rows() back to rescan a term.
+    occurrences: dict[int, list[_Span]] = {}
+    for idx, m in rules.matcher.iter_matches(text, profile.terms if profile else None):
+        occurrences.setdefault(idx, []).append(m.span())
+    hits = {idx: spans[0] for idx, spans in occurrences.items()}
+    claims = rules.proximity.first_spans(text, profile.proximity if profile else None)
+    return _rows(rules, text, allowed_grades, hits, claims, occurrences.__getitem__, fuzzy=fuzzy, profile=profile)
+
+
+def _rows(
+    rules: CompiledRulePack,
+    text: str,
+    allowed_grades: set[str],
+    hits: dict[int, _Span],
+    claims: dict[int, _Span],
+    occurrences: Callable[[int], Iterable[_Span]],
+    *,
+    fuzzy: bool = False,
+    profile: ScanProfile | None = None,
+) -> tuple[tuple[_Rule, str], ...]:
+    """
+    Findings of one text from its first match per matcher term and per proximity rule.
+
+    occurrences(idx) yields every match of a term that hit; it is only consulted
+    for allow phrases, and for terms whose first hit one of them covers.
+    """
+    rows: list[tuple[_Rule, str]] = []
+    allowed = _AllowSpans(span for idx in hits if idx >= rules.allow_offset for span in occurrences(idx))
+    if allowed:
+        # A term whose first hit sits inside an allow phrase may still occur on its own later.
+        for idx in [i for i in hits if i < rules.grade_offset]:
+            if allowed.covers(*hits[idx]):
+                span = next((sp for sp in occurrences(idx) if not allowed.covers(*sp)), None)
+                if span is None:
+                    del hits[idx]
+                else:
+                    hits[idx] = span
+    near: dict[int, _Span] = {}
+    if fuzzy:
+        # Near-matches are kept per rule, not per term: at most one per rule, and
+        # none for a rule any of whose terms already matched exactly.
+        flagged = {rules.blocklist_rules[i][1] for i in hits if i < rules.grade_offset}
+        matcher = rules.fuzzy  # built on first use; keep that out of the pass timing
+        fuzzy_started = time.perf_counter()
+        for idx, start, end, _ in matcher.iter_matches(text):
+            rule_id = rules.fuzzy_rules[idx][1]
+            if rule_id not in flagged and not allowed.covers(start, end):
+                flagged.add(rule_id)
+                near[idx] = (start, end)
+        if profile is not None:
+            profile.fuzzy.record(0, time.perf_counter() - fuzzy_started, len(near))
+
+    for idx, rule in enumerate(rules.blocklist_rules):
+        span = hits.get(idx) or near.get(idx)
+        if span:
+            rows.append((rule if idx in hits else rules.fuzzy_rules[idx], text[span[0] : span[1]]))
+
+    for idx, rule in enumerate(rules.proximity_rules):
+        span = claims.get(idx)
+        if span:
+            rows.append((rule, text[span[0] : span[1]]))
+
+    for gi, g in enumerate(rules.grade_terms):
+        span = hits.get(rules.grade_offset + gi)
+        if not span or g in allowed_grades:
             continue
-        findings.append(
-            Finding(
-                severity=blocked.severity,
-                rule_id=f"BLOCKLIST-{blocked.rule_id}",
-                field=field,
-                message=f"Blocked term in category '{blocked.category}'",
-                match=m.group(0),
-            )
-        )
+        rule = _grade_mismatch_rule(allowed_grades) if allowed_grades else _GRADE_UNVERIFIED_RULE
+        rows.append((rule, text[span[0] : span[1]]))
+        break
 
-    m2 = _PERCENT_ORGANISM.search(text)
-    if m2:
-        findings.append(
-            Finding(
-                severity="hard",
-                rule_id="PATTERN-PERCENT-ORGANISM",
-                field=field,
-                message="Percent/organism claim implies antimicrobial efficacy",
-                match=m2.group(0),
-            )
-        )
+    return tuple(rows)
 
-    m3 = _MEDICAL_CLAIM.search(text)
-    if m3:
-        findings.append(
-            Finding(
-                severity="hard",
-                rule_id="PATTERN-MEDICAL-CLAIM",
-                field=field,
-                message="Medical/drug claim language detected",
-                match=m3.group(0),
-            )
+
+# Joins batched texts: no term or word-window rule can match across it.
+_FIELD_SEPARATOR = "\n\x00\n"
+
+
+def _scan_batch(
+    rules: CompiledRulePack, texts: Sequence[str], allowed_grades: set[str], *, fuzzy: bool = False
+) -> list[tuple[tuple[_Rule, str], ...]]:
+    """_scan_rows() of every text, from one matcher pass and one proximity pass over all of them joined."""
+    buf = _FIELD_SEPARATOR.join(texts)
+    starts: list[int] = []
+    ends: list[int] = []
+    pos = 0
+    for text in texts:
+        starts.append(pos)
+        ends.append(pos + len(text))
+        pos += len(text) + len(_FIELD_SEPARATOR)
+
+    occurrences: list[dict[int, list[_Span]]] = [{} for _ in texts]
+    for idx, m in rules.matcher.iter_matches(buf):
+        i = bisect_right(starts, m.start()) - 1
+        if m.end() <= ends[i]:
+            occurrences[i].setdefault(idx, []).append((m.start() - starts[i], m.end() - starts[i]))
+    claims: list[dict[int, _Span]] = [{} for _ in texts]
+    for idx, start, end in rules.proximity.iter_spans(buf, bounds=ends):
+        i = bisect_right(starts, start) - 1
+        claims[i].setdefault(idx, (start - starts[i], end - starts[i]))
+
+    return [
+        _rows(
+            rules,
+            text,
+            allowed_grades,
+            {idx: spans[0] for idx, spans in occ.items()},
+            claim,
+            occ.__getitem__,
+            fuzzy=fuzzy,
         )
+        for text, occ, claim in zip(texts, occurrences, claims)
+    ]
 
-    allowed_grades = _allowed_grade_terms(config.allow_grade_terms_from_product_name)
-    if not allowed_grades:
-        for g in _GRADE_TERMS:
-            rxg = _term_to_regex(g)
-            mg = rxg.search(text)
-            if mg:
-                findings.append(
-                    Finding(
-                        severity="hard",
-                        rule_id="RULE-GRADE-UNVERIFIED",
-                        field=field,
-                        message="Grade term used but not allowed (no product_name provided or grade not present there)",
-                        match=mg.group(0),
-                    )
-                )
-                break
-    else:
-        for g in _GRADE_TERMS:
-            rxg = _term_to_regex(g)
-            mg = rxg.search(text)
-            if mg and g not in allowed_grades:
-                findings.append(
-                    Finding(
-                        severity="hard",
-                        rule_id="RULE-GRADE-MISMATCH",
-                        field=field,
-                        message=f"Grade term not present in product_name (allowed: {sorted(allowed_grades)})",
-                        match=mg.group(0),
-                    )
-                )
-                break
 
-    return findings
+def _scan_pairs(pairs: Sequence[tuple[str, str]], config: ScanConfig) -> list[tuple[tuple[_Rule, str], ...]]:
+    # Rows of every (field, text) pair; texts not in the result cache are scanned as one batch.
+    if config.html:
+        pairs = [(field, strip_html(text).text) for field, text in pairs]
+        config = replace(config, html=False)
+    rules = rule_pack_for(config)
+    allowed_grades = _allowed_grade_terms(rules, config.allow_grade_terms_from_product_name)
+    grades_key = frozenset(allowed_grades)
+
+    results: list[tuple[tuple[_Rule, str], ...] | None] = []
+    missing: list[int] = []
+    for i, (_, text) in enumerate(pairs):
+        rows: tuple[tuple[_Rule, str], ...] | None = ()
+        if text and _CACHE.maxsize > 0 and len(text) <= _CACHE_MAX_TEXT_CHARS:
+            rows = _CACHE.get((text, grades_key, rules.version, config.fuzzy))
+        elif text:
+            rows = None
+        if rows is None:
+            missing.append(i)
+        results.append(rows)
+
+    if missing:
+        texts = [pairs[i][1] for i in missing]
+        started = time.perf_counter()
+        batch = _scan_batch(rules, texts, allowed_grades, fuzzy=config.fuzzy)
+        _STATS.record(sum(len(t) for t in texts), time.perf_counter() - started, texts=len(texts))
+        for i, text, rows in zip(missing, texts, batch):
+            results[i] = rows
+            if _CACHE.maxsize > 0 and len(text) <= _CACHE_MAX_TEXT_CHARS:
+                _CACHE.put((text, grades_key, rules.version, config.fuzzy), rows)
+    return [rows or () for rows in results]
+
+
+def scan_many(fields: Iterable[tuple[str, str]], *, config: ScanConfig) -> list[Finding]:
+    """
+    Scan (field path, text) pairs, e.g. every field of a listing or of a batch of listings.
+
+    Texts missing from the scan_text() cache are joined into one buffer and
+    scanned in a single matcher pass and a single proximity pass; findings are
+    mapped back to their fields and equal scan_text() on each pair, in order.
+    """
+    pairs = list(fields)
+    if _RULE_STATS is not None:
+        # Instrumented scans are timed text by text.
+        return [f for field, text in pairs for f in scan_text(text, config=config, field=field)]
+    return [
+        _finding(rule, field, match)
+        for (field, _), rows in zip(pairs, _scan_pairs(pairs, config))
+        for rule, match in rows
+    ]
+
+
+def _listing_scan_texts(payload: Any, config: ScanConfig) -> Iterator[tuple[str, str]]:
+    for field, text in iter_listing_texts(payload):
+        if listing_field_config(config, field, text) is not config:
+            text = strip_html(text).text
+        yield field, text
 
 
 def scan_listing_fields(payload: Any, *, config: ScanConfig) -> list[Finding]:
-    findings: list[Finding] = []
-    if isinstance(payload, dict):
-        for key in ("title", "description", "backend_search_terms", "a_plus_markdown"):
-            if isinstance(payload.get(key), str):
-                findings.extend(scan_text(payload[key], config=config, field=key))
-        bullets = payload.get("bullets")
-        if isinstance(bullets, list):
-            for idx, b in enumerate(bullets, start=1):
-                if isinstance(b, str):
-                    findings.extend(scan_text(b, config=config, field=f"bullet_{idx}"))
-        a_plus = payload.get("a_plus")
-        if isinstance(a_plus, (dict, list)):
-            findings.extend(_scan_payload_strings(a_plus, config=config, field_prefix="a_plus"))
-    else:
-        findings.extend(scan_text(str(payload), config=config, field="payload"))
+    return scan_many(_listing_scan_texts(payload, config), config=config)
+
+
+def scan_listings(payloads: Iterable[Any], *, config: ScanConfig) -> list[list[Finding]]:
+    """scan_listing_fields() of each listing, with all of their fields scanned as one batch."""
+    owners: list[int] = []
+    pairs: list[tuple[str, str]] = []
+    findings: list[list[Finding]] = []
+    for n, payload in enumerate(payloads):
+        findings.append([])
+        for pair in _listing_scan_texts(payload, config):
+            owners.append(n)
+            pairs.append(pair)
+    if _RULE_STATS is not None:
+        for n, (field, text) in zip(owners, pairs):
+            findings[n].extend(scan_text(text, config=config, field=field))
+        return findings
+    for n, (field, _), rows in zip(owners, pairs, _scan_pairs(pairs, config)):
+        findings[n].extend(_finding(rule, field, match) for rule, match in rows)
     return findings
 
 
-def _scan_payload_strings(payload: Any, *, config: ScanConfig, field_prefix: str) -> list[Finding]:
-    findings: list[Finding] = []
+def has_hard_finding(text: str, *, config: ScanConfig) -> bool:
+    """
+    Whether scan_text() would report a hard finding, without building findings.
+
+    For gates that only need a yes/no: soft rules are never evaluated, the
+    keyword index rules most texts out without a scan, and the term and claim
+    passes stop at the first hard hit. Cached scan_text() results are reused.
+    """
+    if not text:
+        return False
+    if config.html:
+        return has_hard_finding(strip_html(text).text, config=replace(config, html=False))
+    rules = rule_pack_for(config)
+    allowed_grades = _allowed_grade_terms(rules, config.allow_grade_terms_from_product_name)
+    if _CACHE.maxsize > 0 and len(text) <= _CACHE_MAX_TEXT_CHARS:
+        rows = _CACHE.get((text, frozenset(allowed_grades), rules.version, config.fuzzy))
+        if rows is not None:
+            return any(rule[0] == "hard" for rule, _ in rows)
+    if config.fuzzy or _RULE_STATS is not None:
+        # Near-matches need every allow phrase; instrumented runs time the full scan.
+        return any(f.severity == "hard" for f in scan_text(text, config=config))
+    # Sound for any text, not just keywords: the index folds case with re.IGNORECASE
+    # like the matcher and proximity engine, so it only rules out texts they can't hit.
+    if not rules.keyword_index.may_block(text):
+        return False
+
+    started = time.perf_counter()
+    try:
+        return _first_hard_term(rules, text, allowed_grades) or _first_hard_claim(rules, text)
+    finally:
+        _STATS.record(len(text), time.perf_counter() - started)
+
+
+def _first_hard_term(rules: CompiledRulePack, text: str, allowed_grades: set[str]) -> bool:
+    # Matches arrive in start order, so once one starts past a hard hit's end, every
+    # allow phrase that could take part in covering that hit has been merged in.
+    allowed = _AllowSpans(())
+    pending: list[_Span] = []
+    for idx, m in rules.matcher.iter_matches(text):
+        start, end = m.span()
+        if pending and pending[0][1] < start:
+            if any(not allowed.covers(*hit) for hit in pending if hit[1] < start):
+                return True
+            pending = [hit for hit in pending if hit[1] >= start]
+        if idx >= rules.allow_offset:
+            allowed.extend(start, end)
+        elif idx >= rules.grade_offset:
+            if rules.grade_terms[idx - rules.grade_offset] not in allowed_grades:
+                return True
+        elif rules.blocklist_rules[idx][0] == "hard":
+            pending.append((start, end))
+    return any(not allowed.covers(*hit) for hit in pending)
+
+
+def _first_hard_claim(rules: CompiledRulePack, text: str) -> bool:
+    engine = rules.proximity
+    hard = [rule for rule in engine.rules if rule.severity == "hard"]
+    if not hard:
+        return False
+    stream = engine.tokenize(text)
+    return any(next(engine.iter_rule_spans(stream, rule), None) is not None for rule in hard)
+
+
+def listing_has_hard_finding(payload: Any, *, config: ScanConfig) -> bool:
+    """has_hard_finding() over the listing's fields, stopping at the first field that has one."""
+    return any(has_hard_finding(text, config=config) for _, text in _listing_scan_texts(payload, config))
+
+
+class SpanFindings:
+    """
+    Every rule occurrence in one text, as (start, end, rule) rows sorted by start.
+
+    Rules are shared (severity, rule_id, message) tuples, so a text with many
+    hits does not carry a Finding object per occurrence until one is asked for.
+    """
+
+    __slots__ = ("text", "field", "rows")
+
+    def __init__(self, text: str, field: str, rows: list[tuple[int, int, _Rule]]) -> None:
+        self.text = text
+        self.field = field
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Finding]:
+        for start, end, (severity, rule_id, message) in self.rows:
+            yield Finding(
+                severity=severity,
+                rule_id=rule_id,
+                field=self.field,
+                message=message,
+                match=self.text[start:end],
+                start=start,
+                end=end,
+            )
+
+    def spans(self, *, severity: str | None = None) -> list[tuple[int, int]]:
+        return [(start, end) for start, end, rule in self.rows if severity is None or rule[0] == severity]
+
+    def has_hard(self) -> bool:
+        return any(rule[0] == "hard" for _, _, rule in self.rows)
+
+
+def scan_spans(text: str, *, config: ScanConfig = ScanConfig(), field: str = "text") -> SpanFindings:
+    rows: list[tuple[int, int, _Rule]] = []
+    if not text:
+        return SpanFindings(text, field, rows)
+    if config.html:
+        doc = strip_html(text)
+        found = scan_spans(doc.text, config=replace(config, html=False), field=field)
+        # The offset map is monotonic, so rows stay sorted by start.
+        return SpanFindings(text, field, [(*doc.source_span(start, end), rule) for start, end, rule in found.rows])
+
+    started = time.perf_counter()
+    rules = rule_pack_for(config)
+    allowed_grades = _allowed_grade_terms(rules, config.allow_grade_terms_from_product_name)
+    grade_rule = _grade_mismatch_rule(allowed_grades) if allowed_grades else _GRADE_UNVERIFIED_RULE
+    profile = _scan_profile(rules)
+
+    # Allow phrases come out of the same matcher pass; blocklist rows they cover are dropped afterwards.
+    allow: list[tuple[int, int]] = []
+    blocked: list[tuple[int, int, _Rule]] = []
+    for idx, m in rules.matcher.iter_matches(text, profile.terms if profile else None):
+        if idx < rules.grade_offset:
+            blocked.append((m.start(), m.end(), rules.blocklist_rules[idx]))
+        elif idx >= rules.allow_offset:
+            allow.append(m.span())
+        elif rules.grade_terms[idx - rules.grade_offset] not in allowed_grades:
+            rows.append((m.start(), m.end(), grade_rule))
+    allowed = _AllowSpans(allow)
+    if allowed:
+        blocked = [r for r in blocked if not allowed.covers(r[0], r[1])]
+    rows.extend(blocked)
+    if config.fuzzy:
+        taken = _RuleSpans((rule[1], (start, end)) for start, end, rule in rows)
+        matcher = rules.fuzzy
+        fuzzy_started = time.perf_counter()
+        near = 0
+        for idx, start, end, _ in matcher.iter_matches(text):
+            rule = rules.fuzzy_rules[idx]
+            if not allowed.covers(start, end) and taken.claim(rule[1], start, end):
+                rows.append((start, end, rule))
+                near += 1
+        if profile is not None:
+            profile.fuzzy.record(0, time.perf_counter() - fuzzy_started, near)
+    for idx, start, end in rules.proximity.iter_spans(text, profile.proximity if profile else None):
+        rows.append((start, end, rules.proximity_rules[idx]))
+    rows.sort(key=lambda r: (r[0], r[1]))
+
+    seconds = time.perf_counter() - started
+    _STATS.record(len(text), seconds)
+    if profile is not None:
+        _record_rule_stats(rules, field, text, seconds, profile)
+    return SpanFindings(text, field, rows)
+
+
+def iter_listing_texts(payload: Any) -> Iterator[tuple[str, str]]:
+    """Yield (field, text) for every scannable string in a listing payload."""
+    if not isinstance(payload, dict):
+        yield "payload", str(payload)
+        return
+    for key in ("title", "description", "backend_search_terms", "a_plus_markdown"):
+        if isinstance(payload.get(key), str):
+            yield key, payload[key]
+    bullets = payload.get("bullets")
+    if isinstance(bullets, list):
+        for idx, b in enumerate(bullets, start=1):
+            if isinstance(b, str):
+                yield f"bullet_{idx}", b
+    a_plus = payload.get("a_plus")
+    if isinstance(a_plus, (dict, list)):
+        yield from _iter_payload_strings(a_plus, "a_plus")
+
+
+def _iter_payload_strings(payload: Any, field_prefix: str) -> Iterator[tuple[str, str]]:
     if isinstance(payload, str):
-        return scan_text(payload, config=config, field=field_prefix)
-    if isinstance(payload, list):
+        yield field_prefix, payload
+    elif isinstance(payload, list):
         for idx, item in enumerate(payload, start=1):
-            findings.extend(_scan_payload_strings(item, config=config, field_prefix=f"{field_prefix}[{idx}]"))
-        return findings
-    if isinstance(payload, dict):
+            yield from _iter_payload_strings(item, f"{field_prefix}[{idx}]")
+    elif isinstance(payload, dict):
         for k, v in payload.items():
-            findings.extend(_scan_payload_strings(v, config=config, field_prefix=f"{field_prefix}.{k}"))
-    return findings
+            yield from _iter_payload_strings(v, f"{field_prefix}.{k}")
+
+
+def scan_listing_spans(payload: Any, *, config: ScanConfig) -> list[SpanFindings]:
+    return [
+        scan_spans(text, config=listing_field_config(config, field, text), field=field)
+        for field, text in iter_listing_texts(payload)
+    ]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import dataclasses
+from bisect import bisect_right
+from typing import Iterator, TextIO
+
+from .scanner import Finding, ScanConfig, rule_pack_for, scan_spans
+
+
+DEFAULT_CHUNK_CHARS = 1 << 20
+# Longest match that may straddle a chunk cut inside a very long line.
+DEFAULT_OVERLAP_CHARS = 4096
+
+
+def _cut_point(buf: str, *, chunk_chars: int, overlap_chars: int) -> int:
+    """Where to split buf: everything before the cut is final, the rest is rescanned."""
+    # Always keep overlap_chars of lookahead so a match crossing the cut is seen whole.
+    limit = len(buf) - overlap_chars
+    if limit <= 0:
+        return 0
+    # Prefer cutting after a newline so same-line rules see whole lines.
+    nl = buf.rfind("\n", 0, limit)
+    if nl >= 0 and limit - (nl + 1) <= chunk_chars:
+        return nl + 1
+    # A very long line: cut on whitespace so the next buffer never starts mid-word.
+    for i in range(limit - 1, max(0, limit - overlap_chars) - 1, -1):
+        if buf[i].isspace():
+            return i if i > 0 else limit
+    return limit
+
+
+def iter_stream_findings(
+    fp: TextIO,
+    *,
+    config: ScanConfig,
+    field: str = "text",
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    overlap_chars: int = DEFAULT_OVERLAP_CHARS,
+) -> Iterator[Finding]:
+    """
+    Scan a text stream chunk by chunk, yielding findings as each chunk completes.
+
+    Offsets are absolute character offsets into the stream and every finding
+    carries its 1-based line and column. Memory stays bounded by roughly
+    a few chunks regardless of input size. Results equal scan_spans() on the
+    whole text except inside lines longer than overlap_chars, where a match
+    (or a same-line rule's window) reaching past the lookahead is cut short.
+    """
+    chunk_chars = max(1, chunk_chars)
+    overlap_chars = max(1, overlap_chars)
+    carry = ""
+    base = 0  # absolute offset of carry[0]
+    base_line = 1
+    base_column = 0  # characters between the start of carry[0]'s line and carry[0]
+    # Proximity rules resume after their last span (like re.finditer), so an
+    # anchor inside a span that straddled the previous cut must not restart one.
+    proximity_ids = {rule_id for _, rule_id, _ in rule_pack_for(config).proximity_rules}
+    rule_resume: dict[str, int] = {}
+    while True:
+        chunk = fp.read(chunk_chars)
+        buf = carry + chunk
+        if not buf:
+            return
+        cut = len(buf) if not chunk else _cut_point(buf, chunk_chars=chunk_chars, overlap_chars=overlap_chars)
+        if not cut:
+            carry = buf
+            continue
+        newlines = _newline_offsets(buf, cut)
+
+        for f in scan_spans(buf, config=config, field=field):
+            assert f.start is not None and f.end is not None
+            if f.start >= cut:
+                continue  # rescanned with more context in the next buffer
+            start, end = base + f.start, base + f.end
+            if f.rule_id in proximity_ids:
+                if start < rule_resume.get(f.rule_id, 0):
+                    continue
+                rule_resume[f.rule_id] = end
+            nl_before = bisect_right(newlines, f.start - 1)
+            if nl_before:
+                column = f.start - newlines[nl_before - 1]
+            else:
+                column = base_column + f.start + 1
+            yield dataclasses.replace(f, start=start, end=end, line=base_line + nl_before, column=column)
+
+        if newlines:
+            base_column = cut - (newlines[-1] + 1)
+        else:
+            base_column += cut
+        base += cut
+        base_line += len(newlines)
+        carry = buf[cut:]
+        if not chunk:
+            return
+
+
+def _newline_offsets(buf: str, stop: int) -> list[int]:
+    out: list[int] = []
+    i = buf.find("\n", 0, stop)
+    while i >= 0:
+        out.append(i)
+        i = buf.find("\n", i + 1, stop)
+    return out
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+import heapq
+import io
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+
+# Search-term demand from Amazon reports (Brand Analytics "Amazon Search Terms",
+# Search Query Performance, Sponsored Products search-term reports), aggregated
+# per normalized term into a SQLite table that keyword ranking and backend
+# packing read from.
+
+# Header names (case-insensitive) for each column a report may carry.
+_TERM_COLUMNS = ("search term", "search query", "customer search term", "search terms", "keyword")
+_RANK_COLUMNS = ("search frequency rank",)
+_VOLUME_COLUMNS = ("search query volume", "search volume", "impressions: total count", "impressions")
+_CLICK_COLUMNS = ("clicks: total count", "clicks")
+_CLICK_SHARE = re.compile(r"^(?:#\d+ click share|click share|clicks: brand share %?)$")
+
+# Rank-only reports (Brand Analytics) get a volume estimate of _RANK_SCALE / rank,
+# so they rank on roughly the same scale as reports with search volumes.
+_RANK_SCALE = 1_000_000.0
+
+# Reports can have a preamble ("Reporting Range=[...]") before the header row.
+_MAX_PREAMBLE_LINES = 20
+
+DEFAULT_FLUSH_TERMS = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    volume REAL NOT NULL,
+    clicks REAL NOT NULL,
+    best_rank INTEGER NOT NULL,
+    click_share REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS reports (
+    digest TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    rows INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO terms (term, rows, volume, clicks, best_rank, click_share) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(term) DO UPDATE SET
+    rows = rows + excluded.rows,
+    volume = volume + excluded.volume,
+    clicks = clicks + excluded.clicks,
+    best_rank = CASE
+        WHEN best_rank = 0 THEN excluded.best_rank
+        WHEN excluded.best_rank = 0 THEN best_rank
+        ELSE min(best_rank, excluded.best_rank)
+    END,
+    click_share = click_share + excluded.click_share
+"""
+
+
+def normalize_term(term: str) -> str:
+    """The key a search term is aggregated under: case-folded, whitespace collapsed."""
+    return " ".join(str(term).casefold().split())
+
+
+def _number(value: str, *, percent: bool = False) -> float:
+    # "1,234", "12.5%", "" and "-" all occur in exported reports.
+    s = value.strip().replace(",", "")
+    if s.endswith("%"):
+        s, percent = s[:-1], True
+    try:
+        n = float(s)
+    except ValueError:
+        return 0.0
+    return n / 100.0 if percent else n
+
+
+@dataclass(frozen=True)
+class TermDemand:
+    term: str
+    rows: int
+    volume: float
+    clicks: float
+    best_rank: int
+    click_share: float  # summed over rows; mean_click_share divides it out
+
+    @property
+    def mean_click_share(self) -> float:
+        return self.click_share / self.rows if self.rows else 0.0
+
+    @property
+    def score(self) -> float:
+        """Search volume (or its rank estimate), weighted up by the share of clicks the term converts into."""
+        volume = self.volume or (_RANK_SCALE / self.best_rank if self.best_rank else 0.0)
+        return volume * (1.0 + self.mean_click_share)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "term": self.term,
+            "rows": self.rows,
+            "volume": self.volume,
+            "clicks": self.clicks,
+            "best_rank": self.best_rank or None,
+            "mean_click_share": round(self.mean_click_share, 6),
+            "score": round(self.score, 3),
+        }
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    name: str
+    rows: int = 0
+    new_terms: int = 0
+    skipped_rows: int = 0
+    duplicate: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "report": self.name,
+            "rows": self.rows,
+            "new_terms": self.new_terms,
+            "skipped_rows": self.skipped_rows,
+            "duplicate": self.duplicate,
+        }
+
+
+class _Columns:
+    """Where one report keeps each aggregated column."""
+
+    def __init__(self, header: list[str]) -> None:
+        names = [h.strip().casefold() for h in header]
+
+        def first(candidates: tuple[str, ...]) -> int | None:
+            for c in candidates:
+                if c in names:
+                    return names.index(c)
+            return None
+
+        self.term = first(_TERM_COLUMNS)
+        self.rank = first(_RANK_COLUMNS)
+        self.volume = first(_VOLUME_COLUMNS)
+        self.clicks = first(_CLICK_COLUMNS)
+        self.click_share = [(i, n.endswith("%")) for i, n in enumerate(names) if _CLICK_SHARE.match(n)]
+
+
+class _HashingReader(io.RawIOBase):
+    """Passes a binary stream through while hashing it, so a report is read once."""
+
+    def __init__(self, raw: IO[bytes]) -> None:
+        self.raw = raw
+        self.hash = hashlib.blake2b(digest_size=16)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        n = self.raw.readinto(b)
+        if n:
+            self.hash.update(memoryview(b)[:n])
+        return n or 0
+
+
+def _iter_rows(text: IO[str]) -> Iterator[tuple[_Columns, list[str]]]:
+    """The data rows of a CSV or TSV report after its header, read one at a time."""
+    for _ in range(_MAX_PREAMBLE_LINES):
+        line = text.readline()
+        delimiter = "\t" if "\t" in line else ","
+        columns = _Columns(next(csv.reader([line], delimiter=delimiter), []))
+        if columns.term is not None or not line:
+            break
+    if columns.term is None:
+        raise ValueError(f"No search term column ({', '.join(_TERM_COLUMNS)}) in the report header")
+    for row in csv.reader(text, delimiter=delimiter):
+        yield columns, row
+
+
+class DemandTable:
+    """
+    Per-term search demand aggregated from any number of reports, in SQLite.
+
+    ingest() streams a report row by row and holds at most flush_terms
+    distinct terms in memory before upserting them, so memory stays bounded
+    however long the report is. Each report is applied in one transaction and
+    recorded by content digest; ingesting the same report again is a no-op.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = path
+        self.db = sqlite3.connect(str(path), isolation_level=None)
+        self.db.executescript(_SCHEMA)
+
+    def __enter__(self) -> DemandTable:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT count(*) FROM terms").fetchone()[0]
+
+    def ingest(self, report: Path, *, flush_terms: int = DEFAULT_FLUSH_TERMS) -> IngestResult:
+        """Add one report's rows (.csv/.tsv/.txt, optionally .gz) to the table."""
+        opener = gzip.open if report.suffix.lower() == ".gz" else open
+        with opener(report, "rb") as raw:
+            hashing = _HashingReader(raw)
+            text = io.TextIOWrapper(io.BufferedReader(hashing), encoding="utf-8-sig", errors="replace", newline="")
+            self.db.execute("BEGIN")
+            try:
+                before = len(self)
+                rows, skipped = self._aggregate(_iter_rows(text), flush_terms=flush_terms)
+                while text.read(1 << 16):  # hash whatever the row reader didn't consume
+                    pass
+                digest = hashing.hash.hexdigest()
+                if self.db.execute("SELECT 1 FROM reports WHERE digest = ?", (digest,)).fetchone():
+                    self.db.execute("ROLLBACK")
+                    return IngestResult(report.name, duplicate=True)
+                self.db.execute("INSERT INTO reports VALUES (?, ?, ?)", (digest, report.name, rows))
+                new_terms = len(self) - before
+                self.db.execute("COMMIT")
+            except BaseException:
+                if self.db.in_transaction:
+                    self.db.execute("ROLLBACK")
+                raise
+        return IngestResult(report.name, rows=rows, new_terms=new_terms, skipped_rows=skipped)
+
+    def _aggregate(self, rows: Iterable[tuple[_Columns, list[str]]], *, flush_terms: int) -> tuple[int, int]:
+        pending: dict[str, list[float]] = {}
+        ingested = skipped = 0
+        for c, row in rows:
+            width = len(row)
+            term = normalize_term(row[c.term]) if c.term is not None and c.term < width else ""
+            if not term:
+                skipped += 1
+                continue
+            ingested += 1
+            volume = _number(row[c.volume]) if c.volume is not None and c.volume < width else 0.0
+            clicks = _number(row[c.clicks]) if c.clicks is not None and c.clicks < width else 0.0
+            rank = int(_number(row[c.rank])) if c.rank is not None and c.rank < width else 0
+            share = sum(_number(row[i], percent=pct) for i, pct in c.click_share if i < width)
+            agg = pending.get(term)
+            if agg is None:
+                pending[term] = [1, volume, clicks, rank, share]
+            else:
+                agg[0] += 1
+                agg[1] += volume
+                agg[2] += clicks
+                if rank and (not agg[3] or rank < agg[3]):
+                    agg[3] = rank
+                agg[4] += share
+            if len(pending) >= flush_terms:
+                self._flush(pending)
+        self._flush(pending)
+        return ingested, skipped
+
+    def _flush(self, pending: dict[str, list[float]]) -> None:
+        self.db.executemany(_UPSERT, ((t, *agg) for t, agg in pending.items()))
+        pending.clear()
+
+    def get(self, term: str) -> TermDemand | None:
+        row = self.db.execute("SELECT * FROM terms WHERE term = ?", (normalize_term(term),)).fetchone()
+        return TermDemand(*row) if row else None
+
+    def scores(self, terms: Iterable[str]) -> dict[str, float]:
+        """Demand score per normalized term; terms no report mentions are left out."""
+        out: dict[str, float] = {}
+        for term in dict.fromkeys(normalize_term(t) for t in terms):
+            demand = self.get(term)
+            if demand is not None:
+                out[term] = demand.score
+        return out
+
+    def top(self, limit: int = 100) -> list[TermDemand]:
+        """The limit highest-demand terms, scanning the table without loading it."""
+        demands = (TermDemand(*row) for row in self.db.execute("SELECT * FROM terms"))
+        return heapq.nsmallest(limit, demands, key=lambda d: (-d.score, d.term))
+
+    def rank(self, terms: Iterable[str]) -> list[str]:
+        """terms, highest demand first; terms without demand keep their order after the rest."""
+        terms = list(terms)
+        scores = self.scores(terms)
+        return sorted(terms, key=lambda t: -scores.get(normalize_term(t), 0.0))
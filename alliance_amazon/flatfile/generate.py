@@ -5,8 +5,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable
 
-from ..compliance.scanner import ScanConfig, scan_listing_fields
+from ..compliance.locales import locale_for
+from ..compliance.scanner import ScanConfig, listing_has_hard_finding
 from ..listing.generator import GenerationOptions, generate_listing
+from ..listing.packing import chunk_to_fields
 from .template import AmazonTemplateSheet
 
 
@@ -16,23 +18,6 @@ def _clean(s: Any) -> str:
     return " ".join(s.strip().split())
 
 
-def _chunk_terms_to_n_fields(terms: str, *, n: int, max_bytes_each: int) -> list[str]:
-    tokens = [t for t in terms.split() if t]
-    fields: list[str] = []
-    i = 0
-    for _ in range(n):
-        cur: list[str] = []
-        while i < len(tokens):
-            candidate = " ".join(cur + [tokens[i]])
-            if len(candidate.encode("utf-8")) <= max_bytes_each:
-                cur.append(tokens[i])
-                i += 1
-            else:
-                break
-        fields.append(" ".join(cur))
-    return fields
-
-
 def _find_first_header(attribute_keys: list[str], prefix: str) -> str | None:
     for k in attribute_keys:
         if k.startswith(prefix):
@@ -48,6 +33,8 @@ def _find_all_headers(attribute_keys: list[str], prefix: str) -> list[str]:
 class FlatFileOptions:
     product_type: str = "LAB_CHEMICAL"
     marketplace_id: str = "ATVPDKIKX0DER"
+    # Listing language; with marketplace_id it selects the compliance rule set (None: marketplace default).
+    language_tag: str | None = None
     record_action: str = "full_update"
     sheet_name: str = "Template"
     output_format: str = "tsv"  # "tsv" | "csv"
@@ -70,9 +57,11 @@ def generate_flat_file_rows(
         raise ValueError("No attribute keys found in template header row")
 
     listing = generate_listing(facts, options=listing_options)
-    config = ScanConfig(allow_grade_terms_from_product_name=_clean(facts.get("product_name")))
-    findings = scan_listing_fields(listing, config=config)
-    if any(f.severity == "hard" for f in findings) and not flatfile_options.allow_noncompliant:
+    config = ScanConfig(
+        allow_grade_terms_from_product_name=_clean(facts.get("product_name")),
+        locale=locale_for(flatfile_options.marketplace_id, flatfile_options.language_tag),
+    )
+    if not flatfile_options.allow_noncompliant and listing_has_hard_finding(listing, config=config):
         raise ValueError("Listing failed compliance scan; re-run with allow_noncompliant to export anyway.")
 
     row: dict[str, str] = {h: "" for h in headers}
@@ -116,7 +105,7 @@ def generate_flat_file_rows(
     )[: flatfile_options.generic_keyword_fields]
     backend = _clean(listing.get("backend_search_terms"))
     if gk_keys and backend:
-        chunks = _chunk_terms_to_n_fields(
+        chunks = chunk_to_fields(
             backend,
             n=len(gk_keys),
             max_bytes_each=flatfile_options.generic_keyword_max_bytes_each,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from .compliance.scanner import ScanConfig, scan_text
+from .compliance.scanner import ScanConfig, has_hard_finding
 
 
 def suggest_keywords(facts: dict[str, Any]) -> dict[str, list[str]]:
@@ -77,8 +77,7 @@ def filter_keywords(
         s = " ".join(str(k).split()).strip()
         if not s:
             continue
-        findings = scan_text(s, config=config, field="keyword")
-        if any(f.severity == "hard" for f in findings):
+        if has_hard_finding(s, config=config):
             blocked.append(s)
         else:
             safe.append(s)
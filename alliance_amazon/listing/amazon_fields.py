@@ -2,3 +2,6 @@ TITLE_CHAR_LIMIT = 200
 BULLET_CHAR_LIMIT = 250
 DESCRIPTION_CHAR_LIMIT = 2000
 BACKEND_SEARCH_TERMS_BYTE_LIMIT = 250
+# Listings API / flat-file generic_keyword values the backend terms are split into.
+BACKEND_SEARCH_TERMS_FIELDS = 5
+BACKEND_SEARCH_TERMS_FIELD_BYTE_LIMIT = 50
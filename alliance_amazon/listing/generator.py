@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
-from typing import Any, Iterable
+from typing import Any, Iterable, Mapping
 
-from ..compliance.scanner import ScanConfig, scan_listing_fields
-from ..compliance.scanner import scan_text
+from ..compliance.incremental import ListingScanState
+from ..compliance.scanner import ScanConfig
+from ..compliance.scanner import has_hard_finding
+from ..demand import DemandTable, normalize_term
 from ..facts import validate_facts_card
+from ..keywords import suggest_keywords
 from .amazon_fields import (
-    BACKEND_SEARCH_TERMS_BYTE_LIMIT,
     BULLET_CHAR_LIMIT,
     DESCRIPTION_CHAR_LIMIT,
     TITLE_CHAR_LIMIT,
 )
+from .packing import pack_search_terms
+from .search_terms import TokenIndex, fold_token, uncovered_terms
+from .title import TitleSearchStats, optimize_title
 
 
 def _get(d: dict[str, Any], *keys: str) -> Any:
@@ -41,18 +47,6 @@ def _truncate_chars(s: str, limit: int) -> str:
     return s[: max(0, limit - 1)].rstrip() + "…"
 
 
-def _truncate_utf8_bytes_space_separated(s: str, limit: int) -> str:
-    tokens = [t for t in s.split() if t]
-    out: list[str] = []
-    for tok in tokens:
-        candidate = (" ".join(out + [tok])).strip()
-        if len(candidate.encode("utf-8")) <= limit:
-            out.append(tok)
-        else:
-            break
-    return " ".join(out).strip()
-
-
 def _dedupe_keep_order(items: Iterable[str]) -> list[str]:
     seen: set[str] = set()
     out: list[str] = []
@@ -117,7 +111,8 @@ def _safe_grade(facts: dict[str, Any]) -> str:
     return ""
 
 
-def _build_title(facts: dict[str, Any], size: str) -> str:
+def _title_parts(facts: dict[str, Any], size: str) -> list[str]:
+    """The required title components, in order: brand, product name, spec bits, size."""
     brand = _clean(facts.get("brand")) or "Alliance Chemical"
     product_name = _clean(facts.get("product_name"))
     chemical_name = _clean(_get(facts, "chemical_identity", "chemical_name"))
@@ -140,16 +135,45 @@ def _build_title(facts: dict[str, Any], size: str) -> str:
             spec_bits.append(grade)
 
     base_name = product_name or chemical_name
-    title = _join_nonempty(
-        [
-            brand,
-            base_name,
-            " ".join(spec_bits) if spec_bits else "",
-            size,
-        ],
-        sep=" ",
-    )
-    return _truncate_chars(title, TITLE_CHAR_LIMIT)
+    return [p for p in (_clean(x) for x in (brand, base_name, " ".join(spec_bits), size)) if p]
+
+
+def _build_title(facts: dict[str, Any], size: str) -> str:
+    return _truncate_chars(" ".join(_title_parts(facts, size)), TITLE_CHAR_LIMIT)
+
+
+def _title_keywords(
+    facts: dict[str, Any],
+    *,
+    config: ScanConfig,
+    demand: DemandTable | None = None,
+    relevance: Mapping[str, float] | None = None,
+) -> tuple[list[str], dict[str, float]]:
+    """
+    Candidate title phrases (the card's suggested keywords that pass alone) and folded word weights.
+
+    A word weighs its catalog relevance if given, else the rank of the first
+    phrase using it (1.0 for the first, falling linearly); either is scaled
+    up by the log demand of the phrase when demand is given.
+    """
+    suggested = suggest_keywords(facts)
+    phrases = [p for group in suggested.values() for p in group if not has_hard_finding(p, config=config)]
+    scores = demand.scores(phrases) if demand is not None else {}
+    weights: dict[str, float] = {}
+    folded: dict[str, tuple[str, set[str]]] = {}  # phrases share words; fold each once
+    for i, phrase in enumerate(phrases):
+        rank = (len(phrases) - i) / len(phrases)
+        boost = 1.0 + math.log1p(scores.get(normalize_term(phrase), 0.0))
+        for word in phrase.split():
+            f = folded.get(word)
+            if f is None:
+                # "67-63-0" is three keys but one word's weight
+                f = folded[word] = (fold_token(word), TokenIndex([word]).keys)
+            token, keys = f
+            w = (relevance.get(token, 0.0) if relevance is not None else rank) * boost
+            for key in keys:
+                weights[key] = max(weights.get(key, 0.0), w / len(keys))
+    return phrases, weights
 
 
 def _build_bullets(facts: dict[str, Any], size: str) -> list[str]:
@@ -387,7 +411,24 @@ def _build_description(facts: dict[str, Any], size: str, *, html: bool) -> str:
     return _truncate_chars(desc, DESCRIPTION_CHAR_LIMIT)
 
 
-def _build_backend_search_terms(facts: dict[str, Any], *, product_name: str) -> str:
+def _build_backend_search_terms(
+    facts: dict[str, Any],
+    *,
+    product_name: str,
+    covered: TokenIndex | None = None,
+    demand: DemandTable | None = None,
+    relevance: Mapping[str, float] | None = None,
+) -> tuple[str, int]:
+    """
+    Backend search terms, and the bytes saved by skipping words covered already.
+
+    Words in covered (the title and bullets) or repeating an earlier word,
+    singular/plural folded, are skipped before packing. With demand, words
+    are packed by the search demand of their keyword (or of the word alone,
+    if higher); words without demand keep keyword priority order behind them.
+    With relevance (folded word -> TF-IDF score across the catalog), words
+    are packed by relevance, scaled up by log demand when both are given.
+    """
     keywords = _get(facts, "keywords") if isinstance(_get(facts, "keywords"), dict) else {}
     primary = keywords.get("primary") if isinstance(keywords, dict) else []
     secondary = keywords.get("secondary") if isinstance(keywords, dict) else []
@@ -397,12 +438,24 @@ def _build_backend_search_terms(facts: dict[str, Any], *, product_name: str) ->
     config = ScanConfig(allow_grade_terms_from_product_name=product_name)
     safe_tokens: list[str] = []
     for t in tokens:
-        token_findings = scan_text(t, config=config, field="backend_token")
-        if any(f.severity == "hard" for f in token_findings):
+        if has_hard_finding(t, config=config):
             continue
         safe_tokens.append(t)
-    safe = " ".join(safe_tokens)
-    return _truncate_utf8_bytes_space_separated(safe, BACKEND_SEARCH_TERMS_BYTE_LIMIT)
+    words, reclaimed = uncovered_terms([w for t in safe_tokens for w in t.split()], covered or TokenIndex())
+    if demand is None and relevance is None:
+        # Keyword groups are in priority order; words of earlier keywords win the byte budget.
+        return pack_search_terms(words), reclaimed
+    weight: dict[str, float] = {}
+    if demand is not None:
+        scores = demand.scores([*safe_tokens, *words])
+        for t in safe_tokens:
+            for w in t.split():
+                key = w.casefold()
+                weight[key] = max(weight.get(key, 0.0), scores.get(normalize_term(t), 0.0), scores.get(key, 0.0))
+    weights = [weight.get(w.casefold(), 0.0) for w in words]
+    if relevance is not None:
+        weights = [relevance.get(fold_token(w), 0.0) * (1.0 + math.log1p(d)) for w, d in zip(words, weights)]
+    return pack_search_terms(words, weights=weights), reclaimed
 
 
 @dataclass(frozen=True)
@@ -410,9 +463,25 @@ class GenerationOptions:
     size: str | None = None
     html_description: bool = False
     include_debug: bool = False
+    # Search-term demand from ingested reports; ranks backend search terms when set.
+    demand: DemandTable | None = None
+    # This SKU's catalog TF-IDF word scores (from 'keywords rank'); ranks backend search terms when set.
+    relevance: Mapping[str, float] | None = None
+    # Append keyword phrases to the title to cover the most keyword weight that fits (see listing.title).
+    optimize_title: bool = False
+
 
+def listing_scan_state(facts: dict[str, Any]) -> ListingScanState:
+    """Incremental compliance scan state for listings built from these facts."""
+    return ListingScanState(ScanConfig(allow_grade_terms_from_product_name=_clean(facts.get("product_name")) or None))
 
-def generate_listing(facts: dict[str, Any], *, options: GenerationOptions) -> dict[str, Any]:
+
+def generate_listing(
+    facts: dict[str, Any],
+    *,
+    options: GenerationOptions,
+    scan_state: ListingScanState | None = None,
+) -> dict[str, Any]:
     facts_issues = validate_facts_card(facts)
     errors = [i for i in facts_issues if i.severity == "error"]
     if errors:
@@ -421,11 +490,24 @@ def generate_listing(facts: dict[str, Any], *, options: GenerationOptions) -> di
         )
 
     size = _pick_size(facts, options.size)
-    title = _build_title(facts, size)
+    product_name = _clean(facts.get("product_name"))
+    title_stats: TitleSearchStats | None = None
+    if options.optimize_title:
+        config = ScanConfig(allow_grade_terms_from_product_name=product_name)
+        phrases, weights = _title_keywords(facts, config=config, demand=options.demand, relevance=options.relevance)
+        title, title_stats = optimize_title(_title_parts(facts, size), phrases, weights, config=config)
+        title = _truncate_chars(title, TITLE_CHAR_LIMIT)
+    else:
+        title = _build_title(facts, size)
     bullets = _build_bullets(facts, size)
     description = _build_description(facts, size, html=options.html_description)
-    product_name = _clean(facts.get("product_name"))
-    backend = _build_backend_search_terms(facts, product_name=product_name)
+    backend, backend_reclaimed = _build_backend_search_terms(
+        facts,
+        product_name=product_name,
+        covered=TokenIndex([title, *bullets]),
+        demand=options.demand,
+        relevance=options.relevance,
+    )
 
     a_plus_markdown = _build_a_plus_markdown(facts)
     a_plus = _build_a_plus_structure(facts)
@@ -443,12 +525,15 @@ def generate_listing(facts: dict[str, Any], *, options: GenerationOptions) -> di
             "product_name": product_name,
             "size": size,
             "generator": "alliance_amazon",
+            # Backend bytes not spent on words the title/bullets (or an earlier keyword) already cover.
+            "backend_bytes_reclaimed": backend_reclaimed,
         },
     }
+    if title_stats is not None:
+        listing["metadata"]["title_optimizer"] = title_stats.to_dict()
 
-    findings = scan_listing_fields(
-        listing, config=ScanConfig(allow_grade_terms_from_product_name=product_name)
-    )
+    # Pass the same scan_state on to generate_listing_with_llm so unchanged fields aren't rescanned.
+    findings = (scan_state or listing_scan_state(facts)).scan(listing)
     listing["compliance_findings"] = [f.to_dict() for f in findings]
     listing["compliance_status"] = "fail" if any(f.severity == "hard" for f in findings) else "pass"
     if options.include_debug:
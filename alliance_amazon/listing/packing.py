@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from .amazon_fields import (
+    BACKEND_SEARCH_TERMS_BYTE_LIMIT,
+    BACKEND_SEARCH_TERMS_FIELD_BYTE_LIMIT,
+    BACKEND_SEARCH_TERMS_FIELDS,
+)
+
+
+# Space-separated terms under UTF-8 byte budgets (backend search terms, generic_keyword
+# fields). Every packer keeps a running byte count, so each term is encoded once.
+
+
+def utf8_len(s: str) -> int:
+    return len(s.encode("utf-8"))
+
+
+def chunk_to_fields(text: str, *, n: int, max_bytes_each: int) -> list[str]:
+    """
+    Split text's tokens, in order, over n fields of at most max_bytes_each bytes.
+
+    Each field takes tokens until the next one doesn't fit; tokens left over
+    after the last field are dropped. Always returns n strings (some may be empty).
+    """
+    tokens = text.split()
+    fields: list[str] = []
+    i = 0
+    for _ in range(n):
+        cur: list[str] = []
+        used = 0
+        while i < len(tokens):
+            size = utf8_len(tokens[i]) + (1 if cur else 0)
+            if used + size > max_bytes_each:
+                break
+            cur.append(tokens[i])
+            used += size
+            i += 1
+        fields.append(" ".join(cur))
+    return fields
+
+
+def pack_fields(
+    terms: Sequence[str],
+    *,
+    n: int,
+    max_bytes_each: int,
+    weights: Sequence[float] | None = None,
+    max_total_bytes: int | None = None,
+) -> list[str]:
+    """
+    Pack terms into n fields of max_bytes_each bytes, highest weight first.
+
+    weights default to input order (earlier terms are worth more). Each term goes
+    to the field it fits most tightly (best fit), so short terms fill the gaps
+    long ones leave; terms that fit nowhere are dropped, lowest weight first.
+    max_total_bytes caps the fields joined by single spaces. Within a field,
+    terms keep their input order. Always returns n strings.
+    """
+    order = sorted(range(len(terms)), key=lambda i: -weights[i]) if weights is not None else range(len(terms))
+    used = [0] * n
+    placed: list[list[int]] = [[] for _ in range(n)]
+    total = -1  # joined size: bytes of every field plus one separator between non-empty ones
+    for i in order:
+        size = utf8_len(terms[i])
+        if not size or size > max_bytes_each:
+            continue
+        best = -1
+        for f in range(n):
+            need = size + (1 if placed[f] else 0)
+            if used[f] + need <= max_bytes_each and (best < 0 or used[f] > used[best]):
+                best = f
+        if best < 0:
+            continue
+        need = size + 1
+        if max_total_bytes is not None and total + need > max_total_bytes:
+            continue
+        used[best] += size + (1 if placed[best] else 0)
+        placed[best].append(i)
+        total += need
+    return [" ".join(terms[i] for i in sorted(field)) for field in placed]
+
+
+def pack_search_terms(terms: Sequence[str], *, weights: Sequence[float] | None = None) -> str:
+    """
+    Backend search terms: terms packed by weight into the generic_keyword fields
+    and joined, so chunk_to_fields() splits the result back without losing any.
+    """
+    fields = pack_fields(
+        terms,
+        n=BACKEND_SEARCH_TERMS_FIELDS,
+        max_bytes_each=BACKEND_SEARCH_TERMS_FIELD_BYTE_LIMIT,
+        weights=weights,
+        max_total_bytes=BACKEND_SEARCH_TERMS_BYTE_LIMIT,
+    )
+    return " ".join(f for f in fields if f)
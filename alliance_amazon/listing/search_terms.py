@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, Sequence
+
+from .packing import utf8_len
+
+
+# Amazon indexes title, bullet and backend words together and matches singular and
+# plural forms, so a backend word already covered by them spends bytes for nothing.
+
+_WORD = re.compile(r"\w+")
+
+
+def fold_token(word: str) -> str:
+    """Case-folded singular form of one word: "Solvents" -> "solvent", "batteries" -> "battery"."""
+    w = word.casefold()
+    if len(w) <= 3 or not w.endswith("s") or w[-2].isdigit():
+        return w
+    if w.endswith("ies") and len(w) > 4:
+        return w[:-3] + "y"
+    if w.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return w[:-2]
+    if w.endswith(("ss", "us", "is")):
+        return w
+    return w[:-1]
+
+
+class TokenIndex:
+    """Folded words of some texts (a listing's title and bullets), built once per listing."""
+
+    __slots__ = ("keys",)
+
+    def __init__(self, texts: Iterable[str] = ()) -> None:
+        self.keys: set[str] = set()
+        for text in texts:
+            self.keys.update(fold_token(w) for w in _WORD.findall(text))
+
+    def covers(self, word: str) -> bool:
+        """Whether every word part of word ("non-flammable" -> non, flammable) is already indexed."""
+        parts = _WORD.findall(word)
+        return bool(parts) and all(fold_token(p) in self.keys for p in parts)
+
+    def add(self, word: str) -> None:
+        self.keys.update(fold_token(p) for p in _WORD.findall(word))
+
+
+def uncovered_terms(words: Sequence[str], index: TokenIndex) -> tuple[list[str], int]:
+    """
+    The words not covered by index or by an earlier word, and the bytes the others would have used.
+
+    Covered words are counted with their separating space. index is extended
+    with the kept words.
+    """
+    kept: list[str] = []
+    reclaimed = 0
+    for word in words:
+        if index.covers(word):
+            reclaimed += utf8_len(word) + 1
+            continue
+        index.add(word)
+        kept.append(word)
+    return kept, reclaimed
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+from ..compliance.scanner import ScanConfig, has_hard_finding
+from .amazon_fields import TITLE_CHAR_LIMIT
+from .search_terms import TokenIndex
+
+
+# Title optimization: the required components (brand, name, specs, size) stay as
+# they are, and keyword phrases are appended after them (", "-separated) to cover
+# as much keyword weight as fits in the character limit without tripping the
+# compliance scanner. Choosing phrases is a budgeted coverage problem; a small
+# beam over include/skip decisions gets close to the best choice in a few
+# hundred set operations, usually with a single compliance check.
+
+DEFAULT_BEAM_WIDTH = 8
+
+_SEPARATOR = ", "
+# Amazon title style: these stay lowercase unless they start the phrase.
+_SMALL_WORDS = frozenset({"a", "an", "and", "as", "at", "by", "for", "in", "of", "on", "or", "the", "to", "with"})
+# Grade and method acronyms keyword phrases spell in lowercase ("acs grade", "for hplc").
+_ACRONYMS = frozenset({"acs", "fcc", "gc", "hplc", "ipa", "nf", "usp", "uv"})
+
+
+def title_case(phrase: str, casing: Mapping[str, str] | None = None) -> str:
+    """
+    Capitalize a keyword phrase the way titles are ("lab solvent for hplc" -> "Lab Solvent for HPLC").
+
+    Words that aren't all lowercase keep their casing, known acronyms are
+    upper-cased, and casing maps a lowercase word to the spelling to use
+    instead (as the title's required components spell it: "ph" -> "pH").
+    """
+    out = []
+    for i, w in enumerate(phrase.split()):
+        if casing and w in casing:
+            out.append(casing[w])
+        elif not w.islower() or (i and w in _SMALL_WORDS):
+            out.append(w)
+        elif w in _ACRONYMS:
+            out.append(w.upper())
+        else:
+            out.append(w[0].upper() + w[1:])
+    return " ".join(out)
+
+
+@dataclass(frozen=True)
+class TitleSearchStats:
+    candidates: int = 0  # phrases adding weight the required components don't cover
+    expanded: int = 0  # beam states extended by a phrase
+    compliance_checks: int = 0
+    rejected: int = 0  # extensions the compliance scanner blocked
+    base_coverage: float = 0.0
+    coverage: float = 0.0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "candidates": self.candidates,
+            "expanded": self.expanded,
+            "compliance_checks": self.compliance_checks,
+            "rejected": self.rejected,
+            "base_coverage": round(self.base_coverage, 4),
+            "coverage": round(self.coverage, 4),
+            "ms": round(self.seconds * 1000, 3),
+        }
+
+
+@dataclass(frozen=True)
+class _State:
+    gain: float
+    length: int
+    phrases: tuple[str, ...]
+    covered: frozenset[str]
+
+
+def optimize_title(
+    required: Sequence[str],
+    phrases: Sequence[str],
+    word_weights: Mapping[str, float],
+    *,
+    config: ScanConfig,
+    limit: int = TITLE_CHAR_LIMIT,
+    beam_width: int = DEFAULT_BEAM_WIDTH,
+) -> tuple[str, TitleSearchStats]:
+    """
+    The title covering the most keyword weight within limit chars, and search stats.
+
+    required are joined by spaces and always lead. Coverage is the summed
+    word_weights (folded words, as TokenIndex keys) of the distinct words in
+    the title. Candidate phrases are tried best gain first, so that is also
+    their order in the title. Phrases that pass alone can form a claim
+    together, so the result always passes has_hard_finding(). If the
+    required part alone is over limit or blocked, it is returned unchanged.
+    """
+    started = time.perf_counter()
+    base = " ".join(p for p in required if p)
+    base_words = frozenset(TokenIndex([base]).keys)
+
+    def weight(words: frozenset[str]) -> float:
+        return sum(word_weights.get(w, 0.0) for w in words)
+
+    base_coverage = weight(base_words)
+    checks = 1
+    if len(base) > limit or has_hard_finding(base, config=config):
+        return base, TitleSearchStats(
+            compliance_checks=checks,
+            base_coverage=base_coverage,
+            coverage=base_coverage,
+            seconds=time.perf_counter() - started,
+        )
+
+    room = limit - len(base)
+    # Words the required part spells other than capitalized ("ACS", "pH") are spelled that way in phrases too.
+    words = (w.strip(".,;:()") for w in base.split())
+    casing = {w.lower(): w for w in words if w not in (w.lower(), w.capitalize())}
+    candidates: list[tuple[float, str, frozenset[str]]] = []
+    for phrase in dict.fromkeys(title_case(p, casing) for p in phrases if p.strip()):
+        words = frozenset(TokenIndex([phrase]).keys) - base_words
+        gain = weight(words)
+        if gain > 0 and len(_SEPARATOR) + len(phrase) <= room:
+            candidates.append((gain, phrase, words))
+    candidates.sort(key=lambda c: -c[0])
+
+    def search(check: bool) -> _State:
+        nonlocal checks, expanded, rejected
+        beam = [_State(0.0, len(base), (), frozenset())]
+        for _, phrase, words in candidates:
+            best: dict[frozenset[str], _State] = {s.covered: s for s in beam}
+            for state in beam:
+                new = words - state.covered
+                length = state.length + len(_SEPARATOR) + len(phrase)
+                if not new or length > limit:
+                    continue
+                covered = state.covered | new
+                gain = state.gain + weight(new)
+                other = best.get(covered)
+                if other is not None and (other.gain, -other.length) >= (gain, -length):
+                    continue
+                extended = (*state.phrases, phrase)
+                if check:
+                    checks += 1
+                    if has_hard_finding(_SEPARATOR.join((base, *extended)), config=config):
+                        rejected += 1
+                        continue
+                expanded += 1
+                best[covered] = _State(gain, length, extended, covered)
+            beam = sorted(best.values(), key=lambda s: (-s.gain, s.length))[:beam_width]
+        return beam[0]
+
+    expanded = rejected = 0
+    # Phrases rarely combine into a claim, so search unchecked and verify the winner;
+    # only if it is blocked, search again checking every extension.
+    winner = search(check=False)
+    if winner.phrases:
+        checks += 1
+        if has_hard_finding(_SEPARATOR.join((base, *winner.phrases)), config=config):
+            rejected += 1
+            winner = search(check=True)
+    return _SEPARATOR.join((base, *winner.phrases)), TitleSearchStats(
+        candidates=len(candidates),
+        expanded=expanded,
+        compliance_checks=checks,
+        rejected=rejected,
+        base_coverage=base_coverage,
+        coverage=base_coverage + winner.gain,
+        seconds=time.perf_counter() - started,
+    )
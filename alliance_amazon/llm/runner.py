@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
-from ..compliance.blocklist import iter_blocked_terms
-from ..compliance.scanner import ScanConfig, scan_listing_fields
+from ..compliance.incremental import ListingScanState
+from ..compliance.scanner import active_rule_pack
+from ..listing.generator import listing_scan_state
 from ..listing.amazon_fields import (
-    BACKEND_SEARCH_TERMS_BYTE_LIMIT,
     BULLET_CHAR_LIMIT,
     DESCRIPTION_CHAR_LIMIT,
     TITLE_CHAR_LIMIT,
 )
+from ..listing.packing import pack_search_terms
 from .base import LlmClient, LlmRequest
 from .prompts import build_listing_rewrite_prompt
 
@@ -29,18 +30,6 @@ def _truncate_chars(s: str, limit: int) -> str:
     return s[: max(0, limit - 1)].rstrip() + "…"
 
 
-def _truncate_utf8_bytes_space_separated(s: str, limit: int) -> str:
-    tokens = [t for t in s.split() if t]
-    out: list[str] = []
-    for tok in tokens:
-        candidate = (" ".join(out + [tok])).strip()
-        if len(candidate.encode("utf-8")) <= limit:
-            out.append(tok)
-        else:
-            break
-    return " ".join(out).strip()
-
-
 def _normalize_listing_payload(payload: dict[str, Any]) -> dict[str, Any]:
     title = _truncate_chars(_clean(payload.get("title")), TITLE_CHAR_LIMIT)
     bullets_in = payload.get("bullets") if isinstance(payload.get("bullets"), list) else []
@@ -64,7 +53,7 @@ def _normalize_listing_payload(payload: dict[str, Any]) -> dict[str, Any]:
             continue
         seen.add(key)
         deduped.append(t)
-    backend = _truncate_utf8_bytes_space_separated(" ".join(deduped), BACKEND_SEARCH_TERMS_BYTE_LIMIT)
+    backend = pack_search_terms(" ".join(deduped).split())
     out: dict[str, Any] = {
         "title": title,
         "bullets": bullets,
@@ -81,7 +70,7 @@ def _normalize_listing_payload(payload: dict[str, Any]) -> dict[str, Any]:
 
 
 def _forbidden_terms_for_prompt() -> list[str]:
-    terms = [t.term for t in iter_blocked_terms()]
+    terms = [t.term for t in active_rule_pack().blocked]
     # Keep prompt smaller: unique, stable order.
     seen = set()
     out = []
@@ -100,6 +89,8 @@ class LlmListingResult:
     compliance_status: str  # "pass" | "fail"
     compliance_findings: list[dict[str, str]]
     used_fallback: bool
+    # Fields rescanned vs reused from the previous attempt's scan.
+    scan_stats: dict[str, int] = field(default_factory=dict)
 
 
 def generate_listing_with_llm(
@@ -109,6 +100,7 @@ def generate_listing_with_llm(
     client: LlmClient,
     model: str,
     max_attempts: int = 2,
+    scan_state: ListingScanState | None = None,
 ) -> LlmListingResult:
     hard_rules = [
         "No antimicrobial, pesticide, medical, or drug claims.",
@@ -118,12 +110,13 @@ def generate_listing_with_llm(
         "Do not mention EPA/FDA approval unless explicitly present in facts.",
     ]
     forbidden = _forbidden_terms_for_prompt()
-    allow_name = _clean(facts.get("product_name")) or None
-    config = ScanConfig(allow_grade_terms_from_product_name=allow_name)
+    # Candidates mostly keep some fields unchanged; only changed fields are rescanned.
+    # Reuse the generator's state to also skip fields it already scanned.
+    scan_state = scan_state or listing_scan_state(facts)
 
     used_fallback = False
     last_listing = _normalize_listing_payload(base_listing)
-    last_findings = scan_listing_fields(last_listing, config=config)
+    last_findings = scan_state.scan(last_listing)
 
     # Guard against hallucinated numerics: allow only numbers already in facts/base listing.
     def numbers_in_text(s: str) -> set[str]:
@@ -164,7 +157,7 @@ def generate_listing_with_llm(
             last_listing = candidate
             last_findings = last_findings
             continue
-        findings = scan_listing_fields(candidate, config=config)
+        findings = scan_state.scan(candidate)
         if any(f.severity == "hard" for f in findings):
             last_listing = candidate
             last_findings = findings
@@ -175,14 +168,16 @@ def generate_listing_with_llm(
             compliance_status="pass",
             compliance_findings=[f.to_dict() for f in findings],
             used_fallback=False,
+            scan_stats=scan_state.stats.to_dict(),
         )
 
     # Safe fallback: return the base listing (assumed generated by our deterministic generator).
     used_fallback = True
-    fallback_findings = scan_listing_fields(base_listing, config=config)
+    fallback_findings = scan_state.scan(base_listing)
     return LlmListingResult(
         listing=base_listing,
         compliance_status="fail" if any(f.severity == "hard" for f in fallback_findings) else "pass",
         compliance_findings=[f.to_dict() for f in fallback_findings],
         used_fallback=used_fallback,
+        scan_stats=scan_state.stats.to_dict(),
     )
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, Iterable, Mapping, Sequence
+
+from .catalog_index import sku_key
+from .keywords import suggest_keywords
+from .listing.search_terms import fold_token
+
+
+# TF-IDF over the keyword words of every facts card: a word in most of the
+# catalog's keyword sets says little about one SKU, so words distinctive to a
+# SKU rank above shared ones when backend bytes run short.
+
+
+class TermDocumentMatrix:
+    """
+    Sparse SKU x word count matrix in compressed-row form, built in one pass.
+
+    Row i (one SKU) holds the word ids indices[indptr[i]:indptr[i + 1]] with
+    their counts in the same slice of counts; df[t] is the number of SKUs
+    using word t. Columns are plain arrays, so a 100k-SKU catalog is a few
+    million machine ints rather than per-SKU dicts.
+    """
+
+    def __init__(self) -> None:
+        self.skus: list[str] = []
+        self.vocabulary: dict[str, int] = {}
+        self.words: list[str] = []
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        self.counts = array("l")
+        self.df = array("l")
+        # SKUs seen again after their first row; from_keyword_sets() skips them.
+        self.duplicates: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.skus)
+
+    @classmethod
+    def from_keyword_sets(cls, rows: Iterable[tuple[str, Mapping[str, Sequence[str]]]]) -> TermDocumentMatrix:
+        """
+        One row per (sku, suggest_keywords() groups) pair; words are whitespace-split (as packed) and folded.
+
+        SKUs are keyed by sku_key(), as in the catalog index; a SKU seen before is
+        skipped (and listed in duplicates), so it neither overwrites the first
+        card's ranking nor counts twice in df.
+        """
+        matrix = cls()
+        folded: dict[str, str] = {}  # catalogs repeat the same words; fold each once
+        seen: set[str] = set()
+        for sku, groups in rows:
+            sku = sku_key(sku)
+            if sku in seen:
+                matrix.duplicates.append(sku)
+                continue
+            seen.add(sku)
+            words = []
+            for group in groups.values():
+                for phrase in group:
+                    for w in str(phrase).split():
+                        f = folded.get(w)
+                        if f is None:
+                            f = folded[w] = fold_token(w)
+                        words.append(f)
+            matrix.add(sku, words)
+        return matrix
+
+    @classmethod
+    def from_facts(cls, cards: Iterable[dict[str, Any]]) -> TermDocumentMatrix:
+        return cls.from_keyword_sets((sku_key(card.get("sku")), suggest_keywords(card)) for card in cards)
+
+    def add(self, sku: str, words: Iterable[str]) -> int:
+        """Append one SKU's (folded) words as a row; returns the row."""
+        vocabulary, df = self.vocabulary, self.df
+        row: dict[int, int] = {}
+        for word in words:
+            t = vocabulary.get(word)
+            if t is None:
+                t = vocabulary[word] = len(self.words)
+                self.words.append(word)
+                df.append(0)
+            row[t] = row.get(t, 0) + 1
+        for t in row:
+            df[t] += 1
+        self.indices.extend(row.keys())
+        self.counts.extend(row.values())
+        self.indptr.append(len(self.indices))
+        self.skus.append(sku)
+        return len(self.skus) - 1
+
+    def idf(self) -> array:
+        """Inverse document frequency per word, ln((1 + N) / (1 + df)): 0 for a word every SKU uses."""
+        n = len(self.skus) + 1
+        return array("d", (math.log(n / (1 + d)) for d in self.df))
+
+    def row_scores(self, row: int, idf: Sequence[float] | None = None) -> dict[str, float]:
+        """TF-IDF per word of one row, with sublinear term frequency (1 + ln count)."""
+        idf = self.idf() if idf is None else idf
+        lo, hi = self.indptr[row], self.indptr[row + 1]
+        words = self.words
+        return {words[t]: (1.0 + math.log(c)) * idf[t] for t, c in zip(self.indices[lo:hi], self.counts[lo:hi])}
+
+    def rankings(self, *, limit: int | None = None) -> dict[str, list[tuple[str, float]]]:
+        """Per SKU, its words by TF-IDF (highest first, ties by word); limit keeps the top ones."""
+        idf = self.idf().tolist()
+        tf = [0.0] + [1.0 + math.log(c) for c in range(1, 64)]
+        # Score every stored entry in one pass (negated, so an ascending sort ranks), then slice rows.
+        neg = [-(tf[c] if c < 64 else 1.0 + math.log(c)) * idf[t] for t, c in zip(self.indices, self.counts)]
+        names = list(map(self.words.__getitem__, self.indices))
+        indptr = self.indptr.tolist()
+        out: dict[str, list[tuple[str, float]]] = {}
+        for row, sku in enumerate(self.skus):
+            lo, hi = indptr[row], indptr[row + 1]
+            ranked = sorted(zip(neg[lo:hi], names[lo:hi]))[:limit]
+            out[sku] = [(word, -score) for score, word in ranked]
+        return out
+
+
+def rankings_to_json(rankings: Mapping[str, Sequence[tuple[str, float]]]) -> dict[str, Any]:
+    return {
+        "format": "keyword-relevance/1",
+        "skus": {
+            sku: [{"term": word, "score": round(score, 4) + 0.0} for word, score in ranked]
+            for sku, ranked in rankings.items()
+        },
+    }
+
+
+def relevance_for_sku(data: Mapping[str, Any], sku: str) -> dict[str, float]:
+    """One SKU's folded word -> score map from rankings_to_json() output, by sku_key() (empty if it isn't there)."""
+    if data.get("format") != "keyword-relevance/1":
+        raise ValueError(f"Not a keyword relevance file: format {data.get('format')!r}")
+    return {entry["term"]: float(entry["score"]) for entry in data["skus"].get(sku_key(sku), [])}
@@ -4,7 +4,9 @@ from dataclasses import dataclass
 import re
 from typing import Any
 
-from ..compliance.scanner import ScanConfig, scan_text
+from ..compliance.markup import looks_like_html
+from ..compliance.redact import RedactionResult, redact_text
+from ..compliance.scanner import ScanConfig
 from ..keywords import filter_keywords
 from .fetch import ShopifySkuFetchResult, parse_metafield_value
 
@@ -135,23 +137,10 @@ def _split_keywords(value: Any) -> list[str]:
     return out
 
 
-def _redact_hard_terms(text: str, *, product_name_for_grade: str) -> tuple[str, list[str]]:
-    config = ScanConfig(allow_grade_terms_from_product_name=product_name_for_grade)
-    findings = scan_text(text, config=config, field="text")
-    removed: list[str] = []
-    redacted = text
+def _redact_terms(text: str, *, product_name_for_grade: str, field: str, strategy: str) -> RedactionResult:
     # Remove both hard and soft blocklist terms from Shopify sources by default.
-    for f in findings:
-        # Remove exact matched substring occurrences (case-insensitive match already given in f.match).
-        m = f.match
-        if not m:
-            continue
-        removed.append(m)
-        redacted = redacted.replace(m, "")
-        redacted = redacted.replace(m.lower(), "")
-        redacted = redacted.replace(m.upper(), "")
-    redacted = " ".join(redacted.split())
-    return redacted, removed
+    config = ScanConfig(allow_grade_terms_from_product_name=product_name_for_grade, html=looks_like_html(text))
+    return redact_text(text, config=config, strategy=strategy, field=field)
 
 
 @dataclass(frozen=True)
@@ -160,13 +149,14 @@ class ShopifyFactsBuildResult:
     report: dict[str, Any]
 
 
-def build_facts_from_shopify(fetch: ShopifySkuFetchResult) -> ShopifyFactsBuildResult:
+def build_facts_from_shopify(fetch: ShopifySkuFetchResult, *, redaction: str = "drop") -> ShopifyFactsBuildResult:
     product = fetch.product
     variant = fetch.variant
     mfp = {k: parse_metafield_value(v) for k, v in fetch.product_metafields.items()}
 
     raw_title = _clean(product.get("title"))
-    safe_title, removed_from_title = _redact_hard_terms(raw_title, product_name_for_grade=raw_title or "")
+    title_redaction = _redact_terms(raw_title, product_name_for_grade=raw_title or "", field="title", strategy=redaction)
+    safe_title = title_redaction.text
 
     vendor = _clean(product.get("vendor"))
     brand = vendor or "Alliance Chemical"
@@ -208,8 +198,14 @@ def build_facts_from_shopify(fetch: ShopifySkuFetchResult) -> ShopifyFactsBuildR
     # Optional Shopify descriptions as facts (will still be compliance-scanned later).
     raw_pd = _clean(mfp.get("product_details.product_description"))
     raw_seo_desc = _clean(mfp.get("product_details.seo_description"))
-    safe_pd, removed_pd = _redact_hard_terms(raw_pd, product_name_for_grade=raw_title)
-    safe_seo_desc, removed_seo_desc = _redact_hard_terms(raw_seo_desc, product_name_for_grade=raw_title)
+    pd_redaction = _redact_terms(
+        raw_pd, product_name_for_grade=raw_title, field="product_description", strategy=redaction
+    )
+    seo_redaction = _redact_terms(
+        raw_seo_desc, product_name_for_grade=raw_title, field="seo_description", strategy=redaction
+    )
+    safe_pd = pd_redaction.text
+    safe_seo_desc = seo_redaction.text
 
     def extract_uses(text: str) -> list[str]:
         # Extracts phrases after "used in/used for" up to the next period.
@@ -328,9 +324,11 @@ def build_facts_from_shopify(fetch: ShopifySkuFetchResult) -> ShopifyFactsBuildR
     report = {
         "shopify_raw_title": raw_title,
         "shopify_safe_title": facts["product_name"],
-        "removed_from_title": removed_from_title,
+        "removed_from_title": title_redaction.removed,
         "blocked_keywords": blocked_keywords,
-        "removed_from_descriptions": list({*removed_pd, *removed_seo_desc}),
+        "removed_from_descriptions": list(dict.fromkeys([*pd_redaction.removed, *seo_redaction.removed])),
+        "redaction_strategy": redaction,
+        "redaction_log": [*title_redaction.log(), *pd_redaction.log(), *seo_redaction.log()],
         "missing_recommended_fields": missing,
         "size_from_option2": size,
         "sizes_available_from_option2": sizes,
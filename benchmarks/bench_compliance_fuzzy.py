@@ -0,0 +1,128 @@
+"""
+Fuzzy vs exact compliance scanning cost.
+
+Times scan_text() and scan_spans() with ScanConfig(fuzzy=True) against the
+exact scan on the same corpora and exits 1 if fuzzy scanning costs more than
+--max-factor times the exact scan on any of them.
+
+    python -m benchmarks.bench_compliance_fuzzy --chars 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from alliance_amazon.compliance.scanner import (
+    ScanConfig,
+    active_rule_pack,
+    configure_scan_cache,
+    iter_listing_texts,
+    scan_spans,
+    scan_text,
+)
+
+
+_EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def _listing_copy(n: int) -> str:
+    texts = [t for _, t in iter_listing_texts(json.loads((_EXAMPLES / "bad_listing.json").read_text(encoding="utf-8")))]
+    texts.append("Isopropyl alcohol 99% for electronics cleaning, degreasing and lab use. Follow the SDS.")
+    blob = "\n".join(texts) + "\n"
+    return (blob * (n // len(blob) + 1))[:n]
+
+
+def _obfuscated_copy(n: int) -> str:
+    # Near-misses the fuzzy mode exists for: typos, split words, zero-width characters, homoglyphs.
+    variants = [
+        "disinfectent spray",
+        "anti bacterial wipes",
+        "dis​infectant",
+        "Dіsіnfectаnt",
+        "kils germs fast",
+        "hypo-allergenic formula",
+        "non toxic cleaner for shop floors",
+    ]
+    rng = random.Random(7)
+    base = _listing_copy(n)
+    words = base.split(" ")
+    for i in range(0, len(words), 25):
+        words[i] = rng.choice(variants)
+    return " ".join(words)[:n]
+
+
+def _unique_words(n: int) -> str:
+    # Every candidate is new, so the lookup memo never helps.
+    rng = random.Random(11)
+    out: list[str] = []
+    size = 0
+    while size < n:
+        w = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10)))
+        out.append(w)
+        size += len(w) + 1
+    return " ".join(out)[:n]
+
+
+CORPORA: dict[str, Callable[[int], str]] = {
+    "listing_copy": _listing_copy,
+    "obfuscated_copy": _obfuscated_copy,
+    "unique_words": _unique_words,
+}
+
+
+def _time(fn: Callable[[], object], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-factor", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    configure_scan_cache(0)
+    exact, fuzzy = ScanConfig(), ScanConfig(fuzzy=True)
+    started = time.perf_counter()
+    active_rule_pack().fuzzy
+    print(f"fuzzy matcher built in {(time.perf_counter() - started) * 1e3:.0f} ms\n")
+
+    failures: list[str] = []
+    print(f"{'corpus':16} {'scan':10} {'exact ns/char':>14} {'fuzzy ns/char':>14} {'factor':>7} {'findings':>17}")
+    for name, build in CORPORA.items():
+        text = build(args.chars)
+        for label, fn in (("scan_text", scan_text), ("scan_spans", scan_spans)):
+            # Warm the lookup memo the way a long-running batch would.
+            fn(text, config=fuzzy)
+            t_exact = _time(lambda: fn(text, config=exact), args.repeats)
+            t_fuzzy = _time(lambda: fn(text, config=fuzzy), args.repeats)
+            factor = t_fuzzy / t_exact
+            counts = f"{len(fn(text, config=exact))} -> {len(fn(text, config=fuzzy))}"
+            print(
+                f"{name:16} {label:10} {t_exact / len(text) * 1e9:>14.1f} "
+                f"{t_fuzzy / len(text) * 1e9:>14.1f} {factor:>7.2f} {counts:>17}"
+            )
+            if factor > args.max_factor:
+                failures.append(f"{name}/{label}: {factor:.2f}x")
+
+    if failures:
+        print(f"\nFUZZY OVER {args.max_factor}x:", *failures, sep="\n  ")
+        return 1
+    print(f"\nFuzzy scanning within {args.max_factor}x of exact on every corpus.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Adversarial scaling benchmark for the compliance scanner.
+
+Times scan_text() and scan_spans() on inputs built to trigger regex
+backtracking, doubling the size up to --max-bytes, and exits 1 if the cost
+per character at the largest size exceeds --max-slowdown times the cost at the
+smallest size (i.e. if any rule goes superlinear).
+
+    python -m benchmarks.bench_compliance_redos --max-bytes 4000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Callable
+
+from alliance_amazon.compliance.scanner import ScanConfig, configure_scan_cache, scan_spans, scan_text
+
+
+def _repeat(unit: str) -> Callable[[int], str]:
+    return lambda n: (unit * (n // len(unit) + 1))[:n]
+
+
+ADVERSARIAL: dict[str, Callable[[int], str]] = {
+    # One long line of percents and no organism: ".*" re-walks the line per percent.
+    "percent_no_organism": _repeat("1% "),
+    "percent_near_organism": _repeat("99.9% of germx "),
+    "percent_digit_run": lambda n: "1." + "2" * max(0, n - 2),
+    "percent_space_run": lambda n: "1" + " " * max(0, n - 1),
+    # Claim verbs with long non-word / word runs and conditions just out of reach.
+    "verb_punct_run": lambda n: "cures" + "!" * max(0, n - 5),
+    "verb_word_run": lambda n: "treats " + "a" * max(0, n - 7),
+    "verb_far_condition": _repeat("treats a b c d pain "),
+    "verb_dense": _repeat("cures heals "),
+    # Blocklist prefixes that start many candidate matches but never complete.
+    "blocklist_near_miss": _repeat("disinfec anti-mol kills germ 99.9% of ger non-tox "),
+    "separator_run": lambda n: "kills" + " -" * ((n - 5) // 2) + "x",
+    "plain_copy": _repeat("Isopropyl alcohol 99% for electronics cleaning and lab use. "),
+}
+
+
+def _time(fn: Callable[[], object], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-bytes", type=int, default=32_000)
+    parser.add_argument("--max-bytes", type=int, default=2_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-slowdown", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    configure_scan_cache(0)
+    config = ScanConfig()
+    failures: list[str] = []
+    print(f"{'case':24} {'bytes':>10} {'scan_text ms':>13} {'scan_spans ms':>14} {'ns/char':>9}")
+    for name, build in ADVERSARIAL.items():
+        per_char: list[float] = []
+        size = args.min_bytes
+        while size <= args.max_bytes:
+            text = build(size)
+            t_text = _time(lambda: scan_text(text, config=config), args.repeats)
+            t_spans = _time(lambda: scan_spans(text, config=config), args.repeats)
+            ns = max(t_text, t_spans) / len(text) * 1e9
+            per_char.append(ns)
+            print(f"{name:24} {len(text):>10} {t_text * 1e3:>13.2f} {t_spans * 1e3:>14.2f} {ns:>9.1f}")
+            size *= 2
+        if per_char and per_char[-1] > per_char[0] * args.max_slowdown:
+            failures.append(f"{name}: {per_char[0]:.1f} -> {per_char[-1]:.1f} ns/char")
+
+    if failures:
+        print("\nSUPERLINEAR:", *failures, sep="\n  ")
+        return 1
+    print("\nAll cases scale linearly.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
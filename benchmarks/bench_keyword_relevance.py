@@ -0,0 +1,78 @@
+"""
+Catalog-wide keyword TF-IDF cost.
+
+Builds the SKU x word matrix and every SKU's ranking for synthetic catalogs
+of keyword sets shaped like suggest_keywords() output (a shared vocabulary of
+chemical and application words plus a long tail), and exits 1 if the largest
+catalog takes more than --max-seconds.
+
+    python -m benchmarks.bench_keyword_relevance --skus 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+
+from alliance_amazon.relevance import TermDocumentMatrix
+
+
+_SHARED = "alcohol solvent lab grade reagent cleaner degreaser gallon liter bottle pure technical usp acs".split()
+
+
+def _catalog(n: int) -> list[tuple[str, dict[str, list[str]]]]:
+    rng = random.Random(7)
+    tail = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) for _ in range(n // 2 + 50)]
+
+    def phrase(k: int) -> str:
+        return " ".join(rng.choice(_SHARED) if rng.random() < 0.4 else rng.choice(tail) for _ in range(k))
+
+    return [
+        (
+            f"AC-{i:06d}",
+            {
+                "primary": [phrase(2)],
+                "secondary": [phrase(3) for _ in range(4)],
+                "application": [phrase(2) for _ in range(2)],
+                "long_tail": [phrase(4) for _ in range(2)],
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skus", type=int, default=100_000, help="Largest catalog")
+    parser.add_argument("--limit", type=int, default=30, help="Words kept per SKU")
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    sizes = sorted({max(10, args.skus // 100), max(10, args.skus // 10), args.skus})
+    print(f"{'skus':>8} {'words':>10} {'build s':>8} {'rank s':>8} {'us/sku':>8}")
+    total = 0.0
+    for size in sizes:
+        catalog = _catalog(size)
+        started = time.perf_counter()
+        matrix = TermDocumentMatrix.from_keyword_sets(catalog)
+        built = time.perf_counter()
+        matrix.rankings(limit=args.limit)
+        ranked = time.perf_counter()
+        total = ranked - started
+        print(
+            f"{size:>8} {len(matrix.indices):>10} {built - started:>8.2f} {ranked - built:>8.2f} "
+            f"{total / size * 1e6:>8.1f}"
+        )
+
+    if total > args.max_seconds:
+        print(f"\nTOO SLOW: {sizes[-1]} SKUs took {total:.1f}s (max {args.max_seconds}s)")
+        return 1
+    print(f"\n{sizes[-1]} SKUs scored in {total:.1f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
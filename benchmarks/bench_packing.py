@@ -0,0 +1,100 @@
+"""
+Byte-budget packing cost on long keyword lists.
+
+Times the shared packers (chunk_to_fields, pack_fields) against the quadratic
+rejoin-and-re-encode loop they replaced, with budgets large enough that the
+whole list is packed, and exits 1 if the shared packers' cost per term grows
+more than --max-growth times from the smallest list to the largest.
+
+    python -m benchmarks.bench_packing --terms 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from typing import Callable
+
+from alliance_amazon.listing.packing import chunk_to_fields, pack_fields
+
+
+def _keywords(n: int) -> list[str]:
+    rng = random.Random(3)
+    alphabet = string.ascii_lowercase + "éü"
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(3, 12))) for _ in range(n)]
+
+
+def _quadratic_chunk(terms: str, *, n: int, max_bytes_each: int) -> list[str]:
+    # The loop previously copied into the generator, LLM runner, patch builder and flat-file export.
+    tokens = [t for t in terms.split() if t]
+    fields: list[str] = []
+    i = 0
+    for _ in range(n):
+        cur: list[str] = []
+        while i < len(tokens):
+            candidate = " ".join(cur + [tokens[i]])
+            if len(candidate.encode("utf-8")) <= max_bytes_each:
+                cur.append(tokens[i])
+                i += 1
+            else:
+                break
+        fields.append(" ".join(cur))
+    return fields
+
+
+def _time(fn: Callable[[], object], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--terms", type=int, default=20_000, help="Largest keyword list")
+    parser.add_argument("--fields", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    parser.add_argument("--quadratic-max-terms", type=int, default=5_000, help="Skip the old loop above this")
+    args = parser.parse_args(argv)
+
+    sizes = sorted({max(10, args.terms // 100), max(10, args.terms // 10), args.terms})
+    print(f"{'terms':>8} {'old chunk ms':>13} {'chunk ms':>9} {'weighted ms':>12} {'ns/term':>9}")
+    per_term: list[float] = []
+    for size in sizes:
+        words = _keywords(size)
+        text = " ".join(words)
+        each = len(text.encode("utf-8")) // args.fields + 16
+        weights = [random.Random(size).random() for _ in words]
+        new = chunk_to_fields(text, n=args.fields, max_bytes_each=each)
+        old = "-"
+        if size <= args.quadratic_max_terms:
+            if _quadratic_chunk(text, n=args.fields, max_bytes_each=each) != new:
+                print(f"MISMATCH with the old packer at {size} terms")
+                return 1
+            t_old = _time(lambda: _quadratic_chunk(text, n=args.fields, max_bytes_each=each), 1)
+            old = f"{t_old * 1e3:.1f}"
+        t_chunk = _time(lambda: chunk_to_fields(text, n=args.fields, max_bytes_each=each), args.repeats)
+        t_weighted = _time(
+            lambda: pack_fields(words, n=args.fields, max_bytes_each=each, weights=weights), args.repeats
+        )
+        per_term.append((t_chunk + t_weighted) / size)
+        print(
+            f"{size:>8} {old:>13} {t_chunk * 1e3:>9.2f} {t_weighted * 1e3:>12.2f} {per_term[-1] * 1e9:>9.0f}"
+        )
+
+    growth = per_term[-1] / per_term[0]
+    if growth > args.max_growth:
+        print(f"\nPACKING SUPERLINEAR: cost per term grew {growth:.1f}x (max {args.max_growth}x)")
+        return 1
+    print(f"\nCost per term grew {growth:.1f}x from {sizes[0]} to {sizes[-1]} terms.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
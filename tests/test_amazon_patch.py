@@ -1,6 +1,7 @@
 import unittest
 
 from alliance_amazon.amazon.patch import PatchBuildOptions, build_listings_item_patch
+from alliance_amazon.listing.packing import pack_fields, pack_search_terms
 
 
 class TestAmazonPatch(unittest.TestCase):
@@ -21,3 +22,18 @@ class TestAmazonPatch(unittest.TestCase):
         self.assertIn("/attributes/product_description", paths)
         self.assertIn("/attributes/generic_keyword", paths)
 
+    def test_packed_search_terms_keep_priority_and_split_back_into_keyword_fields(self) -> None:
+        self.assertEqual(
+            pack_fields(["aaaa", "bbbbbbb", "cc", "dddd", "e"], n=2, max_bytes_each=9, weights=[1, 5, 4, 3, 2]),
+            ["bbbbbbb e", "cc dddd"],
+        )
+        words = [f"term{i:03d}" for i in range(60)]
+        backend = pack_search_terms(words)
+        self.assertEqual(backend.split(), words[: len(backend.split())])
+        self.assertLessEqual(len(backend.encode("utf-8")), 250)
+
+        body = build_listings_item_patch(
+            listing={"title": "T", "backend_search_terms": backend}, options=PatchBuildOptions()
+        )
+        patch = next(p for p in body["patches"] if p["path"] == "/attributes/generic_keyword")
+        self.assertEqual(" ".join(v["value"] for v in patch["value"]), backend)
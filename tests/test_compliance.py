@@ -1,8 +1,67 @@
+import contextlib
+import csv
+import io
 import json
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
-from alliance_amazon.compliance.scanner import ScanConfig, scan_listing_fields, scan_text
+from alliance_amazon.cli import _write_output_lines, main
+from alliance_amazon.compliance import locales
+from alliance_amazon.compliance.audit import AuditSummary, audit_listing, rule_categories, run_audit
+from alliance_amazon.compliance.blocklist import DEFAULT_RULE_PACK_PATH, iter_blocked_terms, load_rule_pack
+from alliance_amazon.compliance.findings_table import FindingsTable
+from alliance_amazon.compliance.fuzzy import levenshtein
+from alliance_amazon.compliance.incremental import ListingScanState
+from alliance_amazon.compliance.locales import LOCALE_RULE_PACKS, MARKETPLACE_COUNTRIES, compiled_locales, locale_for
+from alliance_amazon.compliance.markup import strip_html
+from alliance_amazon.compliance.matcher import TermMatcher, term_pattern
+from alliance_amazon.compliance.proximity import ProximityEngine, parse_proximity_rule
+from alliance_amazon.compliance.redact import redact_text
+from alliance_amazon.compliance.rules import CACHE_DIR_ENV, _write_cached_state, compile_rule_pack
+from alliance_amazon.compliance.rulestats import RuleStats
+from alliance_amazon.compliance.scanner import (
+    _CACHE,
+    ScanConfig,
+    active_rule_pack,
+    clear_scan_cache,
+    configure_scan_cache,
+    disable_rule_stats,
+    enable_rule_stats,
+    has_hard_finding,
+    iter_listing_texts,
+    listing_has_hard_finding,
+    rule_stats,
+    scan_cache_info,
+    scan_listing_fields,
+    scan_listings,
+    scan_many,
+    scan_spans,
+    scan_text,
+    use_rule_pack,
+)
+from alliance_amazon.compliance.stream import iter_stream_findings
+from alliance_amazon.keywords import filter_keywords
+
+
+_CACHE_ENV = mock.patch.dict(os.environ)
+
+
+def setUpModule() -> None:
+    # Compiled rule packs go to a throwaway dir, not ~/.cache/alliance_amazon.
+    _CACHE_ENV.start()
+    os.environ[CACHE_DIR_ENV] = tempfile.mkdtemp(prefix="alliance_amazon-test-")
+
+
+def tearDownModule() -> None:
+    shutil.rmtree(os.environ[CACHE_DIR_ENV], ignore_errors=True)
+    _CACHE_ENV.stop()
 
 
 class TestComplianceScanner(unittest.TestCase):
@@ -23,3 +82,460 @@ class TestComplianceScanner(unittest.TestCase):
         )
         self.assertFalse(any(f.rule_id.startswith("RULE-GRADE") for f in findings))
 
+    def test_single_pass_matcher_matches_per_term_search(self) -> None:
+        terms = [t.term for t in iter_blocked_terms()] + ["food grade", "lab grade", "#1"]
+        matcher = TermMatcher(terms)
+        texts = [
+            "All-Natural NONTOXIC non-toxic cleaner, kills   germs and 99.9% of germs.",
+            "Our #1 best-selling anti mold, anti-mildew sanitizer; sanitizers are not sanitize-d.",
+            "Food-grade and lab grade; hospital grade disinfectant; germ free and Germ-Free.",
+            "Isopropyl alcohol for electronics cleaning (technical grade).",
+            "",
+        ]
+        for text in texts:
+            hits = matcher.first_matches(text)
+            for idx, term in enumerate(terms):
+                m = re.compile(term_pattern(term), re.IGNORECASE).search(text)
+                got = hits.get(idx)
+                self.assertEqual(m.span() if m else None, got.span() if got else None, (term, text))
+
+    def test_scan_spans_reports_every_occurrence_with_offsets(self) -> None:
+        text = "Disinfectant here, disinfectant there, DISINFECTANT everywhere."
+        spans = scan_spans(text, field="description")
+        hits = [f for f in spans if f.rule_id == "BLOCKLIST-A"]
+        self.assertEqual(len(hits), 3)
+        for f in hits:
+            self.assertEqual(text[f.start : f.end].lower(), "disinfectant")
+            self.assertEqual(f.field, "description")
+        self.assertTrue(spans.has_hard())
+
+    def test_allow_phrases_suppress_only_the_hits_they_cover(self) -> None:
+        for text in (
+            "Runs on natural gas",
+            "Natural-gas fittings",
+            "Best by date on the lid",
+            "best-by date: see cap",
+            "leading edge design",
+        ):
+            self.assertEqual(scan_text(text, config=ScanConfig()), [], text)
+            self.assertEqual(len(scan_spans(text)), 0, text)
+        # Only the date phrase is allowed; a superiority claim with "best by" is still flagged.
+        self.assertEqual([f.match for f in scan_text("Rated best by professionals", config=ScanConfig())], ["best"])
+
+        text = "Natural gas stove with a natural finish"
+        hits = [f for f in scan_spans(text) if f.rule_id == "BLOCKLIST-F"]
+        self.assertEqual([(f.start, f.match) for f in hits], [(text.rindex("natural"), "natural")])
+        self.assertEqual([f.match for f in scan_text(text, config=ScanConfig())], ["natural"])
+
+    def test_html_scan_maps_findings_back_to_markup(self) -> None:
+        markup = (
+            "<p><b>Dis</b>infectant&nbsp;spray</p><!-- antibacterial -->"
+            "<script>var antibacterial = 1;</script><p>Kills 99.9&#37; of <i>germs</i></p>"
+        )
+        doc = strip_html(markup)
+        self.assertEqual(doc.text, "\nDisinfectant\xa0spray\n\nKills 99.9% of germs\n")
+        html = ScanConfig(html=True)
+        got = [(f.rule_id, f.match) for f in scan_spans(markup, config=html)]
+        self.assertIn(("BLOCKLIST-A", "Dis</b>infectant"), got)
+        self.assertIn(("PATTERN-PERCENT-ORGANISM", "99.9&#37; of <i>germs"), got)
+        self.assertNotIn("antibacterial", [m.lower() for _, m in got])
+        self.assertEqual(
+            sorted({f.rule_id for f in scan_text(markup, config=html)}), ["BLOCKLIST-A", "PATTERN-PERCENT-ORGANISM"]
+        )
+
+        # HTML descriptions in listings are detected; redaction keeps the tags it cuts through.
+        listing = {"title": "Lab solvent", "description": markup}
+        self.assertIn("Disinfectant", [f.match for f in scan_listing_fields(listing, config=ScanConfig())])
+        redacted = redact_text(markup, config=html, severities=("hard",)).text
+        self.assertIn("<p><b></b>", redacted)
+        self.assertIn("<i></i></p>", redacted)
+
+    def test_scan_cache_counts_hits_and_keeps_field(self) -> None:
+        clear_scan_cache()
+        first = scan_text("Brand: Alliance Chemical - eco-friendly", config=ScanConfig(), field="bullet_1")
+        second = scan_text("Brand: Alliance Chemical - eco-friendly", config=ScanConfig(), field="bullet_2")
+        info = scan_cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (1, 1))
+        self.assertEqual([f.match for f in first], [f.match for f in second])
+        self.assertEqual({f.field for f in second}, {"bullet_2"})
+
+    def test_rule_pack_from_file_and_compiled_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pack_path = Path(tmp) / "pack.json"
+            pack_path.write_text(
+                json.dumps(
+                    {
+                        "version": "test.1",
+                        "grade_terms": ["food grade"],
+                        "rules": [{"rule_id": "Z", "severity": "hard", "category": "test", "terms": ["widget cure"]}],
+                    }
+                ),
+                encoding="utf-8",
+            )
+            pack = load_rule_pack(pack_path)
+            fresh = compile_rule_pack(pack, cache_dir=Path(tmp))
+            cached = compile_rule_pack(pack, cache_dir=Path(tmp))
+            self.assertEqual(len(list(Path(tmp).glob("*.v*.json"))), 1)
+            for compiled in (fresh, cached):
+                hits = compiled.matcher.first_matches("A Widget-Cure in food grade")
+                self.assertEqual(sorted(hits), [0, 1])
+
+    def test_failed_compiled_cache_write_leaves_no_temp_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            _write_cached_state(Path(tmp) / "pack.v1.json", {"matcher": {"terms": {"not", "json"}}})
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+    def test_locale_rule_sets_extend_default_and_compile_lazily(self) -> None:
+        self.assertEqual(locale_for("A2EUQ1WTGCTBG2", "fr_CA"), "CA-fr")
+        self.assertEqual(locale_for("A2EUQ1WTGCTBG2", "en_CA"), "CA")
+        self.assertEqual(locale_for("A1PA6795UKMFR9", "de_DE"), "DE")
+        self.assertIsNone(locale_for("UNKNOWN"))
+
+        text = "Désinfectant puissant, tue les germes. Disinfectant."
+        with mock.patch.dict(locales._COMPILED, clear=True):
+            self.assertEqual([f.match for f in scan_text(text, config=ScanConfig(locale="US"))], ["Disinfectant"])
+            self.assertEqual(compiled_locales(), [])
+            fr = scan_text(text, config=ScanConfig(locale="ca_fr"))
+            self.assertEqual(sorted(f.match for f in fr), ["Disinfectant", "Désinfectant", "tue les germes"])
+            scan_text("ungiftig", config=ScanConfig(locale="CA-fr"))
+            self.assertEqual(compiled_locales(), ["CA-fr"])
+            self.assertIs(locales.locale_rule_pack("CA-fr"), locales.locale_rule_pack("ca-FR"))
+
+    def test_locale_rule_sets_layer_on_the_active_rule_pack(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pack_path = Path(tmp) / "custom.json"
+            pack_path.write_text(
+                json.dumps(
+                    {
+                        "version": "custom.1",
+                        "extends": str(DEFAULT_RULE_PACK_PATH),
+                        "rules": [{"rule_id": "Z", "severity": "hard", "category": "test", "terms": ["widget cure"]}],
+                    }
+                ),
+                encoding="utf-8",
+            )
+            use_rule_pack(pack_path)
+            try:
+                for locale in ("US", "CA-fr", "MX-es", "DE"):
+                    ids = {f.rule_id for f in scan_text("Widget cure, Disinfectant", config=ScanConfig(locale=locale))}
+                    self.assertEqual(ids, {"BLOCKLIST-Z", "BLOCKLIST-A"}, locale)
+                fr = scan_text("Désinfectant", config=ScanConfig(locale="CA-fr"))
+                self.assertEqual([f.rule_id for f in fr], ["BLOCKLIST-A"])
+            finally:
+                use_rule_pack()
+        self.assertEqual(scan_text("Widget cure", config=ScanConfig(locale="DE")), [])
+
+    def test_locale_for_falls_back_to_a_marketplace_rule_set(self) -> None:
+        self.assertEqual(locale_for("A1AM78C64UM0Y8"), "MX-es")
+        self.assertEqual(locale_for("A1AM78C64UM0Y8", "en_US"), "MX-es")
+        self.assertEqual(locale_for("A1AM78C64UM0Y8", "es_MX"), "MX-es")
+        self.assertEqual(locale_for("A1PA6795UKMFR9", "en_GB"), "DE")
+        for marketplace_id in MARKETPLACE_COUNTRIES:
+            for tag in (None, "", "en_US", "es_MX", "fr_CA", "de_DE", "ja_JP"):
+                locale = locale_for(marketplace_id, tag)
+                self.assertIn(locale, LOCALE_RULE_PACKS, (marketplace_id, tag))
+                scan_text("Desinfectante", config=ScanConfig(locale=locale))
+
+    def test_scan_many_matches_per_field_scans_without_crossing_fields(self) -> None:
+        fields = [
+            ("title", "Cleaner that cures"),
+            ("bullet_1", "pain fast, 99.9%"),
+            ("bullet_2", "of germs. Non"),
+            ("bullet_3", ""),
+            ("bullet_4", "toxic and safe for natural gas lines; kills 99.9% of germs, food grade"),
+        ]
+        config = ScanConfig(fuzzy=True)
+        expected = [f for field, text in fields for f in scan_text(text, config=config, field=field)]
+        self.assertEqual(expected[0].field, "bullet_4")
+        maxsize = _CACHE.maxsize
+        configure_scan_cache(0)
+        try:
+            self.assertEqual(scan_many(fields, config=config), expected)
+        finally:
+            configure_scan_cache(maxsize)
+
+        listing = json.loads(Path("examples/bad_listing.json").read_text(encoding="utf-8"))
+        single = scan_listing_fields(listing, config=ScanConfig())
+        self.assertEqual(scan_listings([listing, {}, listing], config=ScanConfig()), [single, [], single])
+
+    def test_has_hard_finding_agrees_with_full_scan(self) -> None:
+        texts = [
+            "",
+            "Isopropyl alcohol 99%, natural finish",
+            "Runs on natural gas; non-toxic cleaner",
+            "Food grade citric acid",
+            "Kills 99.9% of germs",
+            "Treats minor pain",
+            "Dis<b>infect</b>ant",
+            "Best by leading edge natural gas",
+        ]
+        for config in (ScanConfig(), ScanConfig(allow_grade_terms_from_product_name="Citric Acid Food Grade")):
+            for text in texts:
+                want = any(f.severity == "hard" for f in scan_text(text, config=config))
+                self.assertEqual(has_hard_finding(text, config=config), want, text)
+        self.assertTrue(has_hard_finding("Dis<b>infect</b>ant", config=ScanConfig(html=True)))
+
+        listing = json.loads(Path("examples/bad_listing.json").read_text(encoding="utf-8"))
+        self.assertTrue(listing_has_hard_finding(listing, config=ScanConfig()))
+        self.assertFalse(listing_has_hard_finding({"title": "Acetone, 1 gallon"}, config=ScanConfig()))
+
+    def test_has_hard_finding_agrees_with_full_scan_on_case_variants(self) -> None:
+        texts = [
+            "Acme Dİsinfectant Spray",
+            "NON-TOXİC degreaser",
+            "Antibacterİal hand soap",
+            "ANTI-BACTERIAL wipes",
+            "Kills 99.9% of GERMS",
+            "TREATS minor PAİN",
+            "Food GRADE citric acid",
+            "İsopropyl Alcohol, ſolvent",
+            "Acetone, 1 gallon",
+        ]
+        # With the cache off, has_hard_finding() can't reuse the full scan's answer.
+        maxsize = scan_cache_info()["maxsize"]
+        configure_scan_cache(0)
+        try:
+            for text in texts:
+                got = has_hard_finding(text, config=ScanConfig())
+                self.assertEqual(got, any(f.severity == "hard" for f in scan_text(text, config=ScanConfig())), text)
+                listing = {"title": "Acetone", "bullets": ["1 gallon", text]}
+                self.assertEqual(listing_has_hard_finding(listing, config=ScanConfig()), got, text)
+        finally:
+            configure_scan_cache(maxsize)
+
+    def test_keyword_index_never_passes_a_keyword_the_scanner_blocks(self) -> None:
+        rules = active_rule_pack()
+        index = rules.keyword_index
+        vocab = [t.term for t in rules.blocked] + list(rules.grade_terms) + list(rules.allow_phrases)
+        vocab += "isopropyl alcohol 99% gallon cures pain germs NON-TOXIC Food-Grade acetone".split()
+        rng = random.Random(17)
+        keywords = [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 3))) for _ in range(3000)]
+        for k in keywords:
+            if any(f.severity == "hard" for f in scan_text(k, config=ScanConfig())):
+                self.assertTrue(index.may_block(k), k)
+        self.assertFalse(index.may_block("Isopropyl Alcohol 99% 1 gallon"))
+        self.assertTrue(index.may_block("non toxic cleaner"))
+
+        safe, blocked = filter_keywords(
+            ["acetone", "Food Grade citric acid", "kills 99% of germs", "natural cleaner", "nontoxic"],
+            allow_grade_terms_from_product_name="Citric Acid Food Grade",
+        )
+        self.assertEqual(safe, ["acetone", "Food Grade citric acid", "natural cleaner"])
+        self.assertEqual(blocked, ["kills 99% of germs", "nontoxic"])
+
+    def test_keyword_index_folds_case_like_the_matcher(self) -> None:
+        index = active_rule_pack().keyword_index
+        # "İ".casefold() is two code points; re.IGNORECASE still matches it to "i".
+        for k in ["dİsinfectant", "DİSİNFECTANT", "NON-TOXİC", "nontoxİc cleaner", "Antibacterİal", "ſterile"]:
+            if any(f.severity == "hard" for f in scan_text(k, config=ScanConfig())):
+                self.assertTrue(index.may_block(k), k)
+        self.assertTrue(index.may_block("dİsinfectant"))
+        self.assertFalse(index.may_block("İsopropyl Alcohol"))
+
+    def test_proximity_rules_match_reference_regexes(self) -> None:
+        engine = active_rule_pack().proximity
+        rule_ids = [r.rule_id for r in engine.rules]
+
+        def spans(text: str, rule_id: str) -> list[tuple[int, int]]:
+            stream = engine.tokenize(text)
+            return list(engine.iter_rule_spans(stream, engine.rules[rule_ids.index(rule_id)]))
+
+        percent_organism = re.compile(
+            r"(?i)\b\d{1,3}(?:\.\d+)?\s*%.*\b(germs?|bacteria|viruses?|mold|mildew|fungus|pathogens?)\b"
+        )
+        medical_claim = re.compile(
+            r"(?i)\b(cures|treats|prevents|heals|healing|therapeutic|medicinal)\b"
+            r"(?:\W+\w+){0,3}\W+"
+            r"\b(disease|illness|infection|asthma|allerg(?:y|ies)|flu|cold|covid|pain|inflammation)\b"
+        )
+        words = "1 99.9 1234 % germs Germs viruse virus mold cures Treats healing pain painful Allergies flu a of é".split()
+        seps = [" ", "\n", "-", ", ", "", "!", "%"]
+        rnd = random.Random(5)
+        for _ in range(3000):
+            text = "".join(rnd.choice(words) + rnd.choice(seps) for _ in range(rnd.randint(0, 12)))
+            self.assertEqual(
+                [m.span() for m in percent_organism.finditer(text)], spans(text, "PATTERN-PERCENT-ORGANISM")
+            )
+            self.assertEqual([m.span() for m in medical_claim.finditer(text)], spans(text, "PATTERN-MEDICAL-CLAIM"))
+
+    def test_adversarial_pattern_input_scans_quickly(self) -> None:
+        text = "1% " * 100_000 + "\n" + "cures a b c d " * 20_000
+        started = time.perf_counter()
+        scan_text(text, config=ScanConfig())
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+    def test_stream_scan_matches_whole_text_offsets(self) -> None:
+        lines = ["Our solvent is a disinfectant.", "It kills 99.9% of germs and cures pain.", "", "food grade and eco-friendly"]
+        text = "\n".join(lines * 40)
+        expected = sorted((f.rule_id, f.start, f.end) for f in scan_spans(text))
+        for chunk in (16, 100, 1 << 20):
+            got = list(iter_stream_findings(io.StringIO(text), config=ScanConfig(), chunk_chars=chunk, overlap_chars=64))
+            self.assertEqual(sorted((f.rule_id, f.start, f.end) for f in got), expected)
+            for f in got:
+                line_start = text.rfind("\n", 0, f.start) + 1
+                self.assertEqual(f.line, text.count("\n", 0, f.start) + 1)
+                self.assertEqual(f.column, f.start - line_start + 1)
+
+    def test_audit_walks_directories_and_jsonl_with_summary(self) -> None:
+        bad = json.loads(Path("examples/bad_listing.json").read_text(encoding="utf-8"))
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "nested").mkdir()
+            (root / "nested" / "bad.json").write_text(json.dumps(bad), encoding="utf-8")
+            (root / "batch.jsonl").write_text(
+                json.dumps({"title": "Isopropyl Alcohol 99%", "bullets": ["Lab solvent"]}) + "\n\n{not json\n",
+                encoding="utf-8",
+            )
+            summary = AuditSummary()
+            records = list(run_audit([root], jobs=1, summary=summary))
+
+        self.assertEqual([r["source"].rsplit("/", 1)[-1] for r in records], ["batch.jsonl:1", "batch.jsonl:3", "bad.json"])
+        self.assertEqual(records[0]["status"], "pass")
+        self.assertIn("error", records[1])
+        self.assertEqual(records[2]["status"], "fail")
+        totals = summary.to_dict()
+        self.assertEqual((totals["listings"], totals["failed"], totals["errors"]), (3, 1, 1))
+        self.assertEqual(totals["findings"], len(records[2]["findings"]))
+        self.assertGreater(totals["by_category"]["antimicrobial"], 0)
+        self.assertIn("bullet", totals["by_field"])
+
+    def test_findings_table_groups_and_round_trips(self) -> None:
+        bad = json.loads(Path("examples/bad_listing.json").read_text(encoding="utf-8"))
+        table = FindingsTable(rule_categories())
+        for n, sku in enumerate(["AC-IPA-99-1G", "AC-IPA-70-1G", "AC-ACE-1G"]):
+            record = audit_listing((f"l{n}", None, json.dumps(dict(bad, metadata={"sku": sku}))))
+            table.add_record(record)
+        per_listing = len(record["findings"])
+        self.assertEqual((table.listings, len(table)), (3, 3 * per_listing))
+        self.assertEqual(table.counts("sku_prefix"), {"AC-IPA": 2 * per_listing, "AC-ACE": per_listing})
+        self.assertEqual(sum(table.counts("category").values()), len(table))
+        self.assertEqual(len(table.strings["rule"].values), len(table.counts("rule")))
+
+        loaded = FindingsTable.from_json(json.loads(json.dumps(table.to_json())))
+        self.assertEqual(list(loaded.iter_findings()), list(table.iter_findings()))
+        self.assertEqual(loaded.counts("field_group"), table.counts("field_group"))
+        buf = io.StringIO()
+        loaded.write_csv(buf)
+        rows = list(csv.DictReader(io.StringIO(buf.getvalue())))
+        self.assertEqual(len(rows), len(table))
+        self.assertEqual(rows[-1]["sku"], "AC-ACE-1G")
+
+    def test_rule_stats_count_evaluations_matches_and_merge_across_listings(self) -> None:
+        enable_rule_stats(top=1)
+        try:
+            for _ in range(2):  # the result cache is bypassed, so both scans count
+                scan_text("Disinfectant spray", config=ScanConfig(), field="title")
+            scan_text("Lab solvent", config=ScanConfig(), field="bullet_1")
+        finally:
+            stats = disable_rule_stats()
+        self.assertIsNone(rule_stats())
+
+        report = stats.report()
+        self.assertEqual(report["texts"], 3)
+        rules = {r["rule"]: r for r in report["rules"]}
+        self.assertEqual(rules["BLOCKLIST-A:disinfectant"]["matches"], 2)
+        self.assertIn("title: Disinfectant spray", rules["BLOCKLIST-A:disinfectant"]["slowest_input"])
+        self.assertIn("PATTERN-MEDICAL-CLAIM", rules)
+        self.assertIn("BLOCKLIST-A:antibacterial", report["dead_rules"])
+        self.assertNotIn("BLOCKLIST-A:disinfectant", report["dead_rules"])
+        self.assertEqual(len(report["slowest_inputs"]), 1)
+
+        record = audit_listing(("bad.json", "examples/bad_listing.json", None), rule_stats=True)
+        merged = RuleStats()
+        merged.merge(record["rule_stats"])
+        merged.merge(stats.to_state())
+        bad = json.loads(Path("examples/bad_listing.json").read_text(encoding="utf-8"))
+        self.assertEqual(merged.texts, 3 + len(list(iter_listing_texts(bad))))
+
+    def test_incremental_listing_scan_only_rescans_changed_fields(self) -> None:
+        config = ScanConfig()
+        listing = json.loads(Path("examples/bad_listing.json").read_text(encoding="utf-8"))
+        state = ListingScanState(config)
+        first = state.scan(listing)
+        self.assertEqual(first, scan_listing_fields(listing, config=config))
+        fields = state.stats.fields_rescanned
+
+        edited = dict(listing, title="Isopropyl Alcohol 99% - 1 Gallon")
+        second = state.scan(edited)
+        self.assertEqual(second, scan_listing_fields(edited, config=config))
+        self.assertEqual(state.stats.to_dict(), {"fields_rescanned": fields + 1, "fields_skipped": fields - 1})
+
+    def test_fuzzy_mode_flags_obfuscated_blocked_terms(self) -> None:
+        fuzzy = ScanConfig(fuzzy=True)
+        for text in (
+            "Powerful disinfectent spray",
+            "anti bacterial wipes",
+            "dis\u200binfectant",
+            "D\u0456s\u0456nfect\u0430nt",  # Cyrillic i and a
+            "\uff24isinfectant",  # fullwidth D
+        ):
+            hits = [f for f in scan_spans(text, config=fuzzy) if f.rule_id == "BLOCKLIST-A"]
+            self.assertEqual(len(hits), 1, text)
+            self.assertEqual(hits[0].severity, "hard")
+            self.assertEqual(text[hits[0].start : hits[0].end], hits[0].match)
+            self.assertEqual(scan_spans(text).spans(severity="hard"), [], text)
+            self.assertTrue(any(f.rule_id == "BLOCKLIST-A" for f in scan_text(text, config=fuzzy)))
+
+        # Plain hits aren't repeated as near-matches, and everyday words stay clean.
+        self.assertEqual(len(scan_spans("Disinfectant spray", config=fuzzy)), 1)
+        # Near-matches are suppressed per rule: an exact hit on one term of BLOCKLIST-A
+        # (antibacterial) hides a near-match of another of its terms (disinfectant).
+        text = "Antibacterial and disinfectent wipes"
+        self.assertEqual(
+            [(f.rule_id, f.match) for f in scan_text(text, config=fuzzy)], [("BLOCKLIST-A", "Antibacterial")]
+        )
+        self.assertEqual([f.match for f in scan_text("disinfectent wipes", config=fuzzy)], ["disinfectent"])
+        for text in ("chemical feed pump", "loading dock heading", "natural gas", "sanitary fittings"):
+            self.assertEqual(scan_spans(text, config=fuzzy).spans(severity="hard"), [], text)
+
+    def test_fuzzy_lookup_matches_brute_force_levenshtein(self) -> None:
+        fuzzy = active_rule_pack().fuzzy
+        rng = random.Random(5)
+        alphabet = "abcdefghijklmnopqrstuvwxyz0123456789"
+        for _ in range(2000):
+            chars = list(rng.choice([k for k in fuzzy.keys if k]))
+            for _ in range(rng.randint(0, 3)):
+                i = rng.randrange(1, len(chars) + 1)
+                op = rng.randrange(3)
+                if op == 0 and i < len(chars):
+                    chars[i] = rng.choice(alphabet)
+                elif op == 1 and i < len(chars):
+                    del chars[i]
+                else:
+                    chars.insert(i, rng.choice(alphabet))
+            cand = "".join(chars)
+            expected = sorted(
+                (idx, levenshtein(cand, key))
+                for idx, key in enumerate(fuzzy.keys)
+                if key and key[0] == cand[0] and 0 <= fuzzy.max_edits[idx] and levenshtein(cand, key) <= fuzzy.max_edits[idx]
+            )
+            self.assertEqual(list(fuzzy._lookup(cand)), expected, cand)
+
+    def test_proximity_rule_dsl(self) -> None:
+        rule = parse_proximity_rule(
+            "{kills, destroys} followed by {ants, roaches} within 2 words",
+            rule_id="PATTERN-PEST-CLAIM",
+            severity="hard",
+            message="Pest claim",
+        )
+        engine = ProximityEngine([rule], {})
+        self.assertEqual(list(engine.iter_spans("Kills most ANTS fast")), [(0, 0, 15)])
+        self.assertEqual(list(engine.iter_spans("kills nearly all household ants")), [])
+
+    def test_audit_cli_reports_a_bad_rule_pack(self) -> None:
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertRaises(SystemExit) as raised:
+            main(["compliance", "audit", "examples/bad_listing.json", "--rule-pack", "/nonexistent.json", "--jobs", "1"])
+        self.assertIn("Failed to load rule pack", str(raised.exception.code))
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_interrupted_output_leaves_no_temp_file(self) -> None:
+        def lines():
+            yield "{}\n"
+            raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "audit.jsonl"
+            with self.assertRaises(KeyboardInterrupt):
+                _write_output_lines(out, False, lines())
+            self.assertEqual(list(Path(tmp).iterdir()), [])
@@ -1,9 +1,35 @@
+import copy
 import json
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from alliance_amazon.catalog_index import CatalogKeywordIndex, sku_key
+from alliance_amazon.compliance.rules import CACHE_DIR_ENV
+from alliance_amazon.compliance.scanner import ScanConfig, has_hard_finding
+from alliance_amazon.demand import DemandTable
 from alliance_amazon.facts import facts_from_shopify_product_dump, load_facts_card, validate_facts_card
 from alliance_amazon.listing.generator import GenerationOptions, generate_listing
+from alliance_amazon.listing.search_terms import TokenIndex, fold_token
+from alliance_amazon.listing.title import optimize_title, title_case
+from alliance_amazon.relevance import TermDocumentMatrix, rankings_to_json, relevance_for_sku
+
+
+_CACHE_ENV = mock.patch.dict(os.environ)
+
+
+def setUpModule() -> None:
+    # Compiled rule packs go to a throwaway dir, not ~/.cache/alliance_amazon.
+    _CACHE_ENV.start()
+    os.environ[CACHE_DIR_ENV] = tempfile.mkdtemp(prefix="alliance_amazon-test-")
+
+
+def tearDownModule() -> None:
+    shutil.rmtree(os.environ[CACHE_DIR_ENV], ignore_errors=True)
+    _CACHE_ENV.stop()
 
 
 class TestFactsAndListing(unittest.TestCase):
@@ -30,3 +56,159 @@ class TestFactsAndListing(unittest.TestCase):
         issues = validate_facts_card(facts)
         self.assertFalse([i for i in issues if i.severity == "error"])
 
+    def test_backend_search_terms_skip_words_covered_by_title_and_bullets(self) -> None:
+        self.assertEqual(
+            [fold_token(w) for w in ("Solvents", "batteries", "glasses", "boxes", "gas", "99s")],
+            ["solvent", "battery", "glass", "box", "gas", "99s"],
+        )
+        facts = load_facts_card(Path("examples/facts_isopropyl_alcohol.json"))
+        listing = generate_listing(facts, options=GenerationOptions(size="1 Gallon"))
+        covered = TokenIndex([listing["title"], *listing["bullets"]])
+        words = listing["backend_search_terms"].split()
+        self.assertFalse([w for w in words if covered.covers(w)])
+        self.assertEqual(len({fold_token(w) for w in words}), len(words))
+        self.assertGreater(listing["metadata"]["backend_bytes_reclaimed"], 0)
+
+    def test_catalog_keyword_index_suggests_sibling_terms_and_updates_incrementally(self) -> None:
+        ipa = load_facts_card(Path("examples/facts_isopropyl_alcohol.json"))
+        ipa70 = copy.deepcopy(ipa)
+        ipa70.update(sku="AC-IPA-70-1G", product_name="Isopropyl Alcohol 70%", applications=["Surface preparation"])
+        ipa70["keywords"]["long_tail"] = ["rubbing alcohol 70%"]
+        acetone = {
+            "sku": "AC-ACE-1G",
+            "chemical_identity": {"cas_number": "67-64-1", "chemical_name": "Acetone"},
+            "applications": ["General degreasing"],
+            "keywords": {"application": ["nail polish remover"]},
+        }
+        index = CatalogKeywordIndex()
+        for card in (ipa, ipa70, acetone):
+            self.assertTrue(index.update(card))
+        self.assertFalse(index.update(ipa70))
+        self.assertEqual(index.siblings(ipa), {"AC-IPA-70-1G": 3.0, "AC-ACE-1G": 1.0})
+
+        terms = [s["term"] for s in index.suggest(ipa)]
+        self.assertLess(terms.index("rubbing alcohol 70%"), terms.index("nail polish remover"))
+        self.assertNotIn("isopropyl alcohol", terms)
+
+        ipa70["keywords"]["long_tail"] = ["70% ipa wipes"]
+        self.assertTrue(index.update(ipa70))
+        self.assertNotIn("rubbing alcohol 70%", index.postings)
+        self.assertIn("70% ipa wipes", [s["term"] for s in index.suggest(ipa)])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "keywords.json"
+            index.save(path)
+            loaded = CatalogKeywordIndex.load(path)
+        self.assertEqual(loaded.to_json(), index.to_json())
+        fresh = CatalogKeywordIndex()
+        for card in (ipa, ipa70, acetone):
+            fresh.update(card)
+        self.assertEqual(fresh.to_json(), index.to_json())
+        self.assertTrue(loaded.remove("ac-ace-1g"))
+        self.assertNotIn("nail polish remover", [s["term"] for s in loaded.suggest(ipa)])
+
+    def test_sku_key_normalizes_string_and_numeric_skus(self) -> None:
+        values = (12345, " ac  ipa-70 ", None, ["x"], True)
+        self.assertEqual([sku_key(v) for v in values], ["12345", "AC IPA-70", "", "", ""])
+        index = CatalogKeywordIndex()
+        self.assertTrue(index.update({"sku": 12345, "keywords": {"application": ["nail polish remover"]}}))
+        self.assertTrue(index.remove("12345"))
+        with self.assertRaises(ValueError):
+            index.update({"sku": None, "keywords": {"application": ["nail polish remover"]}})
+
+    def test_demand_table_streams_reports_and_ranks_backend_terms(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = Path(tmp) / "search_terms.csv"
+            report.write_text(
+                'Reporting Range=["Weekly"]\n'
+                '"Department","Search Term","Search Frequency Rank","#1 Click Share","#2 Click Share"\n'
+                '"Industrial","Degreaser","1,000","20.0%","10.0%"\n'
+                '"Industrial","degreaser ","500","10.0%","0.0%"\n'
+                '"Industrial","isopropanol","50,000","5.0%","-"\n'
+                '"Industrial","","10","1%","1%"\n',
+                encoding="utf-8",
+            )
+            with DemandTable(Path(tmp) / "demand.sqlite") as demand:
+                result = demand.ingest(report, flush_terms=1)
+                self.assertEqual((result.rows, result.new_terms, result.skipped_rows), (3, 2, 1))
+                self.assertTrue(demand.ingest(report).duplicate)
+                degreaser = demand.get("DEGREASER")
+                self.assertEqual((degreaser.rows, degreaser.best_rank), (2, 500))
+                self.assertAlmostEqual(degreaser.mean_click_share, 0.2)
+                self.assertEqual(
+                    demand.rank(["isopropanol", "unknown", "Degreaser"]), ["Degreaser", "isopropanol", "unknown"]
+                )
+
+                facts = load_facts_card(Path("examples/facts_isopropyl_alcohol.json"))
+                plain = generate_listing(facts, options=GenerationOptions())["backend_search_terms"].split()
+                listing = generate_listing(facts, options=GenerationOptions(demand=demand))
+                ranked = listing["backend_search_terms"].split()
+        self.assertEqual(sorted(plain), sorted(ranked))
+        self.assertLess(ranked.index("degreaser"), ranked.index("remover"))
+        self.assertGreater(plain.index("degreaser"), plain.index("remover"))
+
+    def test_keyword_relevance_ranks_distinctive_words_above_shared_ones(self) -> None:
+        matrix = TermDocumentMatrix.from_keyword_sets(
+            [
+                ("A", {"primary": ["isopropyl alcohol"], "secondary": ["lab solvent", "Solvents"]}),
+                ("B", {"primary": ["ethyl alcohol"], "secondary": ["lab solvent"]}),
+                ("C", {"primary": ["acetone"], "secondary": ["lab solvent", "nail polish remover"]}),
+            ]
+        )
+        self.assertEqual([matrix.df[matrix.vocabulary[w]] for w in ("solvent", "alcohol", "acetone")], [3, 2, 1])
+        rankings = matrix.rankings()
+        self.assertEqual([w for w, _ in rankings["A"]], ["isopropyl", "alcohol", "lab", "solvent"])
+        self.assertEqual(dict(rankings["A"])["solvent"], 0.0)
+        self.assertEqual([w for w, _ in matrix.rankings(limit=2)["C"]], ["acetone", "nail"])
+        with_duplicate = TermDocumentMatrix.from_keyword_sets(
+            [
+                ("ac-1  g", {"primary": ["isopropyl alcohol"]}),
+                (" AC-1 G ", {"primary": ["acetone"]}),
+                ("B", {"primary": ["alcohol"]}),
+            ]
+        )
+        self.assertEqual((with_duplicate.skus, with_duplicate.duplicates), (["AC-1 G", "B"], ["AC-1 G"]))
+        self.assertEqual(with_duplicate.df[with_duplicate.vocabulary["alcohol"]], 2)
+        self.assertNotIn("acetone", with_duplicate.vocabulary)
+        loaded = relevance_for_sku(rankings_to_json(rankings), " b ")
+        for word, score in matrix.row_scores(1).items():
+            self.assertAlmostEqual(loaded[word], score, places=4)
+
+        facts = load_facts_card(Path("examples/facts_isopropyl_alcohol.json"))
+        facts["keywords"]["long_tail"] = [f"filler{i:02d}word" for i in range(40)] + ["distinctiveword"]
+        plain = generate_listing(facts, options=GenerationOptions())["backend_search_terms"].split()
+        ranked = generate_listing(facts, options=GenerationOptions(relevance={"distinctiveword": 5.0}))
+        self.assertNotIn("distinctiveword", plain)
+        self.assertIn("distinctiveword", ranked["backend_search_terms"].split())
+
+    def test_title_optimizer_adds_keyword_phrases_within_limit_and_compliance(self) -> None:
+        config = ScanConfig()
+        weights = {"lab": 1.0, "solvent": 1.0, "cleaner": 0.5, "kill": 3.0, "germ": 3.0, "degreaser": 0.8}
+        phrases = ["lab solvent", "kills germs", "cleaner", "degreaser", "alcohol"]
+        title, stats = optimize_title(["Brand", "Alcohol 99%"], phrases, weights, config=config, limit=50)
+        self.assertEqual(title, "Brand Alcohol 99%, Lab Solvent, Degreaser, Cleaner")
+        self.assertFalse(has_hard_finding(title, config=config))
+        self.assertEqual((stats.candidates, stats.rejected), (4, 2))  # the unchecked winner, then the extension
+        self.assertAlmostEqual(stats.coverage, 3.3)
+
+        short, stats = optimize_title(["Brand", "Alcohol 99%"], phrases, weights, config=config, limit=30)
+        self.assertEqual(short, "Brand Alcohol 99%, Lab Solvent")
+        self.assertEqual(optimize_title(["A" * 40], phrases, weights, config=config, limit=30)[0], "A" * 40)
+
+        facts = load_facts_card(Path("examples/facts_isopropyl_alcohol.json"))
+        plain = generate_listing(facts, options=GenerationOptions())
+        listing = generate_listing(facts, options=GenerationOptions(optimize_title=True))
+        self.assertTrue(listing["title"].startswith(plain["title"] + ", "))
+        self.assertLessEqual(len(listing["title"]), 200)
+        self.assertEqual(listing["compliance_status"], "pass")
+        self.assertGreater(listing["metadata"]["title_optimizer"]["coverage"], 0)
+
+    def test_title_case_keeps_acronyms_and_required_casing(self) -> None:
+        self.assertEqual(title_case("lab solvent for hplc"), "Lab Solvent for HPLC")
+        self.assertEqual(title_case("acs grade usp ipa"), "ACS Grade USP IPA")
+        self.assertEqual(title_case("ph buffer, 99% PURE"), "Ph Buffer, 99% PURE")
+        self.assertEqual(title_case("ph buffer", {"ph": "pH"}), "pH Buffer")
+
+        weights = {"buffer": 1.0, "hplc": 1.0}
+        title, _ = optimize_title(["Brand", "pH 7 Solution"], ["ph buffer", "for hplc"], weights, config=ScanConfig())
+        self.assertEqual(title, "Brand pH 7 Solution, pH Buffer, For HPLC")
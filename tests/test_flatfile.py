@@ -1,9 +1,28 @@
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from alliance_amazon.flatfile.generate import FlatFileOptions, generate_flat_file_rows
 from alliance_amazon.listing.generator import GenerationOptions
 from alliance_amazon.facts import load_facts_card
+from alliance_amazon.compliance.rules import CACHE_DIR_ENV
+
+
+_CACHE_ENV = mock.patch.dict(os.environ)
+
+
+def setUpModule() -> None:
+    # Compiled rule packs go to a throwaway dir, not ~/.cache/alliance_amazon.
+    _CACHE_ENV.start()
+    os.environ[CACHE_DIR_ENV] = tempfile.mkdtemp(prefix="alliance_amazon-test-")
+
+
+def tearDownModule() -> None:
+    shutil.rmtree(os.environ[CACHE_DIR_ENV], ignore_errors=True)
+    _CACHE_ENV.stop()
 
 
 class TestFlatFile(unittest.TestCase):
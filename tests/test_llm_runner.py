@@ -1,12 +1,31 @@
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from alliance_amazon.compliance.rules import CACHE_DIR_ENV
 from alliance_amazon.facts import load_facts_card
-from alliance_amazon.listing.generator import GenerationOptions, generate_listing
+from alliance_amazon.listing.generator import GenerationOptions, generate_listing, listing_scan_state
 from alliance_amazon.llm.mock import MockLlmClient, mock_listing_response_json
 from alliance_amazon.llm.runner import generate_listing_with_llm
 
 
+_CACHE_ENV = mock.patch.dict(os.environ)
+
+
+def setUpModule() -> None:
+    # Compiled rule packs go to a throwaway dir, not ~/.cache/alliance_amazon.
+    _CACHE_ENV.start()
+    os.environ[CACHE_DIR_ENV] = tempfile.mkdtemp(prefix="alliance_amazon-test-")
+
+
+def tearDownModule() -> None:
+    shutil.rmtree(os.environ[CACHE_DIR_ENV], ignore_errors=True)
+    _CACHE_ENV.stop()
+
+
 class TestLlmRunner(unittest.TestCase):
     def test_llm_rewrite_with_mock_passes(self) -> None:
         facts = load_facts_card(Path("examples/facts_isopropyl_alcohol.json"))
@@ -28,3 +47,25 @@ class TestLlmRunner(unittest.TestCase):
         self.assertEqual(result.compliance_status, "pass")
         self.assertFalse(result.used_fallback)
 
+    def test_llm_rewrite_reuses_generator_scan_for_unchanged_fields(self) -> None:
+        facts = load_facts_card(Path("examples/facts_isopropyl_alcohol.json"))
+        state = listing_scan_state(facts)
+        base = generate_listing(facts, options=GenerationOptions(size="1 Gallon"), scan_state=state)
+        result = generate_listing_with_llm(
+            facts=facts,
+            base_listing={
+                "title": base["title"],
+                "bullets": base["bullets"],
+                "description": base["description"],
+                "backend_search_terms": base["backend_search_terms"],
+                "a_plus_markdown": base.get("a_plus_markdown", ""),
+                "a_plus": base.get("a_plus", {}),
+            },
+            client=MockLlmClient(response_text=mock_listing_response_json()),
+            model="gemini-3-flash-preview",
+            scan_state=state,
+        )
+        self.assertEqual(result.compliance_status, "pass")
+        # The normalized base listing was already scanned by generate_listing.
+        self.assertGreater(result.scan_stats["fields_skipped"], 0)
+        self.assertGreater(result.scan_stats["fields_rescanned"], 0)
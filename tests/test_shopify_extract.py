@@ -1,9 +1,29 @@
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
+from alliance_amazon.compliance.redact import redact_text
+from alliance_amazon.compliance.rules import CACHE_DIR_ENV
 from alliance_amazon.shopify.fetch import ShopifySkuFetchResult
 from alliance_amazon.shopify.extract import build_facts_from_shopify
 
 
+_CACHE_ENV = mock.patch.dict(os.environ)
+
+
+def setUpModule() -> None:
+    # Compiled rule packs go to a throwaway dir, not ~/.cache/alliance_amazon.
+    _CACHE_ENV.start()
+    os.environ[CACHE_DIR_ENV] = tempfile.mkdtemp(prefix="alliance_amazon-test-")
+
+
+def tearDownModule() -> None:
+    shutil.rmtree(os.environ[CACHE_DIR_ENV], ignore_errors=True)
+    _CACHE_ENV.stop()
+
+
 class TestShopifyExtract(unittest.TestCase):
     def test_build_facts_from_shopify_filters_keywords_and_uses_option2(self) -> None:
         fetched = ShopifySkuFetchResult(
@@ -43,3 +63,16 @@ class TestShopifyExtract(unittest.TestCase):
         # blocked keyword should appear in report
         self.assertTrue(any("disinfect" in k.lower() for k in built.report["blocked_keywords"]))
 
+    def test_redaction_is_case_insensitive_and_logged(self) -> None:
+        text = "DisInfectant cleaner, disinfectant-free rinse"
+        dropped = redact_text(text, field="title")
+        self.assertNotIn("disinfectant", dropped.text.lower())
+        self.assertEqual(dropped.text, "cleaner, -free rinse")
+        self.assertEqual(len(dropped.redactions), 2)
+        self.assertEqual(dropped.redactions[0].to_dict()["original"], "DisInfectant")
+        self.assertEqual(dropped.redactions[0].rule_ids, ("BLOCKLIST-A",))
+
+        masked = redact_text(text, strategy="mask")
+        self.assertEqual(len(masked.text), len(text))
+        self.assertTrue(masked.text.startswith("************ cleaner"))
+        self.assertEqual(redact_text(text, strategy="placeholder").text, "[removed] cleaner, [removed]-free rinse")